@@ -0,0 +1,104 @@
+"""Build time and memory of the Dashboard tab.
+
+    python -m benchmarks.bench_dashboard --builds 10 --output storage/benchmarks/dashboard.json
+
+The tab is built offscreen over a temporary session store holding --days of synthetic
+history. Reported are the time to import ui.dashboard, the first (cold) and following
+builds, the time to render a built tab once, resident memory after each step and
+whether matplotlib was imported along the way.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+from utilities import session_store
+from posture_detector.metrics import summarize
+from benchmarks.soak_frame_pool import rss_bytes
+
+
+def synthetic_store(days, seed=0):
+    rng = random.Random(seed)
+    store = session_store.SessionStore(os.path.join(tempfile.mkdtemp(), "history.db"), legacy_csv=None)
+    end = time.time()
+    for day in range(days):
+        start = end - (day + 1) * 86400
+        for _ in range(rng.randint(0, 3)):
+            total = rng.uniform(300, 7200)
+            store.add_session(start, start + total, total, total * rng.random(), "Front")
+            start += total + 600
+    return store
+
+
+def megabytes(value):
+    return round(value / 2**20, 2) if value is not None else None
+
+
+def run(args):
+    app = QApplication.instance() or QApplication([])
+    session_store._store = synthetic_store(args.days)
+    report = {"days": args.days, "matplotlib_loaded_before": "matplotlib" in sys.modules}
+    rss_start = rss_bytes()
+
+    start = time.perf_counter()
+    from ui.dashboard import Dashboard
+    report["import_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    rss_imported = rss_bytes()
+
+    builds = []
+    tabs = []
+    for _ in range(args.builds):
+        start = time.perf_counter()
+        tab = Dashboard()
+        tab.resize(1000, 700)
+        tab.grab()  # Lay out and paint once, like showing the tab
+        builds.append((time.perf_counter() - start) * 1000)
+        tabs.append(tab)
+        app.processEvents()
+    rss_built = rss_bytes()
+
+    start = time.perf_counter()
+    tabs[-1].resize(1200, 800)
+    tabs[-1].grab()
+    report["resize_repaint_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+    report.update({
+        "first_build_ms": round(builds[0], 2),
+        "builds": summarize(np.array(builds[1:] or builds)),
+        "rss_start_mb": megabytes(rss_start),
+        "rss_import_growth_mb": megabytes(rss_imported - rss_start) if rss_start else None,
+        "rss_per_build_mb": megabytes((rss_built - rss_imported) / len(builds)) if rss_start else None,
+        "matplotlib_loaded": "matplotlib" in sys.modules,
+    })
+    for tab in tabs:
+        tab.deleteLater()
+    app.processEvents()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure Dashboard build time and memory.")
+    parser.add_argument("--builds", type=int, default=10, help="Dashboards to build, the first one is cold")
+    parser.add_argument("--days", type=int, default=365, help="Days of synthetic history in the store")
+    parser.add_argument("--output", default="storage/benchmarks/dashboard.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
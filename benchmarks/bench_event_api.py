@@ -0,0 +1,155 @@
+"""Fan-out of the local event API to many loopback clients.
+
+    python -m benchmarks.bench_event_api --clients 50 --rate 30 --seconds 10
+
+An ApiServer is started on a free loopback port and posture-sized events are published
+at --rate per second while --clients SSE clients follow /events: most read everything,
+--limited of them ask for ?rate=2 and --slow ones read one event per --slow-delay
+seconds through a small socket buffer, so their backlog overflows. Reported are the
+time publish() takes (it must not grow with the number or speed of the clients), the
+events the server dropped and coalesced over all clients, and per client kind the
+events received and their latency from publish to client.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+import numpy as np
+from posture_detector.api import ApiServer
+from posture_detector.events import EventHub
+from posture_detector.metrics import summarize
+
+
+def posture_event(i):
+    return {"timestamp": time.monotonic(), "status": "Good" if i % 7 else "Bad", "alert": "Keep your head straight",
+            "deviation": 3, "neck_inclination": 14.5, "torso_inclination": 4.25,
+            "cameras": {"front": "Good", "side": "Good"}, "skew": 0.012}
+
+
+class LoopbackClient(threading.Thread):
+    """Follows /events over a plain socket, recording every event's latency."""
+
+    def __init__(self, port, kind, query="", delay=0.0, recv_buffer=None):
+        super().__init__(daemon=True)
+        self.port = port
+        self.kind = kind
+        self.query = query
+        self.delay = delay
+        self.recv_buffer = recv_buffer
+        self.latencies = []
+        self.status = None
+        self.connected = threading.Event()
+        self.done = threading.Event()
+
+    def run(self):
+        sock = socket.socket()
+        if self.recv_buffer:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.recv_buffer)
+        sock.connect(("127.0.0.1", self.port))
+        sock.sendall(f"GET /events?types=posture{self.query} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        stream = sock.makefile("rb")
+        self.status = int(stream.readline().split()[1])
+        self.connected.set()
+        try:
+            for raw in stream:
+                if self.done.is_set():
+                    break
+                if not raw.startswith(b"data:"):
+                    continue
+                event = json.loads(raw[5:])
+                self.latencies.append((time.time() - event["time"]) * 1000)
+                if self.delay:
+                    time.sleep(self.delay)
+        except OSError:
+            pass
+        finally:
+            self.connected.set()
+            sock.close()
+
+    def report(self):
+        return {"received": len(self.latencies), "latency": summarize(self.latencies)}
+
+
+def run(args):
+    hub = EventHub()
+    server = ApiServer(hub, port=0, max_clients=args.clients + 1, max_rate=None, max_queue=args.queue)
+    server.start()
+    clients = []
+    for i in range(args.clients):
+        if i < args.slow:
+            clients.append(LoopbackClient(server.port, "slow", delay=args.slow_delay, recv_buffer=4096))
+        elif i < args.slow + args.limited:
+            clients.append(LoopbackClient(server.port, "limited", "&rate=2"))
+        else:
+            clients.append(LoopbackClient(server.port, "full"))
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.connected.wait(5)
+    while hub.subscribers < len(clients):
+        time.sleep(0.01)
+
+    publish_ms = []
+    interval = 1 / args.rate
+    start = next_due = time.monotonic()
+    i = 0
+    while time.monotonic() - start < args.seconds:
+        t = time.perf_counter()
+        hub.publish("posture", posture_event(i))
+        publish_ms.append((time.perf_counter() - t) * 1000)
+        i += 1
+        next_due += interval
+        time.sleep(max(next_due - time.monotonic(), 0))
+    time.sleep(0.5)  # Let the clients drain
+    stats = server.stats()
+
+    subscribers = stats["hub"]["subscribers"]
+    report = {"clients": args.clients, "rate": args.rate, "seconds": args.seconds, "published": i,
+              "publish": summarize(publish_ms), "rejected": stats["rejected"],
+              "server_dropped": sum(s["dropped"] for s in subscribers),
+              "server_coalesced": sum(s["coalesced"] for s in subscribers),
+              "server_queued_max": max((s["queued"] for s in subscribers), default=0), "kinds": {}}
+    for kind in ("full", "limited", "slow"):
+        group = [client.report() for client in clients if client.kind == kind]
+        if not group:
+            continue
+        latencies = [latency for client in clients if client.kind == kind for latency in client.latencies]
+        report["kinds"][kind] = {
+            "clients": len(group),
+            "received_min": min(c["received"] for c in group),
+            "received_max": max(c["received"] for c in group),
+            "latency": summarize(np.array(latencies)),
+        }
+    for client in clients:
+        client.done.set()
+    server.stop()
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure fan-out of the local event API to loopback clients.")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--limited", type=int, default=10, help="Clients asking for ?rate=2")
+    parser.add_argument("--slow", type=int, default=2, help="Clients reading one event per --slow-delay")
+    parser.add_argument("--slow-delay", type=float, default=0.5)
+    parser.add_argument("--rate", type=float, default=30.0, help="Events published per second")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--queue", type=int, default=64, help="Backlog per client before the oldest are dropped")
+    parser.add_argument("--output", default="storage/benchmarks/event_api.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""Stage-level benchmarks for the posture pipeline.
+
+    python -m benchmarks.bench_pipeline --frames 300 --output storage/benchmarks/pipeline.json
+
+Every stage runs in isolation over deterministic synthetic frames and landmarks (or the
+frames of --video), then end to end. Results are per-stage p50/p95/p99 latency in
+milliseconds and frames per second, printed and written as JSON so releases can be
+compared. Runs offscreen: no camera or display is needed. Stages whose dependencies
+are missing (e.g. MediaPipe) are reported as skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import cv2
+from posture_detector.capture import Frame, iter_frames
+from posture_detector import landmarks
+from posture_detector.metrics import summarize
+
+
+def measure(fn, iterations, warmup=5):
+    """Call fn(i) for every iteration and return latency statistics in milliseconds."""
+    for i in range(min(warmup, iterations)):
+        fn(i)
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        fn(i)
+        samples[i] = time.perf_counter_ns() - start
+    samples /= 1e6
+    return summarize(samples)
+
+
+def synthetic_frames(count, width, height, seed=0):
+    """Deterministic BGR frames: a noisy background with a moving bright figure."""
+    rng = np.random.default_rng(seed)
+    background = rng.integers(0, 60, size=(height, width, 3), dtype=np.uint8)
+    frames = []
+    for i in range(count):
+        image = background.copy()
+        cx = int(width * (0.45 + 0.05 * np.sin(i / 10)))
+        cv2.ellipse(image, (cx, height // 3), (width // 12, height // 8), 0, 0, 360, (180, 170, 160), -1)
+        cv2.rectangle(image, (cx - width // 7, height // 2), (cx + width // 7, height), (90, 120, 150), -1)
+        frames.append(image)
+    return frames
+
+
+def synthetic_landmarks(count, seed=0):
+    """Deterministic (count, 33, 4) landmarks of a seated upper body with a little jitter."""
+    rng = np.random.default_rng(seed)
+    base = np.zeros((landmarks.NUM_LANDMARKS, 4), dtype=np.float32)
+    base[:, 0] = 0.5 + 0.15 * np.sin(np.arange(landmarks.NUM_LANDMARKS))
+    base[:, 1] = np.linspace(0.2, 0.95, landmarks.NUM_LANDMARKS)
+    base[:, 2] = -0.1
+    base[:, 3] = 0.9
+    jitter = rng.normal(0, 0.01, size=(count, landmarks.NUM_LANDMARKS, 4)).astype(np.float32)
+    jitter[..., 3] = 0
+    return base + jitter
+
+
+def write_video(frames, path, fps=30):
+    h, w = frames[0].shape[:2]
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), fps, (w, h))
+    for image in frames:
+        writer.write(image)
+    writer.release()
+
+
+def bench_capture_decode(frames, iterations, video=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = video
+        if path is None:
+            path = os.path.join(tmp, "synthetic.avi")
+            write_video(frames, path)
+        samples = []
+        while len(samples) < iterations:
+            decoded = iter_frames(path)
+            while len(samples) < iterations:
+                start = time.perf_counter_ns()
+                frame = next(decoded, None)
+                if frame is None:
+                    break
+                samples.append((time.perf_counter_ns() - start) / 1e6)
+    return summarize(samples)
+
+
+def bench_cvtcolor(frames, iterations):
+    """BGR to RGB into a reused buffer, as PoseDetector prepares the inference input."""
+    rgb = np.empty_like(frames[0])
+    return measure(lambda i: cv2.cvtColor(frames[i % len(frames)], cv2.COLOR_BGR2RGB, dst=rgb), iterations)
+
+
+def bench_inference(frames, iterations, model_complexity):
+    from posture_detector.pose_engine import get_pose_engine
+    engine = get_pose_engine(model_complexity)
+    rgb = [cv2.cvtColor(image, cv2.COLOR_BGR2RGB) for image in frames]
+    return measure(lambda i: engine.process(rgb[i % len(rgb)]), iterations)
+
+
+def bench_front_deviation(lms, iterations):
+    from posture_detector.frontPostureAnalyzer import FrontPostureAnalyzer
+    analyzer = FrontPostureAnalyzer()
+    analyzer.base_posture = lms[0].copy()
+    return measure(lambda i: analyzer._get_deviation_from_base_posture(lms[i % len(lms)]), iterations)
+
+
+def bench_side_angle(lms, iterations, width, height):
+    from posture_detector.sidePostureAnalyzer import SidePostureAnalyzer
+    points = landmarks.to_pixels(lms[:, [11, 7]], width, height).reshape(len(lms), 4).tolist()
+    return measure(lambda i: SidePostureAnalyzer.calculate_angle(*points[i % len(points)]), iterations)
+
+
+def bench_yoga(lms, iterations, backend):
+    from posture_detector.yoga_model import load_yoga_model
+    model = load_yoga_model(backend=backend)
+
+    def step(i):
+        p = model.predict(landmarks.yoga_features(lms[i % len(lms)]).reshape(1, -1))
+        np.argmax(p)
+    return measure(step, iterations)
+
+
+def bench_overlay(frames, lms, iterations):
+    canvas = frames[0].copy()
+    return measure(lambda i: landmarks.draw_landmarks(canvas, lms[i % len(lms)]), iterations)
+
+
+def _qt_app():
+    from PySide6.QtGui import QGuiApplication
+    return QGuiApplication.instance() or QGuiApplication([])
+
+
+def bench_qimage(frames, iterations):
+    from PySide6.QtGui import QImage, QPixmap
+    _qt_app()
+
+    def step(i):
+        image = frames[i % len(frames)]
+        h, w, ch = image.shape
+        QPixmap.fromImage(QImage(image.data, w, h, ch * w, QImage.Format_BGR888))
+    return measure(step, iterations)
+
+
+def bench_end_to_end(frames, iterations, model_complexity):
+    """Front pipeline per frame: inference, scoring, overlay and QPixmap conversion."""
+    from PySide6.QtGui import QImage, QPixmap
+    from posture_detector.frontPostureAnalyzer import FrontPostureAnalyzer
+    _qt_app()
+    analyzer = FrontPostureAnalyzer(model_complexity=model_complexity)
+
+    def step(i):
+        frame = Frame(frames[i % len(frames)].copy(), i / 30, i + 1)
+        image, _, _ = analyzer.analyze(frame)
+        h, w, ch = image.shape
+        QPixmap.fromImage(QImage(image.data, w, h, ch * w, QImage.Format_BGR888))
+    return measure(step, iterations)
+
+
+STAGES = ("capture_decode", "cvtcolor", "mediapipe_inference", "front_deviation", "side_angle",
+          "yoga_classifier", "overlay", "qimage_conversion", "end_to_end")
+
+
+def run(args):
+    if args.video:
+        frames = [frame.image for _, frame in zip(range(args.frames), iter_frames(args.video))]
+    else:
+        frames = synthetic_frames(min(args.frames, 60), args.width, args.height)
+    height, width = frames[0].shape[:2]
+    lms = synthetic_landmarks(args.frames)
+    n = args.frames
+
+    stages = {
+        "capture_decode": lambda: bench_capture_decode(frames, n, args.video),
+        "cvtcolor": lambda: bench_cvtcolor(frames, n),
+        "mediapipe_inference": lambda: bench_inference(frames, n, args.model_complexity),
+        "front_deviation": lambda: bench_front_deviation(lms, n),
+        "side_angle": lambda: bench_side_angle(lms, n, width, height),
+        "yoga_classifier": lambda: bench_yoga(lms, n, args.yoga_backend),
+        "overlay": lambda: bench_overlay(frames, lms, n),
+        "qimage_conversion": lambda: bench_qimage(frames, n),
+        "end_to_end": lambda: bench_end_to_end(frames, n, args.model_complexity),
+    }
+    results = {}
+    for name in args.stages or STAGES:
+        try:
+            results[name] = stages[name]()
+        except Exception as e:  # Missing optional dependency or hardware, keep going
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "frame_size": [width, height],
+        "source": args.video or "synthetic",
+        "stages": results,
+    }
+
+
+def print_report(report):
+    print(f"{'stage':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'fps':>12}")
+    for name, stats in report["stages"].items():
+        if "skipped" in stats:
+            print(f"{name:<22}  skipped ({stats['skipped']})")
+        else:
+            print(f"{name:<22}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['p99_ms']:>10.3f}{stats['fps']:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark each stage of the posture pipeline.")
+    parser.add_argument("--frames", type=int, default=300, help="Iterations per stage")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--video", help="Use frames from this recording instead of synthetic ones")
+    parser.add_argument("--model-complexity", type=int, choices=(0, 1, 2), default=1)
+    parser.add_argument("--yoga-backend", choices=("numpy", "keras"), default="numpy")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, help="Only run these stages")
+    parser.add_argument("--output", default="storage/benchmarks/pipeline.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_report(report)
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
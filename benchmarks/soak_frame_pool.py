@@ -0,0 +1,150 @@
+"""Long-running soak of the live frame path to check that memory stays flat.
+
+    python -m benchmarks.soak_frame_pool --seconds 600 --output storage/benchmarks/soak.json
+    python -m benchmarks.soak_frame_pool --seconds 600 --pool-size 0   # Without the frame pool
+
+A synthetic video is looped through the real FrameGrabber and InferenceWorker, and
+every result is painted into a QPixmap and released like the UI does. The analyzer
+only draws a fixed skeleton unless --mode selects a real one (which needs MediaPipe).
+Every --interval seconds RSS, memory traced by tracemalloc (NumPy buffers included)
+and the frame pool counters are sampled; with the pool, all of them should level off
+after the first samples. tests/test_frame_pool.py runs the same path for a few seconds
+and checks the pool counters and that every retained frame is released.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication, QImage, QPixmap
+from posture_detector.capture import VideoFileGrabber
+from posture_detector.worker import InferenceWorker
+from posture_detector import landmarks
+from benchmarks.bench_pipeline import synthetic_frames, synthetic_landmarks, write_video
+
+
+class OverlayAnalyzer:
+    """Stands in for a posture analyzer: draws a fixed skeleton onto the frame in place."""
+
+    def __init__(self):
+        self.lm = synthetic_landmarks(1)[0]
+
+    def analyze(self, frame):
+        landmarks.draw_landmarks(frame.image, self.lm)
+        return frame.image, {"status": "Good", "alert": ""}, self.lm
+
+
+def rss_bytes():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def soak(args):
+    app = QGuiApplication.instance() or QGuiApplication([])
+    tmp = tempfile.mkdtemp()
+    video = os.path.join(tmp, "soak.avi")
+    write_video(synthetic_frames(90, args.width, args.height), video, fps=args.fps)
+
+    if args.mode:
+        from posture_detector.offline import create_analyzer
+        analyzer = create_analyzer(args.mode)
+    else:
+        analyzer = OverlayAnalyzer()
+
+    grabber = VideoFileGrabber(video, loop=True, pool_size=args.pool_size)
+    worker = InferenceWorker(analyzer)
+    painted = 0
+    label = {}
+
+    def paint(captured, image, posture_data, lm):
+        nonlocal painted
+        h, w, ch = image.shape
+        label["pixmap"] = QPixmap.fromImage(QImage(image.data, w, h, ch * w, QImage.Format_BGR888))
+        captured.release()
+        painted += 1
+
+    tracemalloc.start()
+    worker.result_ready.connect(paint)
+    grabber.start()
+    worker.start()
+    grabber.add_listener(worker.submit)
+
+    samples = []
+    start = time.monotonic()
+    next_sample = start
+    try:
+        while time.monotonic() - start < args.seconds:
+            app.processEvents()
+            now = time.monotonic()
+            if now >= next_sample:
+                pool = grabber.pool
+                rss = rss_bytes()
+                samples.append({
+                    "seconds": round(now - start, 1),
+                    "frames": grabber.frames_read,
+                    "painted": painted,
+                    "rss_mb": round(rss / 2**20, 2) if rss else None,
+                    "traced_mb": round(tracemalloc.get_traced_memory()[0] / 2**20, 2),
+                    "buffers_allocated": pool.allocated if pool else grabber.frames_read,  # One per frame without a pool
+                    "buffers_reused": pool.reused if pool else 0,
+                })
+                print(samples[-1])
+                next_sample += args.interval
+            time.sleep(0.002)
+    finally:
+        grabber.remove_listener(worker.submit)
+        worker.stop()
+        grabber.stop()
+        tracemalloc.stop()
+
+    warm = samples[min(2, len(samples) - 1)]  # Skip start-up allocations
+    last = samples[-1]
+    return {
+        "pool_size": args.pool_size,
+        "mode": args.mode or "overlay",
+        "frame_size": [args.width, args.height],
+        "samples": samples,
+        "rss_growth_mb": round(last["rss_mb"] - warm["rss_mb"], 2) if last["rss_mb"] is not None else None,
+        "traced_growth_mb": round(last["traced_mb"] - warm["traced_mb"], 2),
+        "frame_allocations_after_warmup": last["buffers_allocated"] - warm["buffers_allocated"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak the live frame path and sample memory use.")
+    parser.add_argument("--seconds", type=float, default=120)
+    parser.add_argument("--interval", type=float, default=5, help="Seconds between samples")
+    parser.add_argument("--pool-size", type=int, default=8, help="Frame pool capacity, 0 disables the pool")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--mode", choices=("front", "side", "yoga"), help="Run a real analyzer instead of the overlay")
+    parser.add_argument("--output", default="storage/benchmarks/soak.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    report = soak(args)
+    print(f"RSS growth after warm-up: {report['rss_growth_mb']} MB, traced: {report['traced_growth_mb']} MB, "
+          f"frame buffers allocated after warm-up: {report['frame_allocations_after_warmup']}")
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,12 @@
+import logging
 import sys
-from ui.mainWindow import PostureWatcherUI
+from utilities import startup  # First, so the startup report also times the imports below
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QMovie
 from PySide6.QtWidgets import QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget
+from utilities.preload import Preloader
+
+MIN_SPLASH_MS = 800  # Keep the animation up at least this long, even when the warm-up is faster
 
 class StartUpAnimationWindow(QMainWindow):
     def __init__(self):
@@ -35,19 +39,32 @@ class StartUpAnimationWindow(QMainWindow):
 
         self.movie.start()
 
+        self.main_window = None
         self.timer = QTimer(self)
         self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.show_main_window)
+        self.timer.start(MIN_SPLASH_MS)
 
-        self.timer.start(2000)  # 3000 ms for 3 seconds, adjust as needed
+        # Heavy modules (OpenCV, MediaPipe, the UI tree) and the pose engine load behind the animation
+        self.warmup = Preloader(startup.warmup_tasks())
+        self.warmup.finished.connect(self.show_main_window)
+        self.warmup.start()
 
     def show_main_window(self):
+        """Switch to the main window once the warm-up has finished and the minimum splash time is over."""
+        if self.main_window is not None or self.timer.isActive() or not self.warmup.isFinished():
+            return
+        startup.report.mark("warm-up finished")
+        startup.report.add_tasks(self.warmup.timings)
+        from ui.mainWindow import PostureWatcherUI  # Already imported by the warm-up, unless it failed
         self.main_window = PostureWatcherUI()
         self.main_window.show()
         self.close()  # Close the startup animation window
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     app = QApplication(sys.argv)
     window = StartUpAnimationWindow()
     window.show()
+    startup.report.mark("splash shown")
     sys.exit(app.exec())
@@ -0,0 +1,78 @@
+import time
+
+GOOD = "Good"
+BAD = "Bad"
+UNKNOWN = "Unknown"
+
+
+class PostureLedger:
+    """Seconds spent in each posture status, integrated from capture timestamps.
+
+    A result's status holds from its frame's capture time until the next result's, so
+    the totals are the same whether 30 or 5 frames per second are analyzed, or frames
+    are dropped. Spans longer than max_gap (stalled camera, slow inference) only count
+    max_gap towards the last status, the rest is Unknown. Time between pause() and
+    resume() is not counted at all. Timestamps are time.monotonic() seconds, like
+    capture.Frame.timestamp.
+    """
+
+    def __init__(self, max_gap=2.0):
+        self.max_gap = max_gap
+        self.reset()
+
+    def reset(self):
+        self.durations = {GOOD: 0.0, BAD: 0.0, UNKNOWN: 0.0}
+        self._since = None  # Start of the open span, None while paused
+        self._status = UNKNOWN
+
+    @property
+    def running(self):
+        return self._since is not None
+
+    def resume(self, now=None):
+        """Start counting; until the first result arrives the time is Unknown."""
+        if self._since is None:
+            self._since = time.monotonic() if now is None else now
+            self._status = UNKNOWN
+
+    def record(self, timestamp, status):
+        """Close the open span at timestamp and count from there as status."""
+        if self._since is None or timestamp < self._since:
+            return  # Paused, or a frame captured before the last resume/result
+        self._close(timestamp)
+        self._status = status if status in (GOOD, BAD) else UNKNOWN
+
+    def pause(self, now=None):
+        if self._since is not None:
+            self._close(time.monotonic() if now is None else now)
+            self._since = None
+
+    def _close(self, until):
+        span = max(until - self._since, 0.0)
+        counted = span if self._status == UNKNOWN else min(span, self.max_gap)
+        self.durations[self._status] += counted
+        self.durations[UNKNOWN] += span - counted
+        self._since = until
+
+    def elapsed(self, now=None):
+        """Seconds counted so far, including the open span."""
+        total = sum(self.durations.values())
+        if self._since is not None:
+            total += max((time.monotonic() if now is None else now) - self._since, 0.0)
+        return total
+
+    @property
+    def total_seconds(self):
+        return sum(self.durations.values())
+
+    @property
+    def good_seconds(self):
+        return self.durations[GOOD]
+
+    @property
+    def bad_seconds(self):
+        return self.durations[BAD]
+
+    @property
+    def unknown_seconds(self):
+        return self.durations[UNKNOWN]
@@ -0,0 +1,180 @@
+"""Local HTTP API streaming the events of an EventHub.
+
+    GET /events   Server-Sent Events: one `event: <type>` per hub event, its JSON in `data:`.
+                  ?rate=N delivers at most N events of each type per second (the newest
+                  wins), ?types=posture,stats filters by type, ?queue=N bounds the client's
+                  backlog (the oldest events are dropped first).
+    GET /latest   The newest event, JSON (?type=posture by default); 204 before the first.
+    GET /stats    Hub and subscriber counters plus whatever the service adds.
+    GET /health   {"ok": true}
+
+Every client is served on its own thread from its own Subscription, so a slow or stalled
+client only drops its own events and never holds up the pipeline or the other clients.
+The server binds to 127.0.0.1 by default; it is meant for tools on the same machine.
+"""
+import json
+import socket
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from posture_detector.serialize import to_json
+
+DEFAULT_PORT = 8765
+KEEPALIVE = 15.0  # Seconds of silence before an SSE comment keeps idle connections open
+SEND_BUFFER = 16384  # Bytes; keeps a slow client's backlog in its Subscription, where it is bounded
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "PostureAPI/1.0"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        api = self.server.api
+        try:
+            if url.path == "/events":
+                self._stream(api, query)
+            elif url.path == "/latest":
+                event = api.hub.latest.get(query.get("type", "posture"))
+                if event is None:
+                    self.send_response(204)
+                    self.end_headers()
+                else:
+                    self._json(event)
+            elif url.path == "/stats":
+                self._json(api.stats())
+            elif url.path == "/health":
+                self._json({"ok": True})
+            else:
+                self._json({"error": f"No such endpoint: {url.path}"}, 404)
+        except ValueError as e:
+            self._json({"error": str(e)}, 400)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away
+
+    def _json(self, payload, status=200):
+        body = json.dumps(payload, default=to_json, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, api, query):
+        rate = float(query["rate"]) if "rate" in query else None
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        if api.max_rate and (rate is None or rate > api.max_rate):
+            rate = api.max_rate
+        types = [t for t in query.get("types", "").split(",") if t] or None
+        queue = min(int(query.get("queue", api.max_queue)), api.max_queue)
+        if queue < 1:
+            raise ValueError("queue must be at least 1")
+
+        subscription = api.subscribe(max_queue=queue, max_rate=rate, types=types)
+        if subscription is None:
+            self._json({"error": f"Too many clients (max {api.max_clients})"}, 503)
+            return
+        try:
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.flush()
+            while True:
+                event = subscription.get(timeout=api.keepalive)
+                if event is None:
+                    if subscription.closed:
+                        break
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    payload = dict(event, dropped=subscription.dropped, coalesced=subscription.coalesced)
+                    data = json.dumps(payload, default=to_json, ensure_ascii=False)
+                    self.wfile.write(f"id: {event['seq']}\nevent: {event['type']}\ndata: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        finally:
+            subscription.close()
+
+    def log_message(self, format, *args):
+        pass  # One line per request and client would drown the service's own output
+
+
+class ApiServer:
+    """Serves an EventHub on host:port from a background thread; port 0 picks a free port.
+
+    max_rate caps the per-client rate (events of a type per second, None for no cap),
+    max_queue the per-client backlog and max_clients the concurrent streams. stats is
+    an optional callable whose dict is merged into /stats.
+    """
+
+    def __init__(self, hub, host="127.0.0.1", port=DEFAULT_PORT, max_clients=32, max_rate=30.0, max_queue=256,
+                 stats=None, keepalive=KEEPALIVE):
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.max_clients = max_clients
+        self.max_rate = max_rate
+        self.max_queue = max_queue
+        self.keepalive = keepalive
+        self._extra_stats = stats
+        self._server = None
+        self._thread = None
+        self._clients = []
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.api = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="posture-api", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        with self._lock:
+            clients = list(self._clients)
+        for subscription in clients:
+            subscription.close()  # Ends the streams, their threads exit
+        self._server.server_close()
+        self._thread.join(timeout=2)
+        self._server = None
+
+    def subscribe(self, **kwargs):
+        """A subscription for a new stream, None when max_clients are connected."""
+        with self._lock:
+            self._clients = [s for s in self._clients if not s.closed]
+            if len(self._clients) >= self.max_clients:
+                self.rejected += 1
+                return None
+            subscription = self.hub.subscribe(**kwargs)
+            self._clients.append(subscription)
+            return subscription
+
+    def stats(self):
+        stats = {"clients": self.hub.subscribers, "rejected": self.rejected, "hub": self.hub.stats()}
+        if self._extra_stats is not None:
+            stats.update(self._extra_stats())
+        return stats
+
+
+def iter_events(url, timeout=None):
+    """Yield the events of an /events stream as dicts, e.g. iter_events(f"{server.url}/events?rate=5")."""
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        data = []
+        for raw in response:
+            line = raw.decode("utf-8").rstrip("\r\n")
+            if line.startswith("data:"):
+                data.append(line[5:].lstrip())
+            elif not line and data:
+                yield json.loads("\n".join(data))
+                data = []
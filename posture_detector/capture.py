@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+import cv2
+from posture_detector.frame_pool import FramePool
+
+
+class Frame:
+    def __init__(self, image, timestamp: float, seq: int, pool=None):
+        self.image = image
+        self.timestamp = timestamp  # time.monotonic() when the frame was read
+        self.seq = seq              # Increases by one for every frame read from the camera
+        self.pool = pool            # FramePool the image buffer goes back to, None for a plain array
+        self._refs = 1
+
+    def retain(self):
+        """Keep the image buffer beyond the call that handed the frame over; pair with release()."""
+        if self.pool is not None:
+            self.pool.retain(self)
+        return self
+
+    def release(self):
+        """Drop one reference, the buffer is recycled after the last one. No-op for plain arrays."""
+        if self.pool is not None:
+            self.pool.release(self)
+
+
+class FrameGrabber:
+    """Reads frames from a camera on a dedicated thread into a latest-frame slot.
+
+    Consumers never wait on the driver: they pick up the newest frame, and frames
+    that were overwritten before anybody read them are counted as dropped.
+
+    Frames are decoded into buffers from a FramePool sized on the first frame, i.e. the
+    resolution the camera actually negotiated. Listeners that keep a frame after their
+    callback returns must retain() it, and release() it when done.
+    """
+
+    def __init__(self, source=0, pool_size=8):
+        self.source = source
+        self.cap = None
+        self.fps = 30  # Default FPS
+        self.pool_size = pool_size  # Recycled frame buffers, 0 allocates a new array for every frame
+        self.pool = None
+        self.frames_read = 0
+        self.frames_dropped = 0
+        self._latest = None
+        self._latest_taken = True
+        self._listeners = []
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            raise Exception("Error: Cannot access the webcam.")
+        # Keep the driver queue short, the thread drains it as fast as frames arrive
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        fps = int(self.cap.get(cv2.CAP_PROP_FPS))
+        self.fps = fps if fps > 0 else 30
+
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+        if self._latest is not None:
+            self._latest.release()
+        self._latest = None
+        self._latest_taken = True
+        self.pool = None
+
+    def is_running(self):
+        return self._running
+
+    def add_listener(self, callback):
+        """Call callback(frame) on the capture thread for every new frame."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _read(self, buffer=None):
+        """Decode the next frame, into buffer when its shape matches; returns (success, image)."""
+        return self.cap.read(buffer)
+
+    def _run(self):
+        seq = 0
+        while self._running:
+            pool = self.pool
+            buffer = pool.acquire() if pool is not None else None
+            success, image = self._read(buffer)
+            if not success:
+                if buffer is not None:
+                    pool.give_back(buffer)
+                time.sleep(0.005)
+                continue
+            seq += 1
+            if image is buffer:
+                frame = Frame(image, time.monotonic(), seq, pool)
+            else:
+                if buffer is not None:
+                    pool.give_back(buffer)  # The resolution changed, size a new pool on this frame
+                if self.pool_size:
+                    self.pool = FramePool(image.shape, image.dtype, self.pool_size)
+                frame = Frame(image, time.monotonic(), seq)
+            with self._cond:
+                if not self._latest_taken:
+                    self.frames_dropped += 1
+                previous = self._latest
+                self._latest = frame
+                self._latest_taken = bool(self._listeners)  # Listeners receive every frame
+                self.frames_read += 1
+                self._cond.notify_all()
+            if previous is not None:
+                previous.release()
+            for callback in list(self._listeners):
+                callback(frame)
+
+    def read(self, after_seq=0, timeout=None):
+        """Return the latest frame newer than after_seq, or None if there is none.
+
+        With a timeout, waits up to that many seconds for a newer frame to arrive. The
+        frame is retained for the caller; release() it to let its buffer be reused.
+        """
+        with self._cond:
+            if timeout:
+                self._cond.wait_for(
+                    lambda: not self._running or (self._latest is not None and self._latest.seq > after_seq),
+                    timeout,
+                )
+            frame = self._latest
+            if frame is None or frame.seq <= after_seq:
+                return None
+            self._latest_taken = True
+            return frame.retain()
+
+
+class VideoFileGrabber(FrameGrabber):
+    """Plays a video file through the capture pipeline at the file's frame rate, like a camera.
+
+    Stands in for a camera in tests, benchmarks and multi-camera runs. With loop the file
+    restarts at its end; otherwise ended is set and no further frames arrive.
+    """
+
+    def __init__(self, path, loop=False, pool_size=8):
+        super().__init__(path, pool_size)
+        self.loop = loop
+        self.ended = False
+        self._due = None
+
+    def _read(self, buffer=None):
+        if self.ended:
+            return False, None
+        now = time.monotonic()
+        if self._due is None or now - self._due > 1 / self.fps:
+            self._due = now  # First frame, or we fell behind: do not catch up
+        elif self._due > now:
+            time.sleep(self._due - now)
+        self._due += 1 / self.fps
+        success, image = self.cap.read(buffer)
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, image = self.cap.read(buffer)
+        if not success:
+            self.ended = True
+        return success, image
+
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+def iter_frames(source):
+    """Yield every Frame of a video file or a directory of images, as fast as they decode.
+
+    Unlike FrameGrabber nothing is dropped; timestamps are the position in the video
+    (or the image index at 30 FPS) in seconds.
+    """
+    if os.path.isdir(source):
+        names = sorted(n for n in os.listdir(source) if os.path.splitext(n)[1].lower() in IMAGE_EXTENSIONS)
+        for seq, name in enumerate(names, start=1):
+            image = cv2.imread(os.path.join(source, name))
+            if image is not None:
+                yield Frame(image, (seq - 1) / 30, seq)
+        return
+
+    cap = cv2.VideoCapture(source)
+    if not cap.isOpened():
+        raise Exception(f"Error: Cannot open video '{source}'.")
+    try:
+        seq = 0
+        while True:
+            success, image = cap.read()
+            if not success:
+                break
+            seq += 1
+            yield Frame(image, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000, seq)
+    finally:
+        cap.release()
@@ -0,0 +1,122 @@
+"""Headless posture monitoring with a local streaming API.
+
+    python -m posture_detector.daemon front=0
+    python -m posture_detector.daemon front=0 side=1 --port 8765 --analysis-rate 10 --save-history
+
+Runs the capture and analyzer pipeline of MultiCameraMonitor without any widgets and
+publishes to an EventHub served by ApiServer:
+
+    posture  every fused verdict (see PostureFusion), as it is produced
+    stats    per-camera throughput and the Good/Bad/Unknown seconds, every --stats-interval
+    state    "started" / "stopped"
+
+Any number of local clients follow them, e.g. `curl -N localhost:8765/events?rate=2`
+or api.iter_events(). The daemon runs until Ctrl+C or SIGTERM; with --save-history the
+monitored time is stored as one session in history.db on exit, like the app does.
+"""
+import argparse
+import signal
+import sys
+import time
+from PySide6.QtCore import QCoreApplication, QTimer
+from posture_detector.api import DEFAULT_PORT, ApiServer
+from posture_detector.events import EventHub
+from posture_detector.multicam import MultiCameraMonitor, parse_camera
+
+
+class MonitorDaemon:
+    """A MultiCameraMonitor publishing to a hub, with the hub served over HTTP."""
+
+    def __init__(self, cameras, host="127.0.0.1", port=DEFAULT_PORT, stats_interval=5.0, max_clients=32,
+                 max_rate=30.0, hub=None, **options):
+        self.hub = hub or EventHub()
+        self.monitor = MultiCameraMonitor(cameras, **options)
+        self.monitor.verdict_ready.connect(self._on_verdict)
+        self.server = ApiServer(self.hub, host, port, max_clients=max_clients, max_rate=max_rate,
+                                stats=self.monitor.stats)
+        self.stats_timer = QTimer()
+        self.stats_timer.setInterval(int(stats_interval * 1000))
+        self.stats_timer.timeout.connect(self.publish_stats)
+        self.started = None
+
+    def start(self):
+        self.server.start()
+        self.monitor.start()
+        self.started = time.time()
+        self.stats_timer.start()
+        self.hub.publish("state", {"state": "started", "cameras": [s.name for s in self.monitor.streams]})
+
+    def stop(self):
+        self.stats_timer.stop()
+        self.monitor.stop()
+        self.publish_stats()
+        self.hub.publish("state", {"state": "stopped"})
+        self.server.stop()
+
+    def _on_verdict(self, verdict):
+        self.hub.publish("posture", verdict)
+
+    def publish_stats(self):
+        self.hub.publish("stats", self.monitor.stats())
+
+    def save_history(self):
+        """Store the monitored time as one session, None if nothing was counted."""
+        ledger = self.monitor.ledger
+        if self.started is None or ledger.total_seconds < 1:
+            return None
+        from utilities.session_store import get_session_store
+        angles = sorted({stream.angle for stream in self.monitor.streams})
+        return get_session_store().add_session(self.started, time.time(), ledger.total_seconds,
+                                               ledger.good_seconds, "+".join(angles))
+
+
+def run(daemon):
+    """Serve until Ctrl+C / SIGTERM."""
+    app = QCoreApplication.instance() or QCoreApplication([])
+    signal.signal(signal.SIGINT, lambda *_: app.quit())
+    signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    wakeup = QTimer()
+    wakeup.timeout.connect(lambda: None)  # Lets Python run its signal handlers while Qt waits
+    wakeup.start(200)
+    daemon.start()
+    print(f"Streaming posture events on {daemon.server.url}/events (Ctrl+C to stop)")
+    try:
+        app.exec()
+    finally:
+        wakeup.stop()
+        daemon.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor posture without a window and stream the results locally.")
+    parser.add_argument("cameras", nargs="+", type=parse_camera,
+                        help="angle=source, e.g. front=0 or side=recordings/side.mp4")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to serve on (default: loopback only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-clients", type=int, default=32)
+    parser.add_argument("--max-rate", type=float, default=30.0, help="Most events of a type per second and client")
+    parser.add_argument("--stats-interval", type=float, default=5.0, help="Seconds between stats events")
+    parser.add_argument("--model-complexity", type=int, choices=(0, 1, 2), default=1)
+    parser.add_argument("--analysis-rate", type=float, help="Max analyzed frames per second and camera")
+    parser.add_argument("--max-skew", type=float, default=0.25, help="Seconds between results that are fused")
+    parser.add_argument("--loop", action="store_true", help="Replay video files instead of stopping at their end")
+    parser.add_argument("--save-history", action="store_true", help="Store the monitored time in history.db")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication.instance() or QCoreApplication([])  # Before the QTimers of the daemon
+    daemon = MonitorDaemon(args.cameras, args.host, args.port, stats_interval=args.stats_interval,
+                           max_clients=args.max_clients, max_rate=args.max_rate,
+                           model_complexity=args.model_complexity, analysis_rate=args.analysis_rate,
+                           max_skew=args.max_skew, loop=args.loop)
+    start = time.monotonic()
+    run(daemon)
+    ledger = daemon.monitor.ledger
+    print(f"Stopped after {time.monotonic() - start:.0f} s: Good {ledger.good_seconds:.1f} s, "
+          f"Bad {ledger.bad_seconds:.1f} s, Unknown {ledger.unknown_seconds:.1f} s")
+    if args.save_history and daemon.save_history():
+        print("Session saved to history")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
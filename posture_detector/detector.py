@@ -1,27 +1,180 @@
+import time
 import cv2
-import mediapipe as mp
+import numpy as np
+from posture_detector.pose_engine import get_pose_engine, lease_pose_engine, release_pose_engine
+from posture_detector.metrics import StageTimer
+from posture_detector.motion_gate import MotionGate
+from posture_detector.roi import RoiTracker
+from posture_detector import landmarks
 
 class PoseLandmarks:
     NOSE = 0
+    LEFT_EAR = 7
     MOUTH_LEFT = 9
     MOUTH_RIGHT = 10
     LEFT_SHOULDER = 11
     RIGHT_SHOULDER = 12
+    LEFT_HIP = 23
 
 class PoseDetector:
-    def __init__(self):
+    def __init__(self, model_complexity=None, motion_gate=None, roi=None, mirror=False, smoother=None,
+                 inference_rate=None):
         self.results = None
-        self.mpDraw = mp.solutions.drawing_utils
-        self.mpPose = mp.solutions.pose
-        self.pose = self.mpPose.Pose()
-        self.pose_connections = self.mpPose.POSE_CONNECTIONS  # Get the pose connections
+        self.model_complexity = model_complexity
+        self.motion_gate = motion_gate  # Optional MotionGate, static frames reuse the last landmarks
+        self.roi = roi  # Optional RoiTracker, infers on a (downscaled) crop around the last pose
+        self.mirror = mirror  # Infer on the horizontally flipped (selfie) view, landmarks still match the frame
+        self.smoother = smoother  # Optional smoothing.LandmarkFilter, also predicts the frames between inferences
+        self.inference_rate = inference_rate  # Max inferences per second, None infers every frame
+        self.landmarks = None  # Landmarks of the last find_pose call
+        self.inferred = False  # Whether the last find_pose call actually ran inference
+        self._has_result = False
+        self._next_inference = None  # Timestamp from which the next frame is inferred, with inference_rate
+        self._engine = None
+        self._pinned = False  # Engine set by the caller, which also closes it
+        self._rgb = None  # Reused inference input buffer
+        self.timer = StageTimer()  # Disabled by default, the live UI swaps in its own
+        self.pose_connections = landmarks.POSE_CONNECTIONS  # Get the pose connections
 
-    def find_pose(self, img, draw=True):
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)  # Convert BGR to RGB
-        self.results = self.pose.process(img_rgb)
+    @property
+    def engine(self):
+        """Shared pose graph, fetched on first use so analyzers are cheap to construct."""
+        if self._engine is None:
+            self._engine = get_pose_engine(self.model_complexity)
+        return self._engine
 
-        if not self.results.pose_landmarks:
+    @engine.setter
+    def engine(self, engine):
+        """Use a dedicated PoseEngine instead of the shared one, e.g. one per camera."""
+        self._engine = engine
+        self._pinned = engine is not None
+
+    def set_motion_gate(self, enabled):
+        """Turn the motion gate on or off, e.g. when the setting changes; a kept gate keeps its state."""
+        if enabled and self.motion_gate is None:
+            self.motion_gate = MotionGate()
+        elif not enabled:
+            self.motion_gate = None
+
+    def set_roi(self, enabled, inference_width=640):
+        """Turn region tracking on or off and set its inference width, e.g. when the settings change."""
+        if not enabled:
+            self.roi = None
+        elif self.roi is None:
+            self.roi = RoiTracker(inference_width=inference_width)
+        else:
+            self.roi.inference_width = inference_width
+
+    def acquire_engine(self):
+        """Lease an engine for a stream of frames (see pose_engine.lease_pose_engine)."""
+        if not self._pinned:
+            self._engine = lease_pose_engine(self, self.model_complexity)
+
+    def release_engine(self):
+        if not self._pinned and self._engine is not None and release_pose_engine(self, self._engine):
+            self._engine = None
+
+    def find_pose(self, img, draw=True, timestamp=None):
+        """Run one inference on a BGR frame (or reuse the last one if the motion gate
+        says the scene is static); draws the overlay onto it in place.
+
+        With inference_rate, at most that many frames per second (of capture time) are
+        inferred; the landmarks of the others are predicted by the smoother, or the last
+        ones are reused. timestamp is the frame's capture time in seconds.
+
+        Returns (img, landmarks) where landmarks is a (33, 4) array (see posture_detector.landmarks),
+        or None when no pose was found.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self._has_result and self._between_inferences(timestamp):
+            lm = self.landmarks
+            if lm is not None and self.smoother is not None:
+                lm = self.smoother.predict(timestamp)
+            self.inferred = False
+        elif self._has_result and self.motion_gate is not None and not self.motion_gate.should_infer(img):
+            lm = self.landmarks
+            self.inferred = False
+        else:
+            if self.motion_gate is not None and not self._has_result:
+                self.motion_gate.should_infer(img)  # Take the reference thumbnail
+            start = self.timer.mark()
+            lm = self._infer(img)
+            self.timer.lap("inference", start)
+            if self.smoother is not None:
+                if lm is None:
+                    self.smoother.reset()  # Pose lost, do not smooth across the gap
+                else:
+                    lm = self.smoother.update(lm, timestamp)
+            self.landmarks = lm
+            self.inferred = True
+            self._has_result = True
+            self._schedule_inference(timestamp)
+
+        if lm is not None and draw:
+            start = self.timer.mark()
+            landmarks.draw_landmarks(img, lm)
+            self.timer.lap("overlay", start)
+        return img, lm
+
+    def _inference_input(self, img):
+        """Convert a BGR image (or crop) into the reused RGB buffer, flipped when mirroring.
+
+        The buffer is marked read-only so MediaPipe can use it without copying; the frame
+        itself is never modified.
+        """
+        if self._rgb is None or self._rgb.shape != img.shape:
+            self._rgb = np.empty(img.shape, dtype=np.uint8)
+        self._rgb.flags.writeable = True
+        cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        if self.mirror:
+            cv2.flip(self._rgb, 1, dst=self._rgb)
+        self._rgb.flags.writeable = False
+        return self._rgb
+
+    def _infer(self, img):
+        h, w = img.shape[:2]
+        region = None
+        if self.roi is not None:
+            img, region = self.roi.crop(img)
+
+        self.results = self.engine.process(self._inference_input(img))
+        lm = None
+        if self.results.pose_landmarks:
+            lm = landmarks.to_array(self.results.pose_landmarks.landmark)
+            if self.mirror:
+                lm = landmarks.mirror(lm)  # Back to the unflipped image
+            if region is not None:
+                lm = self.roi.reproject(lm, region, w, h)
+        if self.roi is not None:
+            self.roi.update(lm, w, h)
+        return lm
+
+    def _between_inferences(self, timestamp):
+        return bool(self.inference_rate) and self._next_inference is not None and timestamp < self._next_inference
+
+    def _schedule_inference(self, timestamp):
+        if not self.inference_rate:
             return
+        interval = 1 / self.inference_rate
+        if self._next_inference is None or timestamp - self._next_inference > interval:
+            self._next_inference = timestamp  # First inference, or after a stall: do not catch up
+        self._next_inference += interval
+
+    @property
+    def skip_ratio(self):
+        """Fraction of frames whose inference was skipped by the motion gate."""
+        return self.motion_gate.skip_ratio if self.motion_gate is not None else 0.0
 
-        self.mpDraw.draw_landmarks(img, self.results.pose_landmarks, self.pose_connections)
-        return img, self.results.pose_landmarks.landmark
+    def reset(self):
+        """Forget the previous frame, e.g. when a new monitoring session starts."""
+        self.landmarks = None
+        self.inferred = False
+        self._has_result = False
+        self._next_inference = None
+        if self.smoother is not None:
+            self.smoother.reset()
+        if self.motion_gate is not None:
+            self.motion_gate.reset()
+        if self.roi is not None:
+            self.roi.reset()
@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import deque
+
+
+class Subscription:
+    """One subscriber's bounded queue of hub events.
+
+    The publisher never waits for a subscriber: when the queue is full its oldest event
+    is dropped. With max_rate, events of one type that arrive faster than that are
+    coalesced, so the subscriber gets the newest of them once per interval. Read with
+    get(); dropped and coalesced count what this subscriber missed.
+    """
+
+    def __init__(self, hub, max_queue=256, max_rate=None, types=None):
+        self.hub = hub
+        self.max_queue = max_queue
+        self.interval = 1 / max_rate if max_rate else 0.0
+        self.types = set(types) if types else None
+        self.dropped = 0
+        self.coalesced = 0
+        self.delivered = 0
+        self.closed = False
+        self._queue = deque()
+        self._held = {}  # type -> newest event waiting for its interval
+        self._due = {}   # type -> time.monotonic() from which the next event of that type goes out
+        self._cond = threading.Condition()
+
+    def offer(self, event):
+        """Called by the hub for every published event."""
+        if self.types is not None and event["type"] not in self.types:
+            return
+        with self._cond:
+            if self.interval:
+                now = time.monotonic()
+                if now < self._due.get(event["type"], 0.0):
+                    if event["type"] in self._held:
+                        self.coalesced += 1
+                    self._held[event["type"]] = event
+                    self._cond.notify()
+                    return
+                self._due[event["type"]] = now + self.interval
+            self._enqueue(event)
+
+    def _enqueue(self, event):
+        if len(self._queue) >= self.max_queue:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(event)
+        self._cond.notify()
+
+    def _release_held(self, now):
+        for event_type, event in list(self._held.items()):
+            if now >= self._due[event_type]:
+                del self._held[event_type]
+                self._due[event_type] = now + self.interval
+                self._enqueue(event)
+
+    def get(self, timeout=None):
+        """Next event, or None after timeout seconds or once the subscription is closed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._held:
+                    self._release_held(now)
+                if self._queue:
+                    self.delivered += 1
+                    return self._queue.popleft()
+                if self.closed:
+                    return None
+                wait = None if deadline is None else deadline - now
+                if wait is not None and wait <= 0:
+                    return None
+                if self._held:
+                    held_due = min(self._due[event_type] for event_type in self._held) - now
+                    wait = held_due if wait is None else min(wait, held_due)
+                self._cond.wait(wait)
+
+    def close(self):
+        self.hub.unsubscribe(self)
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        return {"queued": len(self._queue), "delivered": self.delivered, "dropped": self.dropped,
+                "coalesced": self.coalesced, "max_rate": 1 / self.interval if self.interval else None}
+
+
+class EventHub:
+    """In-process publish/subscribe of posture events, safe to use from any thread.
+
+    publish() stamps an event with a sequence number and the wall time and hands it to
+    every subscription without blocking (see Subscription for the backpressure rules).
+    The newest event of every type is kept for clients that only poll.
+    """
+
+    def __init__(self):
+        self.latest = {}
+        self.published = 0
+        self._subscriptions = []
+        self._lock = threading.Lock()
+
+    def publish(self, event_type, data):
+        with self._lock:
+            self.published += 1
+            event = {"seq": self.published, "type": event_type, "time": time.time(), "data": data}
+            self.latest[event_type] = event
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            subscription.offer(event)
+        return event
+
+    def subscribe(self, max_queue=256, max_rate=None, types=None):
+        subscription = Subscription(self, max_queue, max_rate, types)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def close(self):
+        """Close every subscription, e.g. when the service shuts down."""
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+    @property
+    def subscribers(self):
+        return len(self._subscriptions)
+
+    def stats(self):
+        return {"published": self.published, "subscribers": [s.stats() for s in list(self._subscriptions)]}
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_event_hub():
+    """Process-wide hub the monitoring pipelines publish to."""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = EventHub()
+        return _hub
@@ -0,0 +1,56 @@
+import threading
+import numpy as np
+
+
+class FramePool:
+    """Recycles frame-sized image buffers so capture does not allocate an array per frame.
+
+    Frames built on a pooled buffer are reference counted through Frame.retain() and
+    Frame.release(); the buffer returns to the pool once the last holder released it.
+    A frame that is never released is garbage collected like any other array, so a
+    missed release costs an allocation, never a corrupted frame.
+    """
+
+    def __init__(self, shape, dtype=np.uint8, capacity=8):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.capacity = capacity  # Most free buffers kept around
+        self.allocated = 0        # Buffers created, stays flat once the pipeline is warm
+        self.reused = 0
+        self._free = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """A free buffer of the pool's shape, allocating one if none is free."""
+        with self._lock:
+            if self._free:
+                self.reused += 1
+                return self._free.pop()
+            self.allocated += 1
+        return np.empty(self.shape, self.dtype)
+
+    def give_back(self, buffer):
+        """Return a buffer that was acquired but never wrapped in a Frame."""
+        with self._lock:
+            self._give_back(buffer)
+
+    def retain(self, frame):
+        with self._lock:
+            if frame._refs > 0:
+                frame._refs += 1
+
+    def release(self, frame):
+        with self._lock:
+            if frame._refs <= 0:
+                return  # Already back in the pool
+            frame._refs -= 1
+            if frame._refs == 0:
+                self._give_back(frame.image)
+
+    def _give_back(self, buffer):
+        if len(self._free) < self.capacity and buffer.shape == self.shape and buffer.dtype == self.dtype:
+            self._free.append(buffer)
+
+    @property
+    def free(self):
+        return len(self._free)
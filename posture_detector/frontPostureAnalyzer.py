@@ -1,65 +1,92 @@
-import cv2
+from posture_detector.capture import FrameGrabber
 from posture_detector.detector import PoseDetector, PoseLandmarks
+from posture_detector.motion_gate import MotionGate
+from posture_detector.roi import RoiTracker
+from posture_detector.smoothing import create_filter
+from posture_detector import landmarks
 
-class BasePosture:
-    def __init__(self, nose: float, mouth_right: float, mouth_left: float, left_shoulder: float, right_shoulder: float):
-        self.nose = nose
-        self.mouth_left = mouth_left
-        self.mouth_right = mouth_right
-        self.left_shoulder = left_shoulder
-        self.right_shoulder = right_shoulder
+FACE_POINTS = [PoseLandmarks.NOSE, PoseLandmarks.MOUTH_LEFT, PoseLandmarks.MOUTH_RIGHT]
+SHOULDER_POINTS = [PoseLandmarks.LEFT_SHOULDER, PoseLandmarks.RIGHT_SHOULDER]
+
+# Landmarks compared against the base posture by each deviation algorithm
+ALGORITHM_POINTS = {
+    1: FACE_POINTS + SHOULDER_POINTS,  # Algorithm 1: shoulders in addition to the face
+    2: FACE_POINTS,                    # Algorithm 2: only the face
+}
+
+# Scoring defaults; posture_detector.rescore evaluates alternatives on recorded landmarks
+THRESHOLD = 40  # Adjusted deviation (percent) from which the posture is Bad
+DEVIATION_ADJUSTMENT = 5  # Subtracted from the deviation, tolerates small movements
+ALGORITHM_VERSION = 1
 
 
 class FrontPostureAnalyzer:
-    def __init__(self,base_posture=None):
+    def __init__(self,base_posture=None, model_complexity=None, motion_gate=False, roi=False,
+                 inference_width=640, smoothing="Off", inference_rate=None):
         
-        self.detector = PoseDetector()
-        self.threshold = 40
-        self.deviation_adjustment =5
+        self.detector = PoseDetector(model_complexity, MotionGate() if motion_gate else None,
+                                     RoiTracker(inference_width=inference_width) if roi else None,
+                                     smoother=create_filter(smoothing), inference_rate=inference_rate)
+        self.threshold = THRESHOLD
+        self.deviation_adjustment = DEVIATION_ADJUSTMENT
+        self.algorithm_version = ALGORITHM_VERSION
         self.fps = 30  # Default FPS
-        self.cap = cv2.VideoCapture(0)
-        self.base_posture = base_posture
+        self.grabber = None
+        self.frame = None  # Last processed capture.Frame (timestamp and sequence number)
+        self.base_posture = base_posture  # (33, 4) landmark array of the calibrated posture
+        self.calibrate = False  # Take the base posture from the next frame with a pose
+        self.landmarks = None  # Landmarks of the last processed frame
+        self.draw = True  # Draw the overlay onto analyzed frames, headless runs turn it off
 
     def run(self,camera_index=0):
-        self.cap = cv2.VideoCapture(camera_index)
-        if not self.cap.isOpened():
-            raise Exception("Error: Cannot access the webcam.")
-
-        if not self.base_posture:
-            self.set_base_posture()
-        self.fps = int(self.cap.get(cv2.CAP_PROP_FPS))
+        self.grabber = FrameGrabber(camera_index)
+        self.grabber.start()
+        self.fps = self.grabber.fps
 
     def stop(self):
-        if self.cap:
-            self.cap.release()
-
-    def set_base_posture(self):
-        _, img = self.cap.read()
-        _,lm = self.detector.find_pose(img)
-        if lm is not None:
-            nose = lm[PoseLandmarks.NOSE]
-            mouth_l = lm[9]
-            mouth_r = lm[10]
-            l_shoulder = lm[11]
-            r_shoulder = lm[12]
-            self.base_posture = BasePosture(nose, mouth_l, mouth_r, l_shoulder, r_shoulder)
+        if self.grabber:
+            self.grabber.stop()
+            self.grabber = None
+        self.frame = None
+        self.landmarks = None
+        self.detector.reset()
+
+    def set_base_posture(self, lm=None):
+        """Use the given landmarks as the base posture, or without any those of the next analyzed frame.
+
+        Never runs inference itself: the frame is analyzed by whoever calls analyze() (the
+        inference worker while monitoring), so the GUI thread can call this at any time.
+        """
+        if lm is None:
+            self.calibrate = True
+        else:
+            self.base_posture = lm.copy()
+            self.calibrate = False
 
     def process_frame(self):
-        if not self.cap:
+        """Process the newest captured frame; returns (None, None) if no new frame arrived."""
+        if not self.grabber:
             raise Exception("Camera not started.")
-        success, image = self.cap.read()
-        if not success:
+        frame = self.grabber.read(self.frame.seq if self.frame else 0)
+        if frame is None:
             return None, None
+        image, posture_data, _ = self.analyze(frame)
+        return image, posture_data
+
+    def analyze(self, frame):
+        """Score a capture.Frame and draw the overlay; returns (image, posture_data, landmarks)."""
+        self.frame = frame
 
-        # h, w = image.shape[:2]
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        keypoints = self.detector.pose.process(image_rgb)
-        image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
+        # Single pass: the frame that is scored is the frame that gets displayed
+        image, lm = self.detector.find_pose(frame.image, draw=self.draw, timestamp=frame.timestamp)
 
         posture_data = {"status": "Unknown", "deviation": None, "alert":"Unknown"}
 
-        if keypoints.pose_landmarks:
-            cd = self._get_deviation_from_base_posture()
+        if lm is not None:
+            self.landmarks = lm
+            if self.base_posture is None or self.calibrate:
+                self.set_base_posture(lm)
+            cd = self._get_deviation_from_base_posture(lm, self.algorithm_version)
             posture_data["deviation"] = cd
             if  cd < self.threshold:
                 posture_data["status"] = "Good"
@@ -68,48 +95,16 @@ class FrontPostureAnalyzer:
                 posture_data["status"] = "Bad"
                 posture_data["alert"] = "Bad posture detected! Adjust your sitting position. ⚠️"
 
-        return image_bgr, posture_data
+        return image, posture_data, lm
 
-    def _get_deviation_from_base_posture(self, algorithm_version: int = 1):
+    def _get_deviation_from_base_posture(self, lm, algorithm_version: int = 1):
+        """Score landmarks that were already produced for the current frame."""
         if self.base_posture is None:
             return None
 
-        _, img = self.cap.read()
-        _, lm = self.detector.find_pose(img)
-        deviation = 100
-
         if lm is None:  # No pose found
-            return deviation
-
-        # Nose and mouth are used for both algorithms so its out here.
-        # TODO: Make this more efficient and clean, this function is too cluttered
-        nose = abs(self.base_posture.nose.x - lm[0].x) + abs(self.base_posture.nose.y - lm[0].y) + abs(
-            self.base_posture.nose.z - lm[0].z)
-        mouth_l = abs(self.base_posture.mouth_left.x - lm[9].x) + abs(
-            self.base_posture.mouth_left.y - lm[9].y) + abs(self.base_posture.mouth_left.z - lm[9].z)
-        mouth_r = abs(self.base_posture.mouth_right.x - lm[10].x) + abs(
-            self.base_posture.mouth_right.y - lm[10].y) + abs(self.base_posture.mouth_right.z - lm[10].z)
-
-        if algorithm_version == 1:
-            """
-            Algorithm 1: Utilities shoulders in addition to the face to track posture.
-            """
-            l_shoulder = abs(self.base_posture.left_shoulder.x - lm[11].x) + abs(self.base_posture.left_shoulder.y - lm[11].y) + \
-                abs(self.base_posture.left_shoulder.z - lm[11].z)
-            r_shoulder = abs(self.base_posture.right_shoulder.x - lm[12].x) + abs(self.base_posture.right_shoulder.y - lm[12].y) + \
-                abs(self.base_posture.right_shoulder.z - lm[12].z)
-
-            deviation = int(
-                ((nose + mouth_l + mouth_r + l_shoulder + r_shoulder) / (self.base_posture.nose.x +
-                 self.base_posture.mouth_left.x + self.base_posture.mouth_right.x + self.base_posture.left_shoulder.x +
-                 self.base_posture.right_shoulder.x) * 100))
-        elif algorithm_version == 2:
-            """
-            Algorithm 2: Utilities only the face to track posture.
-            """
-            deviation = int(
-                ((nose + mouth_l + mouth_r) / (self.base_posture.nose.x + self.base_posture.mouth_left.x +
-                                               self.base_posture.mouth_right.x) * 100))
+            return 100
 
+        deviation = int(landmarks.deviation(self.base_posture, lm, ALGORITHM_POINTS[algorithm_version]))
         adjusted_deviation = 100 if deviation >= 100 else int(deviation - self.deviation_adjustment)
         return adjusted_deviation
@@ -0,0 +1,56 @@
+from collections import deque
+
+GOOD_ALERT = "Perfect posture! Keep it up! 😊"
+METRIC_KEYS = ("deviation", "neck_inclination", "torso_inclination")
+ANGLE_PRIORITY = {"Side": 0, "Front": 1}  # The side view's alerts say what to fix, prefer them
+
+
+class PostureFusion:
+    """Combines the results of several cameras into one verdict per result.
+
+    Every camera keeps its results of the last `history` seconds. When a result
+    arrives, each other camera contributes its result captured closest to the same
+    time, if that is within max_skew seconds; cameras without one count as missing.
+    The verdict is Bad if any aligned camera says Bad, Good if the known ones all say
+    Good and Unknown otherwise. Timestamps are capture times on one clock
+    (time.monotonic(), as set by FrameGrabber).
+    """
+
+    def __init__(self, max_skew=0.25, history=1.0):
+        self.max_skew = max_skew
+        self.history = history
+        self.cameras = {}  # name -> (angle, deque of (timestamp, posture_data))
+
+    def add(self, camera, angle, timestamp, posture_data):
+        """Record one camera's result and return the fused verdict at its timestamp."""
+        _, results = self.cameras.setdefault(camera, (angle, deque()))
+        results.append((timestamp, posture_data))
+        while results and results[0][0] < timestamp - self.history:
+            results.popleft()
+        return self.verdict(timestamp)
+
+    def verdict(self, timestamp):
+        aligned = []
+        statuses = {}
+        for name, (angle, results) in self.cameras.items():
+            nearest = min(results, key=lambda result: abs(result[0] - timestamp), default=None)
+            if nearest is None or abs(nearest[0] - timestamp) > self.max_skew:
+                statuses[name] = "Missing"
+                continue
+            statuses[name] = nearest[1]["status"]
+            aligned.append((ANGLE_PRIORITY.get(angle, len(ANGLE_PRIORITY)), nearest[0], nearest[1]))
+        aligned.sort(key=lambda item: item[0])
+
+        verdict = {"timestamp": timestamp, "status": "Unknown", "alert": "Unknown", "cameras": statuses,
+                   "skew": max((abs(t - timestamp) for _, t, _ in aligned), default=None)}
+        for key in METRIC_KEYS:
+            verdict[key] = next((data[key] for _, _, data in aligned if data.get(key) is not None), None)
+        bad = [data for _, _, data in aligned if data["status"] == "Bad"]
+        if bad:
+            verdict["status"], verdict["alert"] = "Bad", bad[0]["alert"]
+        elif any(data["status"] == "Good" for _, _, data in aligned):
+            verdict["status"], verdict["alert"] = "Good", GOOD_ALERT
+        return verdict
+
+    def reset(self):
+        self.cameras.clear()
@@ -0,0 +1,92 @@
+"""Pose landmarks as a (33, 4) float32 array of x, y, z, visibility.
+
+MediaPipe results are converted once per frame with to_array(); everything after that
+works on arrays. The helpers also accept stacks of frames shaped (..., 33, 4), so a
+whole recording can be scored in one call.
+"""
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 33
+X, Y, Z, VISIBILITY = range(4)
+
+# Same edges as mediapipe.solutions.pose.POSE_CONNECTIONS
+POSE_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20), (11, 23),
+    (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28), (27, 29),
+    (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+])
+
+
+def to_array(landmarks):
+    """Convert a MediaPipe landmark list to a (33, 4) array, or None if there is none."""
+    if landmarks is None:
+        return None
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in landmarks], dtype=np.float32)
+
+
+def visible(lm, threshold=0.6):
+    """Boolean mask of the landmarks whose visibility is above threshold."""
+    return lm[..., VISIBILITY] > threshold
+
+
+def deviation(base, lm, points):
+    """Percent deviation of the given points from the base posture.
+
+    The summed L1 distance over x, y and z, relative to the sum of the base x coordinates.
+    """
+    distance = np.abs(base[..., points, :VISIBILITY] - lm[..., points, :VISIBILITY]).sum(axis=(-1, -2))
+    return distance / base[..., points, X].sum(axis=-1) * 100
+
+
+def relative_to(lm, origin=0):
+    """x, y of every landmark relative to the origin landmark, shaped (..., 33, 2)."""
+    return lm[..., :, :Z] - lm[..., origin:origin + 1, :Z]
+
+
+def yoga_features(lm):
+    """Classifier input: x, y offsets from the nose, interleaved, shaped (..., 66)."""
+    offsets = relative_to(lm)
+    return offsets.reshape(offsets.shape[:-2] + (NUM_LANDMARKS * 2,))
+
+
+def to_pixels(lm, width, height):
+    """Integer pixel coordinates of every landmark, shaped (..., 33, 2)."""
+    return (lm[..., :Z] * (width, height)).astype(np.int32)
+
+
+def inclination(lower, upper):
+    """Degrees between the line from lower up to upper and the vertical, shaped (...).
+
+    Points are pixel coordinates shaped (..., 2), e.g. from to_pixels(); like
+    SidePostureAnalyzer.calculate_angle, but NaN where the points coincide.
+    """
+    dx, dy = np.moveaxis(np.asarray(upper, np.float64) - lower, -1, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.degrees(np.arccos(np.clip(-dy / np.hypot(dx, dy), -1, 1)))
+
+
+def mirror(lm):
+    """Landmarks of the horizontally flipped image (keeps landmark indices)."""
+    mirrored = lm.copy()
+    mirrored[..., X] = 1 - mirrored[..., X]
+    return mirrored
+
+
+def draw_landmarks(image, lm, connection_color=(224, 224, 224), connection_thickness=2,
+                   landmark_color=(0, 0, 255), landmark_radius=2, landmark_thickness=2, visibility=0.5):
+    """Draw the pose skeleton onto a BGR image in place, skipping poorly visible landmarks."""
+    if lm is None:
+        return image
+    h, w = image.shape[:2]
+    points = to_pixels(lm, w, h)
+    shown = visible(lm, visibility)
+
+    edges = POSE_CONNECTIONS[shown[POSE_CONNECTIONS[:, 0]] & shown[POSE_CONNECTIONS[:, 1]]]
+    if len(edges):
+        cv2.polylines(image, list(points[edges]), False, connection_color, connection_thickness)
+    for x, y in points[shown]:
+        cv2.circle(image, (int(x), int(y)), landmark_radius, landmark_color, landmark_thickness)
+    return image
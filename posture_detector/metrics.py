@@ -0,0 +1,108 @@
+import json
+import os
+import time
+from collections import deque
+import numpy as np
+
+
+def summarize(samples_ms):
+    """Latency statistics of a sequence of millisecond samples."""
+    samples_ms = np.asarray(samples_ms, dtype=float)
+    if samples_ms.size == 0:
+        return {"iterations": 0, "mean_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "fps": None}
+    mean = samples_ms.mean()
+    p50, p95, p99 = np.percentile(samples_ms, (50, 95, 99))
+    return {
+        "iterations": int(samples_ms.size),
+        "mean_ms": round(float(mean), 4),
+        "p50_ms": round(float(p50), 4),
+        "p95_ms": round(float(p95), 4),
+        "p99_ms": round(float(p99), 4),
+        "fps": round(1000 / mean, 1) if mean > 0 else None,
+    }
+
+
+class StageTimer:
+    """Rolling per-stage timings for the live pipeline.
+
+    Stages are timed with mark()/lap() pairs. While disabled both return immediately
+    without reading the clock, so the hooks can stay in the hot path. Each stage keeps
+    its last `window` samples, from which percentiles are computed on demand.
+    """
+
+    def __init__(self, enabled=False, window=300, dump_path=None, dump_interval=10):
+        self.enabled = enabled
+        self.window = window
+        self.dump_path = dump_path          # Append a JSON snapshot here every dump_interval seconds
+        self.dump_interval = dump_interval
+        self.counters = {}                  # e.g. dropped frames, skip ratio
+        self._stages = {}
+        self._ticks = deque(maxlen=window)
+        self._last_dump = time.monotonic()
+
+    def mark(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def lap(self, stage, since):
+        """Record the time since `since` (a mark) under stage; returns a new mark."""
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        self.record(stage, (now - since) * 1000)
+        return now
+
+    def record(self, stage, ms):
+        samples = self._stages.get(stage)
+        if samples is None:
+            samples = self._stages[stage] = deque(maxlen=self.window)
+        samples.append(ms)
+
+    def set_counter(self, name, value):
+        if self.enabled:
+            self.counters[name] = value
+
+    def tick(self):
+        """Count one finished frame; writes the periodic dump when it is due."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        self._ticks.append(now)
+        if self.dump_path and now - self._last_dump >= self.dump_interval:
+            self._last_dump = now
+            self.dump()
+
+    @property
+    def fps(self):
+        ticks = list(self._ticks)
+        if len(ticks) < 2 or ticks[-1] == ticks[0]:
+            return 0.0
+        return (len(ticks) - 1) / (ticks[-1] - ticks[0])
+
+    def snapshot(self):
+        return {
+            "time": time.time(),
+            "fps": round(self.fps, 2),
+            "stages": {name: summarize(list(samples)) for name, samples in self._stages.items()},
+            "counters": dict(self.counters),
+        }
+
+    def dump(self):
+        os.makedirs(os.path.dirname(self.dump_path) or ".", exist_ok=True)
+        with open(self.dump_path, "a") as file:
+            file.write(json.dumps(self.snapshot()) + "\n")
+
+    def format_hud(self):
+        """Short multi-line summary for the on-screen overlay."""
+        lines = [f"FPS {self.fps:5.1f}"]
+        for name, samples in list(self._stages.items()):
+            if samples:
+                lines.append(f"{name:<10} {np.median(list(samples)):6.1f} ms")
+        for name, value in list(self.counters.items()):
+            lines.append(f"{name:<10} {value:.2f}" if isinstance(value, float) else f"{name:<10} {value}")
+        return "\n".join(lines)
+
+    def reset(self):
+        self.counters.clear()
+        self._stages.clear()
+        self._ticks.clear()
+        self._last_dump = time.monotonic()
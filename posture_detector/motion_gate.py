@@ -0,0 +1,43 @@
+import cv2
+
+
+class MotionGate:
+    """Cheap pre-stage that skips pose inference while the scene is static.
+
+    Each frame is shrunk to a tiny grey thumbnail and compared with the thumbnail of
+    the last frame that was actually inferred. Comparing against the last inferred
+    frame (not the previous frame) means slow drift still triggers inference.
+    """
+
+    def __init__(self, threshold=2.0, max_skipped=15, size=(64, 48)):
+        self.threshold = threshold      # Mean absolute grey level difference (0-255) that counts as motion
+        self.max_skipped = max_skipped  # Force a full inference after this many skipped frames
+        self.size = size
+        self.frames_seen = 0
+        self.frames_skipped = 0
+        self._reference = None
+        self._skipped_in_row = 0
+
+    def should_infer(self, image):
+        small = cv2.cvtColor(cv2.resize(image, self.size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        self.frames_seen += 1
+        if self._reference is not None and self._skipped_in_row < self.max_skipped:
+            motion = cv2.mean(cv2.absdiff(small, self._reference))[0]
+            if motion < self.threshold:
+                self._skipped_in_row += 1
+                self.frames_skipped += 1
+                return False
+        self._reference = small
+        self._skipped_in_row = 0
+        return True
+
+    @property
+    def skip_ratio(self):
+        """Fraction of frames for which inference was skipped."""
+        return self.frames_skipped / self.frames_seen if self.frames_seen else 0.0
+
+    def reset(self):
+        self.frames_seen = 0
+        self.frames_skipped = 0
+        self._reference = None
+        self._skipped_in_row = 0
@@ -0,0 +1,243 @@
+"""Several cameras monitored at once, with one fused front + side verdict.
+
+    python -m posture_detector.multicam front=0 side=1 --seconds 600
+    python -m posture_detector.multicam front=recordings/front.mp4 side=recordings/side.mp4
+
+Every camera (or video file standing in for one) gets its own capture thread, pose
+engine and inference worker, so cameras are analyzed in parallel: MediaPipe releases
+the GIL while it infers. Results are fused by capture time with PostureFusion. The
+run writes every verdict to verdicts.jsonl and per-camera throughput plus the fused
+Good/Bad/Unknown time to summary.json.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from PySide6.QtCore import QCoreApplication, QObject, Signal
+from posture_detector.accounting import PostureLedger
+from posture_detector.capture import FrameGrabber, VideoFileGrabber
+from posture_detector.fusion import PostureFusion
+from posture_detector.metrics import StageTimer
+from posture_detector.offline import create_analyzer
+from posture_detector.serialize import to_json
+from posture_detector.pose_engine import PoseEngine
+from posture_detector.worker import InferenceWorker
+
+ANGLES = ("Front", "Side")
+
+
+class CameraStream(QObject):
+    """One camera with its own capture thread, pose engine, analyzer and inference worker.
+
+    result_ready is emitted on the thread that owns the stream; receivers that keep the
+    frame after returning must retain() it.
+    """
+
+    result_ready = Signal(object, object, object, object, object)  # stream, frame, image, posture_data, landmarks
+
+    def __init__(self, name, angle, source, model_complexity=1, analysis_rate=None, loop=False, draw=False,
+                 parent=None, **options):
+        super().__init__(parent)
+        self.name = name
+        self.angle = angle
+        self.source = source
+        self.analysis_rate = analysis_rate
+        self.model_complexity = model_complexity
+        self.analyzer = create_analyzer(angle.lower(), model_complexity=model_complexity, **options)
+        self.analyzer.draw = draw
+        if isinstance(source, str):
+            self.grabber = VideoFileGrabber(source, loop=loop)
+        else:
+            self.grabber = FrameGrabber(source)
+        self.timer = StageTimer(enabled=True)
+        self.engine = None
+        self.worker = None
+        self.results = 0
+        self.started_at = None
+        self.stopped_at = None
+        self.frames_dropped = 0  # Worker counters, kept when the worker is stopped
+        self.frames_skipped = 0
+
+    def start(self):
+        # A graph of its own: the shared engine serializes inference across cameras
+        self.engine = PoseEngine(self.model_complexity)
+        self.analyzer.detector.engine = self.engine
+        self.grabber.start()
+        self.analyzer.grabber = self.grabber
+        self.worker = InferenceWorker(self.analyzer, timer=self.timer, max_rate=self.analysis_rate)
+        self.worker.result_ready.connect(self._on_result)
+        self.worker.start()
+        self.grabber.add_listener(self.worker.submit)
+        self.started_at = time.monotonic()
+        self.stopped_at = None
+
+    def stop(self):
+        if self.worker is not None:
+            self.grabber.remove_listener(self.worker.submit)
+            self.worker.result_ready.disconnect(self._on_result)
+            self.worker.stop()
+            self.frames_dropped = self.worker.frames_dropped
+            self.frames_skipped = self.worker.frames_skipped
+            self.worker = None
+            self.stopped_at = time.monotonic()
+        self.analyzer.stop()
+        if self.engine is not None:
+            self.engine.close()
+            self.engine = None
+
+    @property
+    def ended(self):
+        """Whether a video file source has played to its end."""
+        return getattr(self.grabber, "ended", False)
+
+    def _on_result(self, frame, image, posture_data, landmarks):
+        self.results += 1
+        self.result_ready.emit(self, frame, image, posture_data, landmarks)
+
+    def stats(self):
+        seconds = (self.stopped_at or time.monotonic()) - self.started_at if self.started_at else 0.0
+        snapshot = self.timer.snapshot()
+        return {
+            "name": self.name,
+            "angle": self.angle,
+            "source": self.source,
+            "seconds": round(seconds, 2),
+            "frames_read": self.grabber.frames_read,
+            "capture_fps": round(self.grabber.frames_read / seconds, 2) if seconds else None,
+            "frames_analyzed": self.results,
+            "analysis_fps": round(self.results / seconds, 2) if seconds else None,
+            "dropped_capture": self.grabber.frames_dropped,
+            "dropped_queue": self.worker.frames_dropped if self.worker else self.frames_dropped,
+            "skipped_rate": self.worker.frames_skipped if self.worker else self.frames_skipped,
+            "stages": snapshot["stages"],
+        }
+
+
+class MultiCameraMonitor(QObject):
+    """Runs a CameraStream per (angle, source) and fuses their results.
+
+    verdict_ready carries the fused verdict (see PostureFusion) of every result, on the
+    thread that owns the monitor; its Good/Bad/Unknown time is kept in ledger.
+    """
+
+    verdict_ready = Signal(object)
+
+    def __init__(self, cameras, max_skew=0.25, parent=None, **options):
+        super().__init__(parent)
+        self.streams = []
+        for i, (angle, source) in enumerate(cameras):
+            same_angle = sum(1 for other, _ in cameras if other == angle)
+            name = f"{angle.lower()}{i}" if same_angle > 1 else angle.lower()
+            stream = CameraStream(name, angle, source, parent=self, **options)
+            stream.result_ready.connect(self._on_result)
+            self.streams.append(stream)
+        self.fusion = PostureFusion(max_skew)
+        self.ledger = PostureLedger()
+        self.verdicts = 0
+
+    def start(self):
+        try:
+            for stream in self.streams:
+                stream.start()
+        except Exception:
+            self.stop()
+            raise
+        self.ledger.resume()
+
+    def stop(self):
+        self.ledger.pause()
+        for stream in self.streams:
+            stream.stop()
+
+    @property
+    def ended(self):
+        return all(stream.ended for stream in self.streams)
+
+    def _on_result(self, stream, frame, image, posture_data, landmarks):
+        verdict = self.fusion.add(stream.name, stream.angle, frame.timestamp, posture_data)
+        frame.release()
+        self.ledger.record(frame.timestamp, verdict["status"])
+        self.verdicts += 1
+        self.verdict_ready.emit(verdict)
+
+    def stats(self):
+        return {
+            "cameras": [stream.stats() for stream in self.streams],
+            "verdicts": self.verdicts,
+            "seconds": {"good": round(self.ledger.good_seconds, 2), "bad": round(self.ledger.bad_seconds, 2),
+                        "unknown": round(self.ledger.unknown_seconds, 2)},
+        }
+
+
+def parse_camera(spec):
+    """'front=0' or 'side=recordings/side.mp4' -> ('Front', 0) / ('Side', 'recordings/side.mp4')."""
+    angle, _, source = spec.partition("=")
+    angle = angle.capitalize()
+    if angle not in ANGLES or not source:
+        raise argparse.ArgumentTypeError(f"Expected front=<camera or video> or side=<camera or video>, got '{spec}'.")
+    return angle, int(source) if source.isdigit() else source
+
+
+def run(cameras, output_dir, seconds=None, interval=5.0, **options):
+    """Monitor until every video has ended, `seconds` have passed or Ctrl+C; returns the summary."""
+    app = QCoreApplication.instance() or QCoreApplication([])
+    os.makedirs(output_dir, exist_ok=True)
+    monitor = MultiCameraMonitor(cameras, **options)
+    with open(os.path.join(output_dir, "verdicts.jsonl"), "w", encoding="utf-8") as verdicts:
+        monitor.verdict_ready.connect(
+            lambda verdict: verdicts.write(json.dumps(verdict, default=to_json, ensure_ascii=False) + "\n"))
+        monitor.start()
+        start = time.monotonic()
+        next_report = start + interval
+        last_count, idle_since = 0, None
+        try:
+            while seconds is None or time.monotonic() - start < seconds:
+                app.processEvents()
+                now = time.monotonic()
+                if monitor.verdicts != last_count:
+                    last_count, idle_since = monitor.verdicts, None
+                elif monitor.ended:
+                    idle_since = idle_since or now
+                    if now - idle_since > 1.0:
+                        break  # Every video has played and the workers have caught up
+                if now >= next_report:
+                    next_report += interval
+                    print(", ".join(f"{c['name']}: {c['analysis_fps']} fps" for c in monitor.stats()["cameras"]))
+                time.sleep(0.002)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            monitor.stop()
+            app.processEvents()
+            summary = monitor.stats()  # After stop(): includes the results the workers finished last
+    with open(os.path.join(output_dir, "summary.json"), "w") as file:
+        json.dump(summary, file, indent=2, default=to_json)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor posture with several cameras and fuse their verdicts.")
+    parser.add_argument("cameras", nargs="+", type=parse_camera,
+                        help="angle=source, e.g. front=0 or side=recordings/side.mp4")
+    parser.add_argument("--output", default="storage/multicam", help="Directory for verdicts.jsonl and summary.json")
+    parser.add_argument("--seconds", type=float, help="Stop after this long (default: when every video has ended)")
+    parser.add_argument("--model-complexity", type=int, choices=(0, 1, 2), default=1)
+    parser.add_argument("--analysis-rate", type=float, help="Max analyzed frames per second and camera")
+    parser.add_argument("--max-skew", type=float, default=0.25, help="Seconds between results that are fused")
+    parser.add_argument("--loop", action="store_true", help="Replay video files until --seconds")
+    args = parser.parse_args(argv)
+
+    summary = run(args.cameras, args.output, seconds=args.seconds, model_complexity=args.model_complexity,
+                  analysis_rate=args.analysis_rate, max_skew=args.max_skew, loop=args.loop)
+    for camera in summary["cameras"]:
+        print(f"{camera['name']} ({camera['source']}): {camera['frames_read']} frames read at "
+              f"{camera['capture_fps']} fps, {camera['frames_analyzed']} analyzed at {camera['analysis_fps']} fps, "
+              f"{camera['dropped_queue']} dropped")
+    print(f"{summary['verdicts']} fused verdicts; Good {summary['seconds']['good']} s, "
+          f"Bad {summary['seconds']['bad']} s, Unknown {summary['seconds']['unknown']} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Headless analysis of recorded videos or image directories.
+
+    python -m posture_detector.offline front recordings/ --output results/ --workers 4
+
+Frames are decoded and analyzed back to back with no display or pacing. For every
+input a <name>.jsonl file (one posture_data record per frame) and a
+<name>_landmarks.npy file ((frames, 33, 4), NaN where no pose was found) are written,
+plus summary.json with the throughput of each input and of the whole run. <name> is
+the input's file name, or its path below their common folder when inputs share one.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from posture_detector.capture import IMAGE_EXTENSIONS, iter_frames
+from posture_detector.landmarks import NUM_LANDMARKS
+from posture_detector.serialize import to_json
+
+MODES = ("front", "side", "yoga")
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v", ".wmv"}
+
+
+def create_analyzer(mode, model_complexity=1, motion_gate=False, roi=False, inference_width=640,
+                    yoga_backend="numpy", target_pose=None, smoothing="Off", inference_rate=None):
+    """Build an analyzer for mode ('front', 'side' or 'yoga') without opening a camera."""
+    if mode == "front":
+        from posture_detector.frontPostureAnalyzer import FrontPostureAnalyzer
+        return FrontPostureAnalyzer(model_complexity=model_complexity, motion_gate=motion_gate, roi=roi,
+                                    inference_width=inference_width, smoothing=smoothing,
+                                    inference_rate=inference_rate)
+    if mode == "side":
+        from posture_detector.sidePostureAnalyzer import SidePostureAnalyzer
+        return SidePostureAnalyzer(model_complexity=model_complexity, motion_gate=motion_gate, roi=roi,
+                                   inference_width=inference_width, smoothing=smoothing,
+                                   inference_rate=inference_rate)
+    if mode == "yoga":
+        from posture_detector.yogaAnalyzer import YogaAnalyzer
+        analyzer = YogaAnalyzer(model_complexity=model_complexity, backend=yoga_backend)
+        analyzer.target_pose = target_pose
+        return analyzer
+    raise ValueError(f"Unknown mode '{mode}', expected one of {MODES}.")
+
+
+def expand_inputs(paths):
+    """Videos and image directories to analyze; directories of videos are expanded."""
+    inputs = []
+    for path in paths:
+        if not os.path.isdir(path):
+            inputs.append(path)
+            continue
+        names = sorted(os.listdir(path))
+        if any(os.path.splitext(n)[1].lower() in IMAGE_EXTENSIONS for n in names):
+            inputs.append(path)  # An image sequence
+            continue
+        for name in names:
+            child = os.path.join(path, name)
+            if os.path.isdir(child):
+                inputs.extend(expand_inputs([child]))
+            elif os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS:
+                inputs.append(child)
+    return inputs
+
+
+def output_names(sources):
+    """A distinct output name per source: its file or directory name without extension.
+
+    Sources sharing a name (a/clip.mp4 and b/clip.mp4) are named after their path below
+    the folder the group has in common instead (a_clip, b_clip); names that still clash
+    get a counter appended.
+    """
+    stems = [os.path.splitext(os.path.basename(os.path.normpath(s)))[0] for s in sources]
+    groups = {}
+    for source, stem in zip(sources, stems):
+        groups.setdefault(stem, []).append(os.path.abspath(source))
+    names = []
+    taken = set()
+    for source, stem in zip(sources, stems):
+        name = stem
+        group = groups[stem]
+        if len(group) > 1:
+            root = os.path.commonpath([os.path.dirname(path) for path in group])
+            relative = os.path.relpath(os.path.abspath(source), root)
+            name = os.path.splitext(relative)[0].replace(os.sep, "_")
+        unique, count = name, 2
+        while unique in taken:
+            unique, count = f"{name}_{count}", count + 1
+        taken.add(unique)
+        names.append(unique)
+    return names
+
+
+def analyze_source(source, mode, output_dir, options, name=None):
+    """Analyze every frame of one input and write its results; returns its throughput summary.
+
+    Results go to <name>.jsonl and <name>_landmarks.npy, name defaults to the source's
+    file name without extension (run() passes output_names() so inputs never collide).
+    """
+    analyzer = create_analyzer(mode, **options)
+    analyzer.draw = False
+
+    if name is None:
+        name = output_names([source])[0]
+    all_landmarks = []
+    frames = 0
+    detected = 0
+    start = time.perf_counter()
+    with open(os.path.join(output_dir, f"{name}.jsonl"), "w", encoding="utf-8") as records:
+        for frame in iter_frames(source):
+            _, posture_data, lm = analyzer.analyze(frame)
+            frames += 1
+            if lm is None:
+                lm = np.full((NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+            else:
+                detected += 1
+            all_landmarks.append(lm)
+            record = {"frame": frame.seq, "timestamp": frame.timestamp, **posture_data}
+            records.write(json.dumps(record, default=to_json, ensure_ascii=False) + "\n")
+    seconds = time.perf_counter() - start
+
+    landmarks = np.stack(all_landmarks) if all_landmarks else np.empty((0, NUM_LANDMARKS, 4), np.float32)
+    np.save(os.path.join(output_dir, f"{name}_landmarks.npy"), landmarks)
+    return {
+        "source": source,
+        "name": name,
+        "frames": frames,
+        "detected": detected,
+        "seconds": round(seconds, 3),
+        "fps": round(frames / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def run(sources, mode, output_dir, workers=1, **options):
+    """Analyze all sources, in parallel processes when workers > 1; returns the run summary."""
+    os.makedirs(output_dir, exist_ok=True)
+    names = output_names(sources)
+    start = time.perf_counter()
+    if workers > 1 and len(sources) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(analyze_source, s, mode, output_dir, options, n) for s, n in zip(sources, names)]
+            results = [f.result() for f in futures]
+    else:
+        results = [analyze_source(s, mode, output_dir, options, n) for s, n in zip(sources, names)]
+    seconds = time.perf_counter() - start
+
+    total_frames = sum(r["frames"] for r in results)
+    summary = {
+        "mode": mode,
+        "workers": workers,
+        "inputs": results,
+        "frames": total_frames,
+        "seconds": round(seconds, 3),
+        "fps": round(total_frames / seconds, 2) if seconds > 0 else None,
+    }
+    with open(os.path.join(output_dir, "summary.json"), "w") as file:
+        json.dump(summary, file, indent=2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run posture analysis over recorded videos or image directories.")
+    parser.add_argument("mode", choices=MODES)
+    parser.add_argument("inputs", nargs="+", help="Video files, image directories or directories of videos")
+    parser.add_argument("--output", default="storage/offline", help="Directory for the results")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Inputs analyzed in parallel")
+    parser.add_argument("--model-complexity", type=int, choices=(0, 1, 2), default=1)
+    parser.add_argument("--motion-gate", action="store_true", help="Skip inference on static frames")
+    parser.add_argument("--roi", action="store_true", help="Infer on a crop around the last pose")
+    parser.add_argument("--inference-width", type=int, default=640)
+    parser.add_argument("--smoothing", choices=("Off", "Euro", "Kalman"), default="Off",
+                        help="Temporal landmark filter (front and side)")
+    parser.add_argument("--inference-rate", type=float,
+                        help="Max pose inferences per second of video, the frames between are predicted")
+    parser.add_argument("--yoga-backend", choices=("numpy", "keras"), default="numpy")
+    parser.add_argument("--target-pose", help="Pose the yoga mode checks against")
+    args = parser.parse_args(argv)
+
+    sources = expand_inputs(args.inputs)
+    if not sources:
+        parser.error("No videos or image directories found.")
+
+    summary = run(sources, args.mode, args.output, workers=min(args.workers, len(sources)),
+                  model_complexity=args.model_complexity, motion_gate=args.motion_gate, roi=args.roi,
+                  inference_width=args.inference_width, yoga_backend=args.yoga_backend,
+                  target_pose=args.target_pose, smoothing=args.smoothing, inference_rate=args.inference_rate)
+    for result in summary["inputs"]:
+        print(f"{result['source']}: {result['frames']} frames, {result['fps']} frames/s")
+    print(f"Total: {summary['frames']} frames in {summary['seconds']} s ({summary['fps']} frames/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import threading
+import numpy as np
+
+
+class PoseEngine:
+    """Process-wide MediaPipe Pose graph, created once and shared by every analyzer.
+
+    The graph is not thread-safe, so inference is serialized with a lock. Changing the
+    model complexity rebuilds the graph in place; holders of the engine keep working.
+    The graph also tracks the person from frame to frame, so only one stream may run
+    through it at a time: running consumers lease it with lease_pose_engine().
+    """
+
+    def __init__(self, model_complexity=1):
+        self.model_complexity = model_complexity
+        self._lock = threading.Lock()
+        self.pose = self._build(model_complexity)
+
+    @staticmethod
+    def _build(model_complexity):
+        import mediapipe as mp  # Slow to import, only pay for it when a graph is built
+        return mp.solutions.pose.Pose(model_complexity=model_complexity)
+
+    def process(self, image_rgb):
+        with self._lock:
+            return self.pose.process(image_rgb)
+
+    def warm_up(self, width=640, height=480):
+        """Run one inference on a blank frame so the first real frame is not slowed by model setup."""
+        self.process(np.zeros((height, width, 3), dtype=np.uint8))
+
+    def set_model_complexity(self, model_complexity):
+        if model_complexity == self.model_complexity:
+            return
+        pose = self._build(model_complexity)
+        with self._lock:
+            old, self.pose = self.pose, pose
+            self.model_complexity = model_complexity
+        old.close()
+
+    def close(self):
+        with self._lock:
+            self.pose.close()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_pose_engine(model_complexity=None):
+    """Return the shared PoseEngine, creating and warming it on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = PoseEngine(1 if model_complexity is None else model_complexity)
+            _engine.warm_up()
+        elif model_complexity is not None:
+            _engine.set_model_complexity(model_complexity)
+        return _engine
+
+
+_lease_owner = None  # Who streams frames through the shared engine
+_private = {}  # Engines handed out while the shared one was leased -> their owner
+
+
+def lease_pose_engine(owner, model_complexity=None):
+    """The shared engine for owner's exclusive use, or a private one while another owner holds it.
+
+    Frames of two unrelated streams interleaved through one graph would blend its
+    landmark tracking, so a second concurrent stream gets a graph of its own (as every
+    multicam.CameraStream does). Give it back with release_pose_engine().
+    """
+    global _lease_owner
+    engine = get_pose_engine(model_complexity)
+    with _engine_lock:
+        if _lease_owner is None or _lease_owner is owner:
+            _lease_owner = owner
+            return engine
+    private = PoseEngine(engine.model_complexity if model_complexity is None else model_complexity)
+    with _engine_lock:
+        _private[private] = owner
+    return private
+
+
+def release_pose_engine(owner, engine):
+    """End owner's lease; returns True if engine was a private one, which is closed."""
+    global _lease_owner
+    with _engine_lock:
+        if engine is _engine:
+            if _lease_owner is owner:
+                _lease_owner = None
+            return False
+        if _private.get(engine) is not owner:
+            return False
+        del _private[engine]
+    engine.close()
+    return True
@@ -0,0 +1,344 @@
+"""Re-score recorded sessions under a grid of posture thresholds.
+
+    python -m posture_detector.rescore front storage/offline storage/timeline --thresholds 30:50:5 --algorithms 1,2
+    python -m posture_detector.rescore side storage/timeline --neck-limits 30:50:5 --torso-limits 5:15:2.5
+
+Recordings are the <name>_landmarks.npy files of offline runs (timestamps from the
+<name>.jsonl next to them) and timeline files (.ptl). Front scoring needs landmarks, so
+timelines must have been recorded with Settings -> Posture Timeline -> Full. Side
+scoring uses the recorded neck and torso inclinations and falls back to landmarks
+projected at --frame-size where none were recorded.
+
+Each recording is reduced to its scoring inputs once when it is loaded: the deviation
+from the base posture (the first frame with a pose, as when monitoring starts without
+one) for every algorithm, or the two inclinations. All recordings are then scored under
+every configuration in one NumPy pass over a (configurations, frames) array, split into
+blocks of whole recordings to bound memory. Reported per configuration: the fraction
+of monitored time that is Good (each frame's status holds until the next frame, gaps
+over max_gap count as Unknown, like PostureLedger), Good/Bad/Unknown minutes and flips
+between Good and Bad per monitored minute. The configuration the app uses is marked.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import numpy as np
+from posture_detector import frontPostureAnalyzer as front, sidePostureAnalyzer as side
+from posture_detector import landmarks
+from posture_detector.detector import PoseLandmarks
+from posture_detector.serialize import to_json
+from utilities.timeline import Timeline
+
+UNKNOWN, GOOD, BAD = 0, 1, 2
+SIDE_POINTS = [PoseLandmarks.LEFT_SHOULDER, PoseLandmarks.LEFT_EAR, PoseLandmarks.LEFT_HIP]
+
+
+class Recording:
+    """Capture times (seconds) of one recorded session and the per-frame scoring inputs."""
+
+    def __init__(self, name, times, features):
+        self.name = name
+        self.times = np.asarray(times, dtype=np.float64)
+        self.features = features  # name -> (frames,) float array, NaN where there is no pose
+
+    def __len__(self):
+        return len(self.times)
+
+
+def front_features(lm):
+    """Deviation from the first detected pose for every algorithm version, before adjustment."""
+    found = np.flatnonzero(np.isfinite(lm[:, :, :landmarks.VISIBILITY]).all(axis=(1, 2)))
+    features = {}
+    for version, points in front.ALGORITHM_POINTS.items():
+        if not len(found):
+            features[f"deviation{version}"] = np.full(len(lm), np.nan)
+            continue
+        features[f"deviation{version}"] = landmarks.deviation(lm[found[0]].astype(np.float64), lm, points)
+    return features
+
+
+def side_features(lm, frame_size):
+    """Neck and torso inclination in degrees, as SidePostureAnalyzer measures them in pixels."""
+    points = lm[:, SIDE_POINTS].astype(np.float64)
+    found = np.isfinite(points[:, :, :landmarks.Z]).all(axis=(1, 2))
+    shoulder, ear, hip = np.moveaxis(landmarks.to_pixels(np.nan_to_num(points), *frame_size), 1, 0)
+    neck = np.where(found, landmarks.inclination(shoulder, ear), np.nan)
+    torso = np.where(found, landmarks.inclination(hip, shoulder), np.nan)
+    return {"neck_inclination": neck, "torso_inclination": torso}
+
+
+def load_offline(path, mode, frame_size):
+    """A <name>_landmarks.npy file of an offline run."""
+    lm = np.load(path, mmap_mode="r")
+    records = path[:-len("_landmarks.npy")] + ".jsonl"
+    times, metrics = None, {}
+    if os.path.exists(records):
+        with open(records, encoding="utf-8") as file:
+            rows = [json.loads(line) for line in file]
+        if len(rows) == len(lm):
+            times = [row["timestamp"] for row in rows]
+            if mode == "side" and any(row.get("neck_inclination") is not None for row in rows):
+                metrics = {key: np.array([np.nan if row.get(key) is None else row[key] for row in rows])
+                           for key in ("neck_inclination", "torso_inclination")}
+    if times is None:
+        times = np.arange(len(lm)) / 30  # Frame index at 30 FPS, like iter_frames for images
+    if mode == "front":
+        return Recording(path, times, front_features(lm))
+    return Recording(path, times, metrics or side_features(lm, frame_size))
+
+
+def load_timeline(path, mode, frame_size):
+    """A .ptl timeline file, or None when it cannot be scored in this mode."""
+    timeline = Timeline(path)
+    records = timeline.records
+    times = records["t_ms"] / 1000
+    has_landmarks = "landmarks" in records.dtype.names
+    if mode == "front":
+        if timeline.metrics[0] != "deviation" or not has_landmarks:
+            return None
+        return Recording(path, times, front_features(records["landmarks"].astype(np.float32)))
+    if timeline.metrics == ("neck_inclination", "torso_inclination"):
+        metric = records["metric"].astype(np.float64)
+        return Recording(path, times, {"neck_inclination": metric[:, 0], "torso_inclination": metric[:, 1]})
+    if timeline.metrics[0] == "neck_inclination" and has_landmarks:
+        return Recording(path, times, side_features(records["landmarks"].astype(np.float32), frame_size))
+    return None
+
+
+def find_recordings(paths):
+    """Landmark and timeline files under the given files and directories."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                found.extend(os.path.join(root, name) for name in sorted(names)
+                             if name.endswith("_landmarks.npy") or name.endswith(".ptl"))
+        else:
+            found.append(path)
+    return found
+
+
+def load_recordings(paths, mode, frame_size=(640, 480)):
+    """Recordings that can be scored in mode; returns (recordings, skipped paths)."""
+    recordings, skipped = [], []
+    for path in find_recordings(paths):
+        if path.endswith(".ptl"):
+            recording = load_timeline(path, mode, frame_size)
+        else:
+            recording = load_offline(path, mode, frame_size)
+        if recording is None or not len(recording):
+            skipped.append(path)
+        else:
+            recordings.append(recording)
+    return recordings, skipped
+
+
+def front_grid(thresholds=(front.THRESHOLD,), adjustments=(front.DEVIATION_ADJUSTMENT,),
+               algorithms=(front.ALGORITHM_VERSION,)):
+    return [{"algorithm": a, "adjustment": d, "threshold": t}
+            for a, d, t in itertools.product(algorithms, adjustments, thresholds)]
+
+
+def side_grid(neck_limits=(side.NECK_LIMIT,), torso_limits=(side.TORSO_LIMIT,)):
+    return [{"neck_limit": n, "torso_limit": t} for n, t in itertools.product(neck_limits, torso_limits)]
+
+
+def front_status(features, grid):
+    """(configurations, frames) statuses, scored like FrontPostureAnalyzer.analyze."""
+    status = np.empty((len(grid), len(features["deviation1"])), dtype=np.int8)
+    for version in sorted({config["algorithm"] for config in grid}):
+        rows = [i for i, config in enumerate(grid) if config["algorithm"] == version]
+        raw = features[f"deviation{version}"]
+        # adjusted = trunc(raw) - adjustment < threshold, except that raw >= 100 scores 100
+        limit = np.array([[grid[i]["threshold"] + grid[i]["adjustment"]] for i in rows], dtype=np.float64)
+        capped = np.array([[100 < grid[i]["threshold"]] for i in rows])
+        with np.errstate(invalid="ignore"):
+            good = np.where(raw >= 100, capped, np.trunc(raw) < limit)
+        status[rows] = BAD - good.view(np.int8)
+        status[:, np.isnan(raw)] = UNKNOWN
+    return status
+
+
+def side_status(features, grid):
+    """(configurations, frames) statuses, scored like SidePostureAnalyzer.analyze.
+
+    As there, a neck or torso angle exactly at its limit leaves the frame Unknown.
+    """
+    neck = features["neck_inclination"][None]
+    torso = features["torso_inclination"][None]
+    neck_limit = np.array([config["neck_limit"] for config in grid], dtype=np.float64)[:, None]
+    torso_limit = np.array([config["torso_limit"] for config in grid], dtype=np.float64)[:, None]
+    with np.errstate(invalid="ignore"):
+        neck_ok, neck_bad = neck < neck_limit, neck > neck_limit
+        torso_ok, torso_bad = torso < torso_limit, torso > torso_limit
+    status = np.full(np.broadcast_shapes(neck.shape, neck_limit.shape), UNKNOWN, dtype=np.int8)
+    status[(neck_bad & (torso_ok | torso_bad)) | (torso_bad & neck_ok)] = BAD
+    status[neck_ok & torso_ok] = GOOD
+    return status
+
+
+SCORERS = {"front": front_status, "side": side_status}
+
+
+def frame_weights(times, max_gap):
+    """Seconds each frame's status holds, and the Unknown seconds of longer gaps."""
+    if len(times) < 2:
+        return np.full(len(times), 1 / 30), 0.0
+    gaps = np.diff(times)
+    last = np.median(gaps)  # The last frame holds for a typical frame interval
+    weights = np.append(np.clip(gaps, 0, max_gap), min(last, max_gap))
+    return weights, float(np.clip(gaps - max_gap, 0, None).sum())
+
+
+def _score_block(recordings, grid, scorer, max_gap):
+    """Per (configuration, recording) Good, Bad, Unknown seconds and flips of a block of recordings."""
+    features = {key: np.concatenate([r.features[key] for r in recordings]) for key in recordings[0].features}
+    weights, gap_unknown = zip(*(frame_weights(r.times, max_gap) for r in recordings))
+    weights = np.concatenate(weights)
+    lengths = [len(r) for r in recordings]
+    starts = np.cumsum([0] + lengths[:-1])
+
+    status = scorer(features, grid)
+    good = np.add.reduceat(np.where(status == GOOD, weights, 0.0), starts, axis=1)
+    bad = np.add.reduceat(np.where(status == BAD, weights, 0.0), starts, axis=1)
+    unknown = np.add.reduceat(weights, starts) - good - bad + np.array(gap_unknown)
+
+    # A flip is a known status that differs from the previous known status of the same recording.
+    # Frames no configuration knows are left out; the rest is forward filled only if needed.
+    recording = np.repeat(np.arange(len(recordings)), lengths)
+    columns = np.flatnonzero((status != UNKNOWN).any(axis=0))
+    status, recording = status[:, columns], recording[columns]
+    if (status == UNKNOWN).any():
+        index = np.maximum.accumulate(np.where(status != UNKNOWN, np.arange(len(columns)), 0), axis=1)
+        filled = np.take_along_axis(status, index, axis=1)
+        status = np.where(recording[index] == recording, filled, UNKNOWN)
+    flipped = (status[:, 1:] != status[:, :-1]) & (status[:, :-1] != UNKNOWN) & (recording[1:] == recording[:-1])
+    config, pair = np.nonzero(flipped)  # Flips are rare, counting their positions beats summing the mask
+    flips = np.bincount(config * len(recordings) + recording[pair + 1],
+                        minlength=len(grid) * len(recordings)).reshape(len(grid), len(recordings))
+    return good, bad, unknown, flips
+
+
+def _blocks(recordings, configurations, block_cells):
+    block, cells = [], 0
+    for recording in recordings:
+        if block and cells + len(recording) * configurations > block_cells:
+            yield block
+            block, cells = [], 0
+        block.append(recording)
+        cells += len(recording) * configurations
+    if block:
+        yield block
+
+
+def sweep(recordings, mode, grid, max_gap=2.0, block_cells=10_000_000):
+    """Score every recording under every configuration of grid; returns one result dict per configuration.
+
+    Recordings are scored together in blocks of about block_cells (configurations x
+    frames) array elements.
+    """
+    scorer = SCORERS[mode]
+    parts = [_score_block(block, grid, scorer, max_gap) for block in _blocks(recordings, len(grid), block_cells)]
+    good, bad, unknown, flips = (np.concatenate(values, axis=1) for values in zip(*parts))
+
+    results = []
+    for i, config in enumerate(grid):
+        good_seconds, bad_seconds, unknown_seconds = float(good[i].sum()), float(bad[i].sum()), float(unknown[i].sum())
+        total = good_seconds + bad_seconds + unknown_seconds
+        known = good[i] + bad[i]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            session_fraction = good[i] / known
+        results.append({
+            **config,
+            "good_fraction": round(good_seconds / total, 4) if total else None,
+            "good_fraction_known": round(good_seconds / (total - unknown_seconds), 4) if known.any() else None,
+            "session_good_fraction_p50": round(float(np.nanmedian(session_fraction)), 4)
+                                         if np.isfinite(session_fraction).any() else None,
+            "good_minutes": round(good_seconds / 60, 2),
+            "bad_minutes": round(bad_seconds / 60, 2),
+            "unknown_minutes": round(unknown_seconds / 60, 2),
+            "flips": int(flips[i].sum()),
+            "flips_per_minute": round(int(flips[i].sum()) / (total / 60), 3) if total else None,
+        })
+    return results
+
+
+def current_config(mode):
+    """The configuration the analyzers use."""
+    return (front_grid() if mode == "front" else side_grid())[0]
+
+
+def parse_values(text):
+    """'30,35,40' or an inclusive range 'start:stop:step' -> list of numbers."""
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        values = np.arange(start, stop + step / 2, step).round(6).tolist()
+    else:
+        values = [float(part) for part in text.split(",") if part]
+    return [int(v) if float(v).is_integer() else v for v in values]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score recorded landmarks under a grid of posture thresholds.")
+    parser.add_argument("mode", choices=sorted(SCORERS))
+    parser.add_argument("inputs", nargs="+", help="Offline output directories, _landmarks.npy or .ptl files")
+    parser.add_argument("--thresholds", type=parse_values, default=[front.THRESHOLD], help="Front: e.g. 30:50:5")
+    parser.add_argument("--adjustments", type=parse_values, default=[front.DEVIATION_ADJUSTMENT],
+                        help="Front: deviation adjustments, e.g. 0,5,10")
+    parser.add_argument("--algorithms", type=parse_values, default=[front.ALGORITHM_VERSION],
+                        help=f"Front: algorithm versions out of {sorted(front.ALGORITHM_POINTS)}")
+    parser.add_argument("--neck-limits", type=parse_values, default=[side.NECK_LIMIT], help="Side: degrees")
+    parser.add_argument("--torso-limits", type=parse_values, default=[side.TORSO_LIMIT], help="Side: degrees")
+    parser.add_argument("--frame-size", type=int, nargs=2, default=(640, 480), metavar=("WIDTH", "HEIGHT"),
+                        help="Side: image size the landmarks are projected at when no angles were recorded")
+    parser.add_argument("--max-gap", type=float, default=2.0, help="Seconds a status holds at most")
+    parser.add_argument("--output", help="JSON results file (default: storage/rescore/<mode>.json)")
+    args = parser.parse_args(argv)
+
+    if args.mode == "front":
+        unknown = set(args.algorithms) - set(front.ALGORITHM_POINTS)
+        if unknown:
+            parser.error(f"Unknown algorithm versions {sorted(unknown)}, expected {sorted(front.ALGORITHM_POINTS)}")
+        grid = front_grid(args.thresholds, args.adjustments, args.algorithms)
+    else:
+        grid = side_grid(args.neck_limits, args.torso_limits)
+
+    start = time.perf_counter()
+    recordings, skipped = load_recordings(args.inputs, args.mode, tuple(args.frame_size))
+    load_seconds = time.perf_counter() - start
+    for path in skipped:
+        print(f"Skipped {path}: no {args.mode} landmarks or angles")
+    if not recordings:
+        print("No recordings to score.")
+        return 1
+
+    start = time.perf_counter()
+    results = sweep(recordings, args.mode, grid, args.max_gap)
+    score_seconds = time.perf_counter() - start
+
+    current = current_config(args.mode)
+    frames = sum(len(r) for r in recordings)
+    print(f"{len(recordings)} recordings, {frames} frames, {len(grid)} configurations: "
+          f"loaded in {load_seconds:.2f} s, scored in {score_seconds:.2f} s")
+    keys = list(grid[0])
+    print("  " + "  ".join(f"{key:>10}" for key in keys) + "   good  good(known)  flips/min")
+    for result in results:
+        marker = "*" if all(result[key] == current[key] for key in keys) else " "
+        print(marker + " " + "  ".join(f"{result[key]:>10}" for key in keys) +
+              f"  {result['good_fraction']:>5.1%}  {result['good_fraction_known'] or 0:>11.1%}"
+              f"  {result['flips_per_minute']:>9}")
+
+    output = args.output or os.path.join("storage", "rescore", f"{args.mode}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as file:
+        json.dump({"mode": args.mode, "current": current, "recordings": len(recordings), "frames": frames,
+                   "load_seconds": round(load_seconds, 3), "score_seconds": round(score_seconds, 3),
+                   "results": results}, file, indent=2, default=to_json)
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import cv2
+import numpy as np
+from posture_detector.landmarks import X, Y, Z, VISIBILITY
+
+
+class RoiTracker:
+    """Crops inference input to the region around the previous frame's pose.
+
+    The crop is optionally downscaled to inference_width, and landmarks found in it are
+    reprojected to full-frame coordinates, so everything downstream is unaffected. The
+    region only moves when the pose leaves it (or it grows much larger than needed),
+    which keeps MediaPipe's own frame-to-frame tracking valid.
+    """
+
+    def __init__(self, margin=0.3, inference_width=640, min_size=0.25, min_visibility=0.5):
+        self.margin = margin                    # Padding around the pose, as a fraction of its larger side
+        self.inference_width = inference_width  # Downscale wider inputs to this width, None keeps full size
+        self.min_size = min_size                # Smallest region side, as a fraction of the frame side
+        self.min_visibility = min_visibility
+        self.box = None                         # (x0, y0, x1, y1) in pixels, None means the full frame
+
+    def crop(self, image):
+        """Return (inference input, region) where region is (x0, y0, width, height) of the crop."""
+        h, w = image.shape[:2]
+        x0, y0, x1, y1 = self.box if self.box is not None else (0, 0, w, h)
+        crop = image[y0:y1, x0:x1]
+        if self.inference_width and crop.shape[1] > self.inference_width:
+            scale = self.inference_width / crop.shape[1]
+            crop = cv2.resize(crop, (self.inference_width, max(1, round(crop.shape[0] * scale))),
+                              interpolation=cv2.INTER_AREA)
+        return crop, (x0, y0, x1 - x0, y1 - y0)
+
+    @staticmethod
+    def reproject(lm, region, width, height):
+        """Map landmarks normalized to the crop back to the full frame."""
+        x0, y0, crop_w, crop_h = region
+        full = lm.copy()
+        full[..., X] = (lm[..., X] * crop_w + x0) / width
+        full[..., Y] = (lm[..., Y] * crop_h + y0) / height
+        full[..., Z] = lm[..., Z] * crop_w / width  # MediaPipe z shares the scale of x
+        return full
+
+    def update(self, lm, width, height):
+        """Move the region to follow full-frame landmarks; no pose falls back to the full frame."""
+        if lm is None:
+            self.box = None
+            return
+        shown = lm[:, VISIBILITY] > self.min_visibility
+        if shown.sum() < 3:
+            self.box = None
+            return
+
+        points = lm[shown, :Z] * (width, height)
+        (px0, py0), (px1, py1) = points.min(axis=0), points.max(axis=0)
+        if self.box is not None:
+            x0, y0, x1, y1 = self.box
+            inside = px0 >= x0 and py0 >= y0 and px1 <= x1 and py1 <= y1
+            needed = (px1 - px0) * (py1 - py0) * (1 + 2 * self.margin) ** 2
+            if inside and (x1 - x0) * (y1 - y0) < 4 * max(needed, 1):
+                return  # Pose is still well framed, keep the region stable
+
+        pad = self.margin * max(px1 - px0, py1 - py0)
+        half_w = max((px1 - px0) / 2 + pad, self.min_size * width / 2)
+        half_h = max((py1 - py0) / 2 + pad, self.min_size * height / 2)
+        cx, cy = (px0 + px1) / 2, (py0 + py1) / 2
+        box = np.array([cx - half_w, cy - half_h, cx + half_w, cy + half_h])
+        box = np.clip(box, 0, [width, height, width, height]).round().astype(int)
+        self.box = tuple(box.tolist()) if box[2] > box[0] and box[3] > box[1] else None
+
+    def reset(self):
+        self.box = None
@@ -0,0 +1,12 @@
+"""JSON helpers shared by the offline runner, the local API and the CLI tools.
+
+Kept free of OpenCV and MediaPipe imports, so the event API can serialize results
+without loading the capture stack.
+"""
+
+
+def to_json(value):
+    """json.dumps default= hook: NumPy scalars become Python numbers, anything else its str()."""
+    if hasattr(value, "item"):
+        return value.item()  # NumPy scalars
+    return str(value)
@@ -1,57 +1,75 @@
 import cv2
 import math as m
-import mediapipe as mp
+from posture_detector.capture import FrameGrabber
+from posture_detector.detector import PoseDetector, PoseLandmarks
+from posture_detector.motion_gate import MotionGate
+from posture_detector.roi import RoiTracker
+from posture_detector.smoothing import create_filter
+from posture_detector import landmarks
+
+# Scoring defaults in degrees from vertical; posture_detector.rescore evaluates alternatives
+NECK_LIMIT = 40
+TORSO_LIMIT = 10
 
 class SidePostureAnalyzer:
-    def __init__(self):
+    def __init__(self, model_complexity=None, motion_gate=False, roi=False,
+                 inference_width=640, smoothing="Off", inference_rate=None):
         self.fps = 30  # Default FPS
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose()
-        self.cap = None
+        self.detector = PoseDetector(model_complexity, MotionGate() if motion_gate else None,
+                                     RoiTracker(inference_width=inference_width) if roi else None,
+                                     smoother=create_filter(smoothing), inference_rate=inference_rate)
+        self.grabber = None
+        self.frame = None  # Last processed capture.Frame (timestamp and sequence number)
+        self.draw = True  # Draw the overlay onto analyzed frames, headless runs turn it off
+        self.neck_limit = NECK_LIMIT
+        self.torso_limit = TORSO_LIMIT
 
     def run(self, camera_index=0):
-        self.cap = cv2.VideoCapture(camera_index)
-        if not self.cap.isOpened():
-            raise Exception("Error: Cannot access the webcam.")
-        self.fps = int(self.cap.get(cv2.CAP_PROP_FPS))
+        self.grabber = FrameGrabber(camera_index)
+        self.grabber.start()
+        self.fps = self.grabber.fps
 
     def stop(self):
-        if self.cap:
-            self.cap.release()
+        if self.grabber:
+            self.grabber.stop()
+            self.grabber = None
+        self.frame = None
+        self.detector.reset()
 
     def process_frame(self):
-        if not self.cap:
+        """Process the newest captured frame; returns (None, None) if no new frame arrived."""
+        if not self.grabber:
             raise Exception("Camera not started.")
-        success, image = self.cap.read()
-        if not success:
+        frame = self.grabber.read(self.frame.seq if self.frame else 0)
+        if frame is None:
             return None, None
+        image, posture_data, _ = self.analyze(frame)
+        return image, posture_data
 
-        h, w = image.shape[:2]
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        keypoints = self.pose.process(image_rgb)
-        image_bgr = cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR)
+    def analyze(self, frame):
+        """Score a capture.Frame and draw the overlay; returns (image, posture_data, landmarks)."""
+        self.frame = frame
+        image_bgr, lm = self.detector.find_pose(frame.image, draw=False, timestamp=frame.timestamp)
+        h, w = image_bgr.shape[:2]
 
         posture_data = {"status": "Unknown", "neck_inclination": None, "torso_inclination": None,"alert":"Unknown"}
-        if keypoints.pose_landmarks:
-            lm = keypoints.pose_landmarks
-            lmPose = self.mp_pose.PoseLandmark
-
+        if lm is not None:
             # Landmarks for calculations
-            l_shldr = (int(lm.landmark[lmPose.LEFT_SHOULDER].x * w), int(lm.landmark[lmPose.LEFT_SHOULDER].y * h))
-            r_shldr = (int(lm.landmark[lmPose.RIGHT_SHOULDER].x * w), int(lm.landmark[lmPose.RIGHT_SHOULDER].y * h))
-            l_ear = (int(lm.landmark[lmPose.LEFT_EAR].x * w), int(lm.landmark[lmPose.LEFT_EAR].y * h))
-            l_hip = (int(lm.landmark[lmPose.LEFT_HIP].x * w), int(lm.landmark[lmPose.LEFT_HIP].y * h))
-
-            # Draw landmarks
-            cv2.circle(image_bgr, l_shldr, 7, (0, 255, 255), -1)
-            cv2.circle(image_bgr, r_shldr, 7, (255, 0, 255), -1)
-            cv2.circle(image_bgr, l_ear, 7, (0, 255, 255), -1)
-            cv2.circle(image_bgr, l_hip, 7, (0, 255, 255), -1)
-
-            # Draw lines
-            cv2.line(image_bgr, l_shldr, l_ear, (0, 255, 0), 4)
-            cv2.line(image_bgr, l_shldr, r_shldr, (255, 0, 255), 4)
-            cv2.line(image_bgr, l_shldr, l_hip, (0, 255, 0), 4)
+            points = landmarks.to_pixels(lm[[PoseLandmarks.LEFT_SHOULDER, PoseLandmarks.RIGHT_SHOULDER,
+                                             PoseLandmarks.LEFT_EAR, PoseLandmarks.LEFT_HIP]], w, h)
+            l_shldr, r_shldr, l_ear, l_hip = (tuple(p) for p in points.tolist())
+
+            if self.draw:
+                # Draw landmarks
+                cv2.circle(image_bgr, l_shldr, 7, (0, 255, 255), -1)
+                cv2.circle(image_bgr, r_shldr, 7, (255, 0, 255), -1)
+                cv2.circle(image_bgr, l_ear, 7, (0, 255, 255), -1)
+                cv2.circle(image_bgr, l_hip, 7, (0, 255, 255), -1)
+
+                # Draw lines
+                cv2.line(image_bgr, l_shldr, l_ear, (0, 255, 0), 4)
+                cv2.line(image_bgr, l_shldr, r_shldr, (255, 0, 255), 4)
+                cv2.line(image_bgr, l_shldr, l_hip, (0, 255, 0), 4)
 
             # Calculate angles
             neck_inclination = self.calculate_angle(*l_shldr, *l_ear)
@@ -61,23 +79,24 @@ class SidePostureAnalyzer:
             posture_data["torso_inclination"] = torso_inclination
 
             # Determine posture
-            if neck_inclination < 40 and torso_inclination < 10:
+            neck_limit, torso_limit = self.neck_limit, self.torso_limit
+            if neck_inclination < neck_limit and torso_inclination < torso_limit:
                 posture_data["status"] = "Good"
                 posture_data["alert"] = "Perfect posture! Keep it up! 😊"
 
-            elif neck_inclination > 40 and torso_inclination < 10:
+            elif neck_inclination > neck_limit and torso_inclination < torso_limit:
                 posture_data["status"] = "Bad"
                 posture_data["alert"] = "Your neck is tilted forward. Try keeping it straight."
 
-            elif torso_inclination > 10 and neck_inclination < 40:
+            elif torso_inclination > torso_limit and neck_inclination < neck_limit:
                 posture_data["status"] = "Bad"
                 posture_data["alert"] = "Straighten your back to improve posture."
 
-            elif neck_inclination > 40 and torso_inclination > 10:
+            elif neck_inclination > neck_limit and torso_inclination > torso_limit:
                 posture_data["status"] = "Bad"
                 posture_data["alert"] = "Bad posture detected! Keep your back straight and head up."
 
-        return image_bgr, posture_data
+        return image_bgr, posture_data, lm
 
 
     @staticmethod
@@ -0,0 +1,140 @@
+"""Temporal filters over the (33, 4) landmark stream.
+
+Every filter has the same interface: update(lm, timestamp) takes the landmarks of an
+inference and returns the filtered ones, predict(timestamp) extrapolates them to a
+frame that was not inferred, reset() forgets the track. x, y and z are filtered per
+coordinate in one vectorized step; visibility is passed through from the last
+inference. Timestamps are seconds (capture.Frame.timestamp). Filters are selected
+by name with create_filter().
+"""
+import math
+import numpy as np
+from posture_detector.landmarks import VISIBILITY
+
+
+class LandmarkFilter:
+    """Common state: the last filtered landmarks, their velocity and time."""
+
+    max_horizon = 0.5  # Seconds; predictions further out hold the last velocity no longer
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._position = None  # (33, 3) float64
+        self._velocity = None
+        self._visibility = None
+        self._time = None
+
+    def update(self, lm, timestamp):
+        raise NotImplementedError
+
+    def predict(self, timestamp):
+        """Landmarks extrapolated to timestamp at constant velocity, None before the first update."""
+        if self._position is None:
+            return None
+        dt = min(max(timestamp - self._time, 0.0), self.max_horizon)
+        return self._output(self._position + self._velocity * dt)
+
+    def _output(self, position):
+        lm = np.empty((len(position), 4), dtype=np.float32)
+        lm[:, :VISIBILITY] = position
+        lm[:, VISIBILITY] = self._visibility
+        return lm
+
+
+class OneEuroFilter(LandmarkFilter):
+    """One Euro filter (Casiez et al., CHI 2012): an adaptive low-pass filter.
+
+    The cutoff rises with the speed of each coordinate, so a still body is smoothed
+    strongly (min_cutoff, Hz) while fast movements lag little (beta, in Hz per
+    normalized unit per second). Speeds are smoothed with d_cutoff.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=10.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        super().__init__()
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        return 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+
+    def update(self, lm, timestamp):
+        position = lm[:, :VISIBILITY].astype(np.float64)
+        self._visibility = lm[:, VISIBILITY].copy()
+        if self._position is None:
+            self._position, self._velocity, self._time = position, np.zeros_like(position), timestamp
+            return self._output(self._position)
+        if timestamp <= self._time:
+            return self._output(self._position)  # Same frame again
+
+        dt = timestamp - self._time
+        speed = (position - self._position) / dt
+        self._velocity += self._alpha(self.d_cutoff, dt) * (speed - self._velocity)
+        alpha = self._alpha(self.min_cutoff + self.beta * np.abs(self._velocity), dt)
+        self._position += alpha * (position - self._position)
+        self._time = timestamp
+        return self._output(self._position)
+
+
+class KalmanFilter(LandmarkFilter):
+    """Constant-velocity Kalman filter, independent per coordinate.
+
+    process_noise is the spectral density of the (white) acceleration and
+    measurement_noise the variance of a MediaPipe coordinate, both in normalized
+    image units. The 2x2 covariance of every coordinate is kept as three arrays.
+    """
+
+    def __init__(self, process_noise=0.05, measurement_noise=1e-4):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        super().__init__()
+
+    def reset(self):
+        super().reset()
+        self._p00 = self._p01 = self._p11 = None
+
+    def update(self, lm, timestamp):
+        z = lm[:, :VISIBILITY].astype(np.float64)
+        self._visibility = lm[:, VISIBILITY].copy()
+        if self._position is None:
+            self._position, self._velocity, self._time = z, np.zeros_like(z), timestamp
+            self._p00 = np.full_like(z, self.measurement_noise)
+            self._p01 = np.zeros_like(z)
+            self._p11 = np.ones_like(z)  # Velocity unknown: about one image width per second
+            return self._output(self._position)
+
+        # Predict to the measurement time
+        dt = max(timestamp - self._time, 0.0)
+        q = self.process_noise
+        self._position = self._position + self._velocity * dt
+        self._p00 += dt * (2 * self._p01 + dt * self._p11) + q * dt ** 3 / 3
+        self._p01 += dt * self._p11 + q * dt ** 2 / 2
+        self._p11 += q * dt
+
+        # Correct with the measured position
+        s = self._p00 + self.measurement_noise
+        k0, k1 = self._p00 / s, self._p01 / s
+        innovation = z - self._position
+        self._position += k0 * innovation
+        self._velocity = self._velocity + k1 * innovation
+        self._p11 -= k1 * self._p01
+        self._p00 *= 1 - k0
+        self._p01 *= 1 - k0
+        self._time = timestamp
+        return self._output(self._position)
+
+
+FILTERS = {
+    "Euro": OneEuroFilter,
+    "Kalman": KalmanFilter,
+}
+
+
+def create_filter(name):
+    """Filter for a setting value ('Off', 'Euro' or 'Kalman'); None when filtering is off."""
+    if not name or name == "Off":
+        return None
+    return FILTERS[name]()
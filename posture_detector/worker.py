@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import deque
+from PySide6.QtCore import QThread, Signal
+from posture_detector.metrics import StageTimer
+
+
+class InferenceWorker(QThread):
+    """Runs an analyzer's pose inference and scoring off the GUI thread.
+
+    Frames are submitted from the capture thread into a bounded queue; when it is full
+    the oldest frame is dropped. Results are delivered through result_ready, so the
+    UI thread only has to paint. Queued frames are retained; the reference is handed
+    to the result_ready receiver, which releases the frame once it has painted it.
+
+    While running, the worker holds a lease on its analyzer's pose engine, so another
+    stream analyzed at the same time never shares its MediaPipe graph.
+
+    With max_rate, frames are accepted at most that many times per second of capture
+    time and the others are skipped before they are queued.
+    """
+
+    result_ready = Signal(object, object, object, object)  # frame, image, posture_data, landmarks
+
+    def __init__(self, analyzer, max_queue=2, timer=None, max_rate=None):
+        super().__init__()
+        self.analyzer = analyzer
+        self.detector = getattr(analyzer, "detector", None)  # Stand-in analyzers (benchmarks) have none
+        self.timer = timer if timer is not None else StageTimer()
+        self.interval = 1 / max_rate if max_rate else 0.0
+        self.frames_dropped = 0
+        self.frames_skipped = 0  # Not analyzed because of max_rate
+        self._next_due = None
+        self._queue = deque(maxlen=max_queue)
+        self._cond = threading.Condition()
+        self._running = False
+
+    def submit(self, frame):
+        """Queue a capture.Frame for analysis. Safe to call from any thread."""
+        if self.interval:
+            with self._cond:
+                if self._next_due is not None and frame.timestamp < self._next_due:
+                    self.frames_skipped += 1
+                    return
+                if self._next_due is None or frame.timestamp - self._next_due > self.interval:
+                    self._next_due = frame.timestamp  # First frame, or after a stall: do not catch up
+                self._next_due += self.interval
+        frame.retain()
+        dropped = None
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                dropped = self._queue.popleft()
+                self.frames_dropped += 1
+            self._queue.append(frame)
+            self._cond.notify()
+        if dropped is not None:
+            dropped.release()
+
+    def start(self):
+        if self.detector is not None:
+            self.detector.acquire_engine()
+        self._running = True
+        super().start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            pending = list(self._queue)
+            self._queue.clear()
+            self._cond.notify()
+        for frame in pending:
+            frame.release()
+        self.wait()
+        if self.detector is not None:
+            self.detector.release_engine()
+
+    def run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or not self._running)
+                if not self._running:
+                    return
+                frame = self._queue.popleft()
+
+            timer = self.timer
+            if timer.enabled:
+                timer.record("queue", (time.monotonic() - frame.timestamp) * 1000)  # Capture to analysis
+            start = timer.mark()
+            image, posture_data, landmarks = self.analyzer.analyze(frame)
+            timer.lap("analyze", start)
+            timer.set_counter("dropped", self.frames_dropped)
+            if self.interval:
+                timer.set_counter("rate skip", self.frames_skipped)
+            self.result_ready.emit(frame, image, posture_data, landmarks)
+            timer.tick()
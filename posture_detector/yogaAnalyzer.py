@@ -0,0 +1,65 @@
+import cv2
+import numpy as np
+from posture_detector.detector import PoseDetector
+from posture_detector import landmarks
+from posture_detector.yoga_model import load_yoga_model
+
+
+class YogaAnalyzer:
+    def __init__(self, model_path="utilities/model.h5", labels_path="utilities/labels.npy", model_complexity=None,
+                 backend="numpy"):
+        self.model = load_yoga_model(model_path, backend)
+        self.label_names = np.load(labels_path)
+
+        self.detector = PoseDetector(model_complexity, mirror=True)  # The classifier expects the selfie view
+        self.target_pose = None  # Pose selected in the UI
+        self.draw = True  # Draw the overlay onto analyzed frames, headless runs turn it off
+
+    @staticmethod
+    def in_frame(lm):
+        """Whether enough of the body is visible to classify; works on (..., 33, 4) stacks too."""
+        v = landmarks.visible(lm, 0.6)
+        foot_and_hand = v[..., [27, 28]].any(axis=-1) & v[..., [15, 16]].any(axis=-1)
+        shoulders_hips_elbows = v[..., [11, 12, 23, 24, 13, 14]].all(axis=-1)
+        fingers_and_knees = v[..., [19, 20, 25, 26]].all(axis=-1)
+        return foot_and_hand | shoulders_hips_elbows | fingers_and_knees
+
+    def analyze(self, frame):
+        """Classify the pose in a capture.Frame and draw the overlay.
+
+        Returns (image, pose_data, landmarks) with image in BGR, ready for display. The
+        frame is never flipped: inference mirrors its own input and the classifier gets
+        mirrored landmarks, so landmarks are in the frame's coordinates like the other analyzers.
+        """
+        color = (255,255,255)
+        _, lm = self.detector.find_pose(frame.image, draw=False)
+
+        pose_data = {"status": "Unknown", "pose": None, "accuracy": 0, "alert": "Ensure Full Body is Visible"}
+
+        if lm is not None and self.in_frame(lm):
+            start = self.detector.timer.mark()
+            p = self.model.predict(landmarks.yoga_features(landmarks.mirror(lm)).reshape(1, -1))
+            self.detector.timer.lap("classifier", start)
+            pred = self.label_names[np.argmax(p)]
+            accuracy = p[0][np.argmax(p)] * 100
+
+            pose_data["pose"] = pred
+            pose_data["accuracy"] = accuracy
+            if pred == self.target_pose and accuracy > 80:
+                pose_data["status"] = "Correct"
+                pose_data["alert"] = f"Pose: {pred} {accuracy:.2f}%"
+                color = (0, 255, 0)
+            else:
+                pose_data["status"] = "Incorrect"
+                pose_data["alert"] = "Pose Incorrect or Not Trained"
+                color = (0, 0, 255)
+
+        if not self.draw:
+            return frame.image, pose_data, lm
+
+        start = self.detector.timer.mark()
+        image = cv2.blur(frame.image, (4,4), dst=frame.image)  # In place, the frame buffer is the display buffer
+        landmarks.draw_landmarks(image, lm, connection_color=color, connection_thickness=6,
+                                 landmark_color=(255,255,255), landmark_radius=3, landmark_thickness=3)
+        self.detector.timer.lap("overlay", start)
+        return image, pose_data, lm
@@ -0,0 +1,120 @@
+import json
+import sys
+import threading
+import numpy as np
+
+BACKENDS = ("numpy", "keras")
+
+
+class KerasYogaModel:
+    """The classifier as trained, run through Keras/TensorFlow."""
+
+    def __init__(self, model_path):
+        from keras.models import load_model  # TensorFlow is slow to import, only pay for it here
+        self.model = load_model(model_path)
+
+    def predict(self, features):
+        return np.asarray(self.model.predict(features, verbose=0))
+
+
+class NumpyYogaModel:
+    """Pure NumPy forward pass over the Dense layers exported from the Keras .h5 file.
+
+    The yoga classifier is a small MLP, so a few matrix products are all it takes;
+    this skips Keras' per-call data adapter and callbacks and does not import TensorFlow.
+    """
+
+    activations = {
+        "linear": lambda x: x,
+        "relu": lambda x: np.maximum(x, 0, out=x),
+        "sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+        "tanh": np.tanh,
+        "softmax": lambda x: _softmax(x),
+    }
+
+    def __init__(self, model_path):
+        self.layers = []  # (kernel, bias, activation) in call order
+        import h5py
+        with h5py.File(model_path, "r") as f:
+            config = json.loads(_as_str(f.attrs["model_config"]))
+            weights = f["model_weights"] if "model_weights" in f else f
+            for layer in config["config"]["layers"]:
+                class_name = layer["class_name"]
+                if class_name == "InputLayer":
+                    continue
+                if class_name != "Dense":
+                    raise ValueError(f"Layer type '{class_name}' is not supported by the numpy backend, use 'keras'.")
+                activation = layer["config"].get("activation", "linear")
+                if activation not in self.activations:
+                    raise ValueError(f"Activation '{activation}' is not supported by the numpy backend, use 'keras'.")
+                kernel, bias = _dense_weights(weights[layer["config"]["name"]])
+                self.layers.append((kernel, bias, self.activations[activation]))
+
+    def predict(self, features):
+        x = np.asarray(features, dtype=np.float32).reshape(-1, self.layers[0][0].shape[0])
+        for kernel, bias, activation in self.layers:
+            x = activation(x @ kernel + bias)
+        return x
+
+
+def _softmax(x):
+    x = np.exp(x - x.max(axis=-1, keepdims=True))
+    return x / x.sum(axis=-1, keepdims=True)
+
+
+def _as_str(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _dense_weights(group):
+    """Find kernel and bias datasets in a layer group (Keras 2 and Keras 3 .h5 layouts)."""
+    found = {}
+
+    def visit(name, obj):
+        leaf = name.split("/")[-1].split(":")[0]
+        if leaf in ("kernel", "bias") and hasattr(obj, "shape"):
+            found[leaf] = np.asarray(obj, dtype=np.float32)
+
+    group.visititems(visit)
+    kernel = found["kernel"]
+    bias = found.get("bias", np.zeros(kernel.shape[1], dtype=np.float32))
+    return kernel, bias
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_yoga_model(model_path="utilities/model.h5", backend="numpy"):
+    """Load the classifier once per process and backend; later calls (and other threads) reuse it."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown yoga model backend '{backend}', expected one of {BACKENDS}.")
+    with _models_lock:
+        key = (model_path, backend)
+        if key not in _models:
+            _models[key] = NumpyYogaModel(model_path) if backend == "numpy" else KerasYogaModel(model_path)
+        return _models[key]
+
+
+def verify_backends(model_path="utilities/model.h5", samples=1000, seed=0):
+    """Compare the numpy backend against Keras on random feature vectors.
+
+    Returns (max absolute probability difference, fraction of matching argmax).
+    """
+    fast = NumpyYogaModel(model_path)
+    reference = KerasYogaModel(model_path)
+    rng = np.random.default_rng(seed)
+    # Features are landmark offsets from the nose in normalized image coordinates
+    features = rng.uniform(-1, 1, size=(samples, fast.layers[0][0].shape[0])).astype(np.float32)
+    expected = reference.predict(features)
+    actual = fast.predict(features)
+    max_diff = float(np.abs(expected - actual).max())
+    agreement = float((expected.argmax(axis=1) == actual.argmax(axis=1)).mean())
+    return max_diff, agreement
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "utilities/model.h5"
+    max_diff, agreement = verify_backends(path)
+    print(f"max |keras - numpy| = {max_diff:.2e}, argmax agreement = {agreement * 100:.2f}%")
+    sys.exit(0 if max_diff < 1e-4 and agreement == 1.0 else 1)
@@ -0,0 +1,45 @@
+import types
+import numpy as np
+import pytest
+from posture_detector.detector import PoseLandmarks
+from posture_detector.pose_engine import PoseEngine
+
+# Skeleton of the stand-in pose, in head heights from the centre of the head. The ear,
+# left shoulder and hip line up vertically, an upright sitter seen from the side.
+SKELETON = np.zeros((33, 2))
+SKELETON[:, 1] = np.arange(33) * 0.1  # Landmarks nobody scores hang below the head
+SKELETON[PoseLandmarks.NOSE] = (0.0, 0.0)
+SKELETON[PoseLandmarks.LEFT_EAR] = (0.0, -0.1)
+SKELETON[PoseLandmarks.MOUTH_LEFT] = (-0.15, 0.25)
+SKELETON[PoseLandmarks.MOUTH_RIGHT] = (0.15, 0.25)
+SKELETON[PoseLandmarks.LEFT_SHOULDER] = (0.0, 1.5)
+SKELETON[PoseLandmarks.RIGHT_SHOULDER] = (1.2, 1.5)
+SKELETON[PoseLandmarks.LEFT_HIP] = (0.0, 4.0)
+
+
+class FakePose:
+    """Stands in for the MediaPipe graph on benchmarks.bench_pipeline.synthetic_frames.
+
+    Finds the figure's head (the bright ellipse) in the RGB input and places a fixed
+    skeleton around it, scaled by the head's size, in coordinates normalized to the
+    input. Like MediaPipe it follows the person, so crops (RoiTracker) and skipped
+    frames (MotionGate) can be compared with full-frame inference.
+    """
+
+    def process(self, image_rgb):
+        rows, cols = np.nonzero(image_rgb[..., 1] > 145)  # Head is (160, 170, 180), body and background darker
+        if len(rows) < 4:
+            return types.SimpleNamespace(pose_landmarks=None)
+        height, width = image_rgb.shape[:2]
+        size = rows.max() - rows.min() + 1
+        points = (cols.mean(), rows.mean()) + SKELETON * size
+        landmarks = [types.SimpleNamespace(x=x / width, y=y / height, z=0.0, visibility=1.0) for x, y in points]
+        return types.SimpleNamespace(pose_landmarks=types.SimpleNamespace(landmark=landmarks))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_pose(monkeypatch):
+    monkeypatch.setattr(PoseEngine, "_build", staticmethod(lambda model_complexity: FakePose()))
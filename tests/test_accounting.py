@@ -0,0 +1,54 @@
+import pytest
+from posture_detector.accounting import BAD, GOOD, UNKNOWN, PostureLedger
+
+
+def assert_durations(ledger, good=0.0, bad=0.0, unknown=0.0):
+    assert ledger.durations == {GOOD: pytest.approx(good), BAD: pytest.approx(bad), UNKNOWN: pytest.approx(unknown)}
+
+
+def test_each_status_holds_until_the_next_result():
+    ledger = PostureLedger()
+    ledger.resume(now=10.0)
+    ledger.record(10.5, GOOD)  # Unknown until the first result
+    ledger.record(11.5, BAD)
+    ledger.record(11.75, "Unknown")
+    ledger.record(12.0, GOOD)
+    ledger.pause(now=13.0)
+    assert_durations(ledger, good=2.0, bad=0.25, unknown=0.75)
+    assert ledger.total_seconds == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("fps", [30, 15, 5])
+def test_totals_do_not_depend_on_the_analysis_rate(fps):
+    ledger = PostureLedger()
+    ledger.resume(now=0.0)
+    for i in range(10 * fps):
+        t = i / fps
+        ledger.record(t, GOOD if t < 6 else BAD)
+    ledger.pause(now=10.0)
+    assert_durations(ledger, good=6.0, bad=4.0)
+
+
+def test_gaps_over_max_gap_count_as_unknown():
+    ledger = PostureLedger(max_gap=2.0)
+    ledger.resume(now=0.0)
+    ledger.record(0.0, GOOD)
+    ledger.record(5.0, BAD)  # Stalled camera: 2 s Good, 3 s Unknown
+    ledger.record(6.0, GOOD)
+    ledger.pause(now=6.5)
+    assert_durations(ledger, good=2.5, bad=1.0, unknown=3.0)
+
+
+def test_time_between_stop_and_restart_is_not_counted():
+    ledger = PostureLedger()
+    ledger.resume(now=0.0)
+    ledger.record(0.0, GOOD)
+    ledger.pause(now=1.0)
+    ledger.record(5.0, BAD)  # Arrives while paused
+    assert not ledger.running
+    ledger.resume(now=100.0)
+    ledger.record(99.0, BAD)  # Captured before the restart
+    ledger.record(100.5, BAD)
+    ledger.pause(now=101.0)
+    assert_durations(ledger, good=1.0, bad=0.5, unknown=0.5)
+    assert ledger.elapsed(now=500.0) == pytest.approx(2.0)
@@ -0,0 +1,151 @@
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import numpy as np
+import pytest
+from posture_detector.api import ApiServer, iter_events
+from posture_detector.events import EventHub
+
+
+@pytest.fixture
+def hub():
+    return EventHub()
+
+
+@pytest.fixture
+def server(hub):
+    server = ApiServer(hub, port=0, max_clients=4, max_rate=None, max_queue=512,
+                       stats=lambda: {"cameras": []}, keepalive=0.5)
+    server.start()
+    yield server
+    server.stop()
+
+
+def get(url):
+    with urllib.request.urlopen(url, timeout=5) as response:
+        body = response.read()
+        return response.status, json.loads(body) if body else None
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+class Follower(threading.Thread):
+    """Reads an /events stream until `count` events arrived or the server ends it."""
+
+    def __init__(self, url, count):
+        super().__init__(daemon=True)
+        self.url = url
+        self.count = count
+        self.events = []
+
+    def run(self):
+        for event in iter_events(self.url, timeout=5):
+            self.events.append(event)
+            if len(self.events) == self.count:
+                break
+
+
+def test_endpoints_answer(server, hub):
+    assert get(f"{server.url}/health") == (200, {"ok": True})
+    assert get(f"{server.url}/latest") == (204, None)
+    hub.publish("posture", {"status": "Good", "deviation": np.float32(3.5)})  # NumPy values are serialized
+    status, latest = get(f"{server.url}/latest")
+    assert status == 200 and latest["seq"] == 1 and latest["data"] == {"status": "Good", "deviation": 3.5}
+    status, stats = get(f"{server.url}/stats")
+    assert status == 200 and stats["hub"]["published"] == 1 and stats["cameras"] == []
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(f"{server.url}/nothing")
+    assert error.value.code == 404
+    with pytest.raises(urllib.error.HTTPError) as error:
+        get(f"{server.url}/events?rate=0")
+    assert error.value.code == 400
+
+
+def test_full_rate_client_gets_every_event_in_order(server, hub):
+    follower = Follower(f"{server.url}/events?types=posture", 200)
+    follower.start()
+    wait_for(lambda: hub.subscribers == 1)
+    for i in range(200):
+        hub.publish("posture", {"i": i})
+        if i % 50 == 0:
+            hub.publish("stats", {})  # Filtered out by ?types
+    follower.join(timeout=10)
+    assert [event["data"]["i"] for event in follower.events] == list(range(200))
+    assert [event["seq"] for event in follower.events] == sorted(event["seq"] for event in follower.events)
+    assert all(event["type"] == "posture" and event["dropped"] == 0 for event in follower.events)
+
+
+def test_rate_limited_client_gets_coalesced_events(server, hub):
+    follower = Follower(f"{server.url}/events?rate=5", 1000)
+    follower.start()
+    wait_for(lambda: hub.subscribers == 1)
+    start = time.monotonic()
+    for i in range(60):  # 1.2 s at 50 events per second
+        hub.publish("posture", {"i": i})
+        time.sleep(max(start + (i + 1) * 0.02 - time.monotonic(), 0))
+    wait_for(lambda: follower.events and follower.events[-1]["data"]["i"] == 59)  # The newest always arrives
+    received = [event["data"]["i"] for event in follower.events]
+    assert 4 <= len(received) <= 9  # About 5 per second instead of 50
+    assert received == sorted(received) and received[0] == 0
+    assert follower.events[-1]["coalesced"] > 40
+
+
+def test_slow_client_drops_its_oldest_events_without_blocking_publish(server, hub):
+    slow = socket.socket()
+    slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    slow.connect(("127.0.0.1", server.port))
+    slow.sendall(b"GET /events?queue=16 HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    follower = Follower(f"{server.url}/events", 500)
+    follower.start()
+    wait_for(lambda: hub.subscribers == 2)
+
+    payload = {"alert": "x" * 2000}  # Fills the slow client's socket buffers after a few events
+    publish_ms = []
+    for i in range(500):
+        start = time.perf_counter()
+        hub.publish("posture", dict(payload, i=i))
+        publish_ms.append((time.perf_counter() - start) * 1000)
+    follower.join(timeout=10)
+
+    assert len(follower.events) == 500  # The other client is not held up
+    assert max(publish_ms) < 50  # publish() never waits for a client
+    slow_stats = max(server.stats()["hub"]["subscribers"], key=lambda s: s["dropped"])
+    assert slow_stats["dropped"] > 400 and slow_stats["queued"] <= 16
+
+    # Once it catches up, the slow client reads what its socket held (if anything) and then the newest 16
+    slow.settimeout(5)
+    stream = slow.makefile("rb")
+    seen = []
+    for raw in stream:
+        if raw.startswith(b"data:"):
+            seen.append(json.loads(raw[5:])["data"]["i"])
+            if seen[-1] == 499:
+                break
+    slow.close()
+    assert seen == sorted(seen) and len(seen) < 100
+    assert seen[-16:] == list(range(484, 500))
+
+
+def test_clients_over_the_limit_are_rejected(hub):
+    server = ApiServer(hub, port=0, max_clients=1, keepalive=0.5)
+    server.start()
+    try:
+        follower = Follower(f"{server.url}/events", 1)
+        follower.start()
+        wait_for(lambda: hub.subscribers == 1)
+        with pytest.raises(urllib.error.HTTPError) as error:
+            get(f"{server.url}/events")
+        assert error.value.code == 503
+        assert server.stats()["rejected"] == 1
+        hub.publish("posture", {})
+        follower.join(timeout=5)
+    finally:
+        server.stop()
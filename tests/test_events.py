@@ -0,0 +1,63 @@
+import threading
+import time
+from posture_detector.events import EventHub
+
+
+def drain(subscription):
+    events = []
+    while (event := subscription.get(timeout=0)) is not None:
+        events.append(event)
+    return events
+
+
+def test_full_backlog_drops_the_oldest_events():
+    hub = EventHub()
+    subscription = hub.subscribe(max_queue=3)
+    for i in range(5):
+        hub.publish("posture", {"i": i})
+    assert [event["data"]["i"] for event in drain(subscription)] == [2, 3, 4]
+    assert subscription.dropped == 2
+    assert subscription.stats()["delivered"] == 3
+
+
+def test_events_are_numbered_and_the_latest_is_kept():
+    hub = EventHub()
+    subscription = hub.subscribe()
+    hub.publish("posture", {"status": "Good"})
+    hub.publish("stats", {"fps": 30})
+    hub.publish("posture", {"status": "Bad"})
+    assert [event["seq"] for event in drain(subscription)] == [1, 2, 3]
+    assert hub.latest["posture"]["data"] == {"status": "Bad"}
+
+
+def test_types_filter_what_a_subscription_receives():
+    hub = EventHub()
+    subscription = hub.subscribe(types=["stats"])
+    hub.publish("posture", {})
+    hub.publish("stats", {"fps": 30})
+    assert [event["type"] for event in drain(subscription)] == ["stats"]
+
+
+def test_max_rate_coalesces_to_the_newest_event():
+    hub = EventHub()
+    subscription = hub.subscribe(max_rate=10)
+    for i in range(5):
+        hub.publish("posture", {"i": i})
+    hub.publish("stats", {})  # Other types have their own interval
+    assert [(e["type"], e["data"].get("i")) for e in drain(subscription)] == [("posture", 0), ("stats", None)]
+    event = subscription.get(timeout=1)  # Held until the interval has passed
+    assert event["data"]["i"] == 4
+    assert subscription.coalesced == 3
+
+
+def test_close_wakes_a_waiting_reader():
+    hub = EventHub()
+    subscription = hub.subscribe()
+    result = []
+    reader = threading.Thread(target=lambda: result.append(subscription.get()))
+    reader.start()
+    time.sleep(0.05)
+    subscription.close()
+    reader.join(timeout=1)
+    assert result == [None]
+    assert hub.subscribers == 0
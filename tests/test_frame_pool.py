@@ -0,0 +1,150 @@
+import os
+import time
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QGuiApplication, QImage, QPixmap
+from benchmarks.bench_pipeline import synthetic_frames, write_video
+from posture_detector import capture
+from posture_detector.capture import VideoFileGrabber
+from posture_detector.frame_pool import FramePool
+from posture_detector.worker import InferenceWorker
+from ui.coalescer import FrameCoalescer
+
+
+class CountingFrame(capture.Frame):
+    """Frame that remembers every instance and how often it was retained and released."""
+
+    made = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retains = 0
+        self.releases = 0
+        CountingFrame.made.append(self)
+
+    def retain(self):
+        self.retains += 1
+        return super().retain()
+
+    def release(self):
+        self.releases += 1
+        super().release()
+
+
+class StallingAnalyzer:
+    """Returns right away, except for every tenth frame, long enough for the worker queue to overflow."""
+
+    def __init__(self):
+        self.analyzed = 0
+
+    def analyze(self, frame):
+        self.analyzed += 1
+        if self.analyzed % 10 == 0:
+            time.sleep(0.1)
+        return frame.image, {"status": "Good", "alert": ""}, None
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QGuiApplication.instance() or QGuiApplication([])
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = str(tmp_path / "loop.avi")
+    write_video(synthetic_frames(30, 320, 240), path, fps=30)
+    return path
+
+
+def run_live_path(video, seconds, warmup):
+    """Loop video through the grabber, worker, coalescer and paint like Home does; returns what was counted."""
+    app = QGuiApplication.instance()
+    grabber = VideoFileGrabber(video, loop=True)
+    worker = InferenceWorker(StallingAnalyzer())
+    painted = []
+    label = {}
+
+    def paint(captured, image, posture_data, lm):
+        h, w, ch = image.shape
+        label["pixmap"] = QPixmap.fromImage(QImage(image.data, w, h, ch * w, QImage.Format_BGR888))
+        captured.release()
+        painted.append(captured.seq)
+
+    coalescer = FrameCoalescer(paint)
+    coalescer.interval = 50  # Slower than the worker delivers, so results get coalesced
+    running = True
+
+    def on_result(captured, *result):
+        if not running:
+            captured.release()
+            return  # Result queued before the worker stopped
+        coalescer.push(captured, *result)
+
+    worker.result_ready.connect(on_result)
+    grabber.start()
+    worker.start()
+    grabber.add_listener(worker.submit)
+
+    start = time.monotonic()
+    allocated_after_warmup = None
+    while time.monotonic() - start < seconds:
+        app.processEvents()
+        if allocated_after_warmup is None and time.monotonic() - start >= warmup and grabber.pool is not None:
+            allocated_after_warmup = grabber.pool.allocated
+        time.sleep(0.002)
+    pool = grabber.pool
+
+    grabber.remove_listener(worker.submit)
+    worker.stop()
+    running = False
+    deadline = time.monotonic() + 1
+    while time.monotonic() < deadline:
+        app.processEvents()  # Deliver the results still queued for the GUI thread
+        time.sleep(0.01)
+    coalescer_counts = coalescer.coalesced
+    coalescer.clear()
+    grabber.stop()
+    return {"pool": pool, "allocated_after_warmup": allocated_after_warmup, "painted": painted,
+            "worker_dropped": worker.frames_dropped, "coalesced": coalescer_counts}
+
+
+def test_live_path_reuses_buffers_and_releases_every_frame(app, video, monkeypatch):
+    monkeypatch.setattr(capture, "Frame", CountingFrame)
+    CountingFrame.made = []
+    counts = run_live_path(video, seconds=3, warmup=1)
+
+    pool, frames = counts["pool"], CountingFrame.made
+    assert len(frames) > 60
+    assert len(counts["painted"]) > 20
+    assert counts["worker_dropped"] > 0  # The stalls overflowed the worker queue...
+    assert counts["coalesced"] > 0       # ...and the coalescer replaced unpainted results
+
+    # Buffers are recycled: allocations level off once the pipeline is warm (a late peak in the
+    # frames in flight may still take one more buffer, a leak would take one per frame) and all
+    # of them are back in the pool once stopped
+    assert pool.allocated - counts["allocated_after_warmup"] <= 1
+    assert pool.allocated <= pool.capacity
+    assert pool.reused == len(frames) - 1 - pool.allocated
+    assert pool.free == pool.allocated
+
+    # Every retain() is matched by a release(), besides the grabber's own reference
+    pooled = [frame for frame in frames if frame.pool is pool]
+    assert len(pooled) == len(frames) - 1  # Only the frame the pool was sized on is a plain array
+    unbalanced = [(frame.seq, frame.retains, frame.releases) for frame in pooled
+                  if frame.releases != frame.retains + 1 or frame._refs != 0]
+    assert unbalanced == []
+
+
+def test_pool_recycles_a_buffer_after_the_last_release():
+    pool = FramePool((4, 4, 3), capacity=2)
+    frame = capture.Frame(pool.acquire(), 0.0, 1, pool)
+    frame.retain()
+    frame.release()
+    assert pool.free == 0  # One holder left
+    frame.release()
+    frame.release()  # Extra releases are ignored
+    assert pool.free == 1
+    assert pool.acquire() is frame.image
+    assert (pool.allocated, pool.reused) == (1, 1)
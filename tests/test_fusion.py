@@ -0,0 +1,75 @@
+import pytest
+from posture_detector.accounting import PostureLedger
+from posture_detector.fusion import GOOD_ALERT, PostureFusion
+
+FRONT_BAD = {"status": "Bad", "alert": "Bad posture detected! Adjust your sitting position.", "deviation": 55}
+FRONT_GOOD = {"status": "Good", "alert": GOOD_ALERT, "deviation": 3}
+SIDE_BAD = {"status": "Bad", "alert": "Your neck is tilted forward. Try keeping it straight.",
+            "neck_inclination": 52.0, "torso_inclination": 4.0}
+SIDE_GOOD = {"status": "Good", "alert": GOOD_ALERT, "neck_inclination": 20.0, "torso_inclination": 3.0}
+UNKNOWN = {"status": "Unknown", "alert": "Unknown", "deviation": None}
+
+
+def test_results_further_apart_than_max_skew_are_not_paired():
+    fusion = PostureFusion(max_skew=0.25)
+    fusion.add("front", "Front", 10.0, FRONT_BAD)
+    verdict = fusion.add("side", "Side", 10.3, SIDE_GOOD)
+    assert verdict["cameras"] == {"front": "Missing", "side": "Good"}
+    assert verdict["status"] == "Good"
+    assert verdict["skew"] == 0
+
+    verdict = fusion.add("front", "Front", 10.5, FRONT_GOOD)
+    assert verdict["cameras"] == {"front": "Good", "side": "Good"}
+    assert verdict["skew"] == pytest.approx(0.2)
+
+
+def test_the_nearest_result_in_time_is_paired():
+    fusion = PostureFusion(max_skew=0.25)
+    fusion.add("side", "Side", 9.8, SIDE_BAD)
+    fusion.add("side", "Side", 10.1, SIDE_GOOD)
+    verdict = fusion.add("front", "Front", 10.0, FRONT_GOOD)
+    assert verdict["cameras"]["side"] == "Good"
+
+
+def test_any_bad_view_makes_the_verdict_bad():
+    fusion = PostureFusion()
+    fusion.add("side", "Side", 1.0, SIDE_GOOD)
+    verdict = fusion.add("front", "Front", 1.0, FRONT_BAD)
+    assert verdict["status"] == "Bad"
+    assert verdict["alert"] == FRONT_BAD["alert"]
+
+
+def test_unknown_views_are_ignored():
+    fusion = PostureFusion()
+    fusion.add("side", "Side", 1.0, UNKNOWN)
+    verdict = fusion.add("front", "Front", 1.0, FRONT_GOOD)
+    assert verdict["cameras"] == {"side": "Unknown", "front": "Good"}
+    assert verdict["status"] == "Good"
+
+    fusion = PostureFusion()
+    fusion.add("side", "Side", 1.0, UNKNOWN)
+    assert fusion.add("front", "Front", 1.0, UNKNOWN)["status"] == "Unknown"
+
+
+def test_side_alerts_and_metrics_take_priority():
+    fusion = PostureFusion()
+    fusion.add("front", "Front", 1.0, FRONT_BAD)
+    verdict = fusion.add("side", "Side", 1.0, SIDE_BAD)
+    assert verdict["alert"] == SIDE_BAD["alert"]
+    assert verdict["neck_inclination"] == 52.0
+    assert verdict["deviation"] == 55  # Only the front view has one
+
+
+def test_fused_time_is_accounted_by_capture_time():
+    fusion = PostureFusion(max_skew=0.25)
+    ledger = PostureLedger()
+    ledger.resume(now=0.0)
+    results = [(i / 10, "front", "Front", FRONT_GOOD if i < 50 else FRONT_BAD) for i in range(100)]
+    results += [(i / 10 + 0.05, "side", "Side", SIDE_GOOD) for i in range(100)]
+    for timestamp, camera, angle, data in sorted(results, key=lambda result: result[0]):
+        verdict = fusion.add(camera, angle, timestamp, data)
+        ledger.record(verdict["timestamp"], verdict["status"])
+    ledger.pause(now=10.0)
+    assert ledger.good_seconds == pytest.approx(5.0)
+    assert ledger.bad_seconds == pytest.approx(5.0)
+    assert ledger.unknown_seconds == pytest.approx(0.0)
@@ -0,0 +1,114 @@
+import json
+import cv2
+import numpy as np
+import pytest
+from benchmarks.bench_pipeline import write_video
+from posture_detector.capture import iter_frames
+from posture_detector.offline import create_analyzer
+
+WIDTH, HEIGHT = 320, 240
+
+
+def sitter_frames(centres, seed=0):
+    """The figure of bench_pipeline.synthetic_frames, its head at each given x (fraction of the width)."""
+    background = np.random.default_rng(seed).integers(0, 60, size=(HEIGHT, WIDTH, 3), dtype=np.uint8)
+    frames = []
+    for centre in centres:
+        image = background.copy()
+        cx = int(WIDTH * centre)
+        cv2.ellipse(image, (cx, HEIGHT // 3), (WIDTH // 12, HEIGHT // 8), 0, 0, 360, (180, 170, 160), -1)
+        cv2.rectangle(image, (cx - WIDTH // 7, HEIGHT // 2), (cx + WIDTH // 7, HEIGHT), (90, 120, 150), -1)
+        frames.append(image)
+    return frames
+
+
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory):
+    """Sits still, slowly leans away from the base posture (Bad), holds, comes back, holds."""
+    centres = ([0.35] * 30 + list(np.linspace(0.35, 0.6, 60)) + [0.6] * 30
+               + list(np.linspace(0.6, 0.35, 60)) + [0.35] * 30)
+    path = str(tmp_path_factory.mktemp("clip") / "sitter.avi")
+    write_video(sitter_frames(centres), path)
+    return path
+
+
+def analyze(clip, mode, **options):
+    """posture_data of every frame of the clip, and the detector that produced them."""
+    analyzer = create_analyzer(mode, **options)
+    analyzer.draw = False
+    records = [analyzer.analyze(frame)[1] for frame in iter_frames(clip)]
+    return records, analyzer.detector
+
+
+def changes(records):
+    """Frame indexes at which the status differs from the frame before."""
+    return [i for i in range(1, len(records)) if records[i]["status"] != records[i - 1]["status"]]
+
+
+def assert_same_verdicts(records, reference, lag):
+    """Same status changes as the reference, each at most lag frames off, the same statuses in between."""
+    assert len(changes(records)) == len(changes(reference))
+    for change, expected in zip(changes(records), changes(reference)):
+        assert abs(change - expected) <= lag
+    differing = [i for i, (a, b) in enumerate(zip(records, reference)) if a["status"] != b["status"]]
+    assert len(differing) <= lag * len(changes(reference))
+
+
+@pytest.mark.parametrize("mode", ["front", "side"])
+def test_motion_gate_keeps_the_verdicts(clip, fake_pose, mode):
+    ungated, _ = analyze(clip, mode)
+    gated, detector = analyze(clip, mode, motion_gate=True)
+    assert detector.skip_ratio > 0.3  # The still stretches were not inferred
+    if mode == "front":
+        assert changes(ungated)  # The lean is detected
+    # A slow lean is only inferred again once it moved enough, so a change may show up to 2 frames (67 ms) late
+    assert_same_verdicts(gated, ungated, lag=2)
+
+
+def test_motion_gate_can_be_switched_on_a_built_analyzer(clip, fake_pose):
+    ungated, _ = analyze(clip, "front")
+    analyzer = create_analyzer("front")
+    analyzer.draw = False
+    records = []
+    for frame in iter_frames(clip):
+        if frame.seq == 100:
+            analyzer.detector.set_motion_gate(True)
+        records.append(analyzer.analyze(frame)[1])
+    assert analyzer.detector.skip_ratio > 0.3
+    assert_same_verdicts(records, ungated, lag=2)
+
+    gate = analyzer.detector.motion_gate
+    analyzer.detector.set_motion_gate(True)
+    assert analyzer.detector.motion_gate is gate  # Kept, with its reference frame
+    analyzer.detector.set_motion_gate(False)
+    assert analyzer.detector.motion_gate is None
+
+
+@pytest.mark.parametrize("mode", ["front", "side"])
+def test_region_tracking_keeps_the_verdicts(clip, fake_pose, mode):
+    full, _ = analyze(clip, mode)
+    cropped, detector = analyze(clip, mode, roi=True)
+    assert detector.roi.box is not None  # Inference ran on a crop
+    assert [r["status"] for r in cropped] == [r["status"] for r in full]
+    key = "deviation" if mode == "front" else "neck_inclination"
+    assert max(abs(a[key] - b[key]) for a, b in zip(cropped, full)) <= 1
+
+
+def test_region_tracking_downscaled_and_gated_keeps_the_verdicts(clip, fake_pose):
+    full, _ = analyze(clip, "front")
+    # The crop is about 225 px wide, halving it costs landmark precision like 1280 px frames at 640
+    records, detector = analyze(clip, "front", motion_gate=True, roi=True, inference_width=112)
+    assert detector.roi.box is not None and detector.skip_ratio > 0.3
+    assert_same_verdicts(records, full, lag=2)
+    assert max(abs(a["deviation"] - b["deviation"]) for a, b in zip(records, full)) <= 5
+
+
+def test_region_tracking_can_be_switched_on_a_built_analyzer(fake_pose):
+    analyzer = create_analyzer("front")
+    analyzer.detector.set_roi(True, 320)
+    roi = analyzer.detector.roi
+    assert roi.inference_width == 320
+    analyzer.detector.set_roi(True, 480)
+    assert analyzer.detector.roi is roi and roi.inference_width == 480  # Kept, with its region
+    analyzer.detector.set_roi(False)
+    assert analyzer.detector.roi is None
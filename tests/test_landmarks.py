@@ -0,0 +1,98 @@
+import types
+import numpy as np
+import pytest
+from posture_detector import landmarks
+from posture_detector.frontPostureAnalyzer import ALGORITHM_POINTS
+from posture_detector.yogaAnalyzer import YogaAnalyzer
+
+
+def random_landmarks(count, seed=0):
+    rng = np.random.default_rng(seed)
+    lm = rng.uniform(0.05, 0.95, (count, landmarks.NUM_LANDMARKS, 4)).astype(np.float32)
+    lm[..., landmarks.Z] -= 0.5  # MediaPipe z is signed
+    return lm
+
+
+def as_mediapipe(lm):
+    """One frame as the list of landmark objects the MediaPipe graph returns."""
+    return [types.SimpleNamespace(x=float(x), y=float(y), z=float(z), visibility=float(v)) for x, y, z, v in lm]
+
+
+def scalar_deviation(base, lm, algorithm_version):
+    """FrontPostureAnalyzer.calculate_deviation before landmarks were arrays, without the int()."""
+    def distance(i):
+        return abs(base[i].x - lm[i].x) + abs(base[i].y - lm[i].y) + abs(base[i].z - lm[i].z)
+
+    nose, mouth_l, mouth_r = distance(0), distance(9), distance(10)
+    if algorithm_version == 1:
+        return ((nose + mouth_l + mouth_r + distance(11) + distance(12))
+                / (base[0].x + base[9].x + base[10].x + base[11].x + base[12].x) * 100)
+    return (nose + mouth_l + mouth_r) / (base[0].x + base[9].x + base[10].x) * 100
+
+
+def scalar_in_frame(lst):
+    """YogaAnalyzer.in_frame before landmarks were arrays."""
+    return bool(
+        (lst[28].visibility > 0.6 and lst[27].visibility > 0.6 and
+         lst[15].visibility > 0.6 and lst[16].visibility > 0.6)
+        or ((lst[28].visibility > 0.6 or lst[27].visibility > 0.6) and
+            (lst[15].visibility > 0.6 or lst[16].visibility > 0.6))
+        or (lst[11].visibility > 0.6 and lst[12].visibility > 0.6 and
+            lst[23].visibility > 0.6 and lst[24].visibility > 0.6 and
+            lst[14].visibility > 0.6 and lst[13].visibility > 0.6)
+        or (lst[19].visibility > 0.6 and lst[20].visibility > 0.6 and
+            lst[25].visibility > 0.6 and lst[26].visibility > 0.6)
+    )
+
+
+@pytest.mark.parametrize("algorithm", [1, 2])
+def test_deviation_matches_the_scalar_formula(algorithm):
+    base, frames = random_landmarks(1, seed=1)[0], random_landmarks(200, seed=2)
+    expected = [scalar_deviation(as_mediapipe(base), as_mediapipe(lm), algorithm) for lm in frames]
+    points = ALGORITHM_POINTS[algorithm]
+
+    single = [landmarks.deviation(base, lm, points) for lm in frames]
+    np.testing.assert_allclose(single, expected, rtol=1e-5)
+    # A stack of frames scores the same as one frame at a time
+    np.testing.assert_allclose(landmarks.deviation(base, frames, points), single, rtol=1e-6)
+
+
+def test_deviation_is_zero_at_the_base_posture():
+    base = random_landmarks(1)[0]
+    assert landmarks.deviation(base, base, ALGORITHM_POINTS[1]) == 0
+
+
+def test_in_frame_matches_the_chain_of_visibility_checks():
+    frames = random_landmarks(500, seed=3)
+    frames[..., landmarks.VISIBILITY] = np.random.default_rng(4).uniform(0.3, 0.9, frames.shape[:2])
+    expected = [scalar_in_frame(as_mediapipe(lm)) for lm in frames]
+    assert 0 < sum(expected) < len(expected)  # Both outcomes are covered
+
+    assert [bool(YogaAnalyzer.in_frame(lm)) for lm in frames] == expected
+    assert YogaAnalyzer.in_frame(frames).tolist() == expected
+
+
+def test_yoga_features_match_the_offsets_from_the_nose():
+    lm = random_landmarks(1, seed=5)[0]
+    points = as_mediapipe(lm)
+    expected = []
+    for point in points:
+        expected.append(point.x - points[0].x)
+        expected.append(point.y - points[0].y)
+    np.testing.assert_allclose(landmarks.yoga_features(lm), expected, atol=1e-6)
+
+
+def test_to_array_and_pixels_match_the_landmark_objects():
+    lm = random_landmarks(1, seed=6)[0]
+    points = as_mediapipe(lm)
+    np.testing.assert_array_equal(landmarks.to_array(points), lm)
+    assert landmarks.to_array(None) is None
+    assert landmarks.to_pixels(lm, 640, 480).tolist() == [[int(p.x * 640), int(p.y * 480)] for p in points]
+
+
+def test_mirror_flips_x_only():
+    lm = random_landmarks(3, seed=7)
+    mirrored = landmarks.mirror(lm)
+    np.testing.assert_allclose(mirrored[..., landmarks.X], 1 - lm[..., landmarks.X])
+    np.testing.assert_array_equal(mirrored[..., 1:], lm[..., 1:])
+    np.testing.assert_allclose(landmarks.mirror(mirrored), lm, atol=1e-6)
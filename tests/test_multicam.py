@@ -0,0 +1,34 @@
+import json
+from benchmarks.bench_pipeline import synthetic_frames, write_video
+from posture_detector import multicam
+
+FRAMES = 45
+
+
+def test_front_and_side_clips_are_fused(tmp_path, fake_pose):
+    front, side = str(tmp_path / "front.avi"), str(tmp_path / "side.avi")
+    write_video(synthetic_frames(FRAMES, 160, 120, seed=0), front)
+    write_video(synthetic_frames(FRAMES, 160, 120, seed=1), side)
+    output = tmp_path / "out"
+
+    summary = multicam.run([("Front", front), ("Side", side)], str(output), seconds=30)
+
+    cameras = {camera["name"]: camera for camera in summary["cameras"]}
+    assert set(cameras) == {"front", "side"}
+    for camera in cameras.values():
+        assert camera["frames_read"] == FRAMES
+        assert 0 < camera["frames_analyzed"] <= FRAMES
+        assert camera["dropped_queue"] is not None  # Kept after the worker stopped
+        assert camera["stages"]
+
+    with open(output / "verdicts.jsonl", encoding="utf-8") as file:
+        verdicts = [json.loads(line) for line in file]
+    assert len(verdicts) == summary["verdicts"]
+    assert summary["verdicts"] == sum(camera["frames_analyzed"] for camera in cameras.values())
+    fused = [v for v in verdicts if set(v["cameras"]) == {"front", "side"}]
+    assert fused, "no result was fused with the other camera's"
+    assert all(v["status"] == "Good" and set(v["cameras"].values()) == {"Good"} for v in fused)
+    assert summary["seconds"]["good"] > 0
+
+    with open(output / "summary.json", encoding="utf-8") as file:
+        assert json.load(file)["verdicts"] == summary["verdicts"]
@@ -0,0 +1,32 @@
+import json
+import os
+import numpy as np
+from benchmarks.bench_pipeline import synthetic_frames, write_video
+from posture_detector import offline
+
+
+def test_output_names_keep_unique_file_names():
+    assert offline.output_names(["a/front.mp4", "b/side.mp4", "frames"]) == ["front", "side", "frames"]
+
+
+def test_output_names_disambiguate_same_named_inputs():
+    names = offline.output_names(["rec/a/clip.mp4", "rec/b/clip.mp4", "rec/b/clip.avi", "rec/c/other.mp4"])
+    assert names == ["a_clip", "b_clip", "b_clip_2", "other"]
+
+
+def test_run_writes_every_same_named_input(tmp_path, fake_pose):
+    for folder, seed in (("a", 0), ("b", 1)):
+        os.makedirs(tmp_path / folder)
+        write_video(synthetic_frames(10 + seed * 5, 160, 120, seed=seed), str(tmp_path / folder / "clip.avi"))
+    output = tmp_path / "out"
+
+    sources = offline.expand_inputs([str(tmp_path / "a"), str(tmp_path / "b")])
+    summary = offline.run(sources, "front", str(output), workers=1)
+
+    assert [result["name"] for result in summary["inputs"]] == ["a_clip", "b_clip"]
+    for result in summary["inputs"]:
+        landmarks = np.load(output / f"{result['name']}_landmarks.npy")
+        with open(output / f"{result['name']}.jsonl", encoding="utf-8") as file:
+            records = [json.loads(line) for line in file]
+        assert len(landmarks) == len(records) == result["frames"]
+    assert summary["inputs"][0]["frames"] != summary["inputs"][1]["frames"]
@@ -0,0 +1,140 @@
+import json
+import os
+import numpy as np
+import pytest
+from benchmarks.bench_pipeline import synthetic_frames, write_video
+from posture_detector import landmarks, offline, rescore
+from posture_detector.capture import Frame
+from posture_detector.detector import PoseLandmarks
+from posture_detector.frontPostureAnalyzer import FrontPostureAnalyzer
+from posture_detector.sidePostureAnalyzer import SidePostureAnalyzer
+
+STATUS = {"Unknown": rescore.UNKNOWN, "Good": rescore.GOOD, "Bad": rescore.BAD}
+WIDTH, HEIGHT = 640, 480
+
+
+def front_recording(frames, seed=0):
+    """Landmarks moving away from a base pose by up to about 150 % deviation, NaN where no pose was found."""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.7, (landmarks.NUM_LANDMARKS, 4))
+    scale = rng.uniform(0, 0.2, (frames, 1, 1))
+    lm = (base + rng.normal(0, 1, (frames, landmarks.NUM_LANDMARKS, 4)) * scale).astype(np.float32)
+    lm[0] = base
+    lm[rng.random(frames) < 0.1] = np.nan
+    return lm
+
+
+def side_recording(frames, seed=0):
+    """Sitters leaning their neck and torso forward by random angles, NaN where no pose was found."""
+    rng = np.random.default_rng(seed)
+    neck = np.radians(rng.uniform(-10, 70, frames))
+    torso = np.radians(rng.uniform(-5, 25, frames))
+    lm = np.zeros((frames, landmarks.NUM_LANDMARKS, 4), np.float32)
+    hip = np.array([0.5, 0.85])
+    shoulder = hip + 0.4 * np.stack([np.sin(torso), -np.cos(torso)], axis=-1)
+    ear = shoulder + 0.2 * np.stack([np.sin(neck), -np.cos(neck)], axis=-1)
+    lm[:, PoseLandmarks.LEFT_HIP, :2] = hip
+    lm[:, PoseLandmarks.LEFT_SHOULDER, :2] = shoulder
+    lm[:, PoseLandmarks.RIGHT_SHOULDER, :2] = shoulder + (0.05, 0)
+    lm[:, PoseLandmarks.LEFT_EAR, :2] = ear
+    lm[..., landmarks.VISIBILITY] = 1
+    lm[rng.random(frames) < 0.1] = np.nan
+    return lm
+
+
+def analyze_frames(analyzer, recording):
+    """Statuses the analyzer gives the recorded landmarks, one frame at a time like the live app."""
+    image = np.zeros((HEIGHT, WIDTH, 3), np.uint8)
+    statuses = []
+    for seq, lm in enumerate(recording):
+        found = None if np.isnan(lm).any() else lm
+        analyzer.detector.find_pose = lambda img, draw=True, timestamp=None: (img, found)
+        _, posture_data, _ = analyzer.analyze(Frame(image, seq / 30, seq))
+        statuses.append(STATUS[posture_data["status"]])
+    return statuses
+
+
+def test_front_status_matches_the_analyzer_frame_for_frame():
+    recording = front_recording(600)
+    grid = rescore.front_grid(thresholds=[20, 40, 60, 101], adjustments=[0, 5], algorithms=[1, 2])
+    status = rescore.front_status(rescore.front_features(recording), grid)
+    assert {rescore.GOOD, rescore.BAD, rescore.UNKNOWN} <= set(status.ravel().tolist())
+
+    for i, config in enumerate(grid):
+        analyzer = FrontPostureAnalyzer()  # Takes its base posture from the first frame with a pose
+        analyzer.threshold = config["threshold"]
+        analyzer.deviation_adjustment = config["adjustment"]
+        analyzer.algorithm_version = config["algorithm"]
+        assert status[i].tolist() == analyze_frames(analyzer, recording), config
+
+
+def test_side_status_matches_the_analyzer_frame_for_frame():
+    recording = side_recording(600)
+    grid = rescore.side_grid(neck_limits=[20, 40], torso_limits=[5, 10, 15])
+    status = rescore.side_status(rescore.side_features(recording, (WIDTH, HEIGHT)), grid)
+    assert {rescore.GOOD, rescore.BAD, rescore.UNKNOWN} <= set(status.ravel().tolist())
+
+    for i, config in enumerate(grid):
+        analyzer = SidePostureAnalyzer()
+        analyzer.neck_limit, analyzer.torso_limit = config["neck_limit"], config["torso_limit"]
+        assert status[i].tolist() == analyze_frames(analyzer, recording), config
+
+
+def brute_force(statuses, times, max_gap):
+    """Good, Bad, Unknown seconds and flips of one recording, frame by frame."""
+    seconds = {rescore.GOOD: 0.0, rescore.BAD: 0.0, rescore.UNKNOWN: 0.0}
+    gaps = np.diff(times)
+    flips, previous = 0, rescore.UNKNOWN
+    for i, status in enumerate(statuses):
+        hold = gaps[i] if i < len(gaps) else np.median(gaps)
+        seconds[status] += min(hold, max_gap)
+        seconds[rescore.UNKNOWN] += max(hold - max_gap, 0) if i < len(gaps) else 0
+        if status != rescore.UNKNOWN:
+            if previous != rescore.UNKNOWN and status != previous:
+                flips += 1
+            previous = status
+    return seconds[rescore.GOOD], seconds[rescore.BAD], seconds[rescore.UNKNOWN], flips
+
+
+@pytest.mark.parametrize("block_cells", [10_000_000, 2_000])  # One block, or one per recording
+def test_sweep_matches_a_frame_by_frame_loop(block_cells):
+    rng = np.random.default_rng(7)
+    recordings = []
+    for seed in range(4):
+        frames = 300 + 100 * seed
+        times = 1000 * seed + np.cumsum(rng.uniform(0.02, 0.06, frames))
+        times[frames // 2:] += 5.0  # A stall longer than max_gap in every recording
+        features = rescore.side_features(side_recording(frames, seed), (WIDTH, HEIGHT))
+        if seed == 3:
+            features = {key: np.full(frames, np.nan) for key in features}  # Nobody in view all along
+        recordings.append(rescore.Recording(f"r{seed}", times, features))
+    grid = rescore.side_grid(neck_limits=[20, 40, 60], torso_limits=[5, 10])
+
+    results = rescore.sweep(recordings, "side", grid, max_gap=2.0, block_cells=block_cells)
+    for config, result in zip(grid, results):
+        status = rescore.side_status({key: np.concatenate([r.features[key] for r in recordings])
+                                      for key in recordings[0].features}, [config])[0]
+        good = bad = unknown = flips = 0
+        start = 0
+        for recording in recordings:
+            g, b, u, f = brute_force(status[start:start + len(recording)].tolist(), recording.times, 2.0)
+            good, bad, unknown, flips = good + g, bad + b, unknown + u, flips + f
+            start += len(recording)
+        assert result["flips"] == flips, config
+        assert result["good_minutes"] == round(good / 60, 2)
+        assert result["bad_minutes"] == round(bad / 60, 2)
+        assert result["unknown_minutes"] == round(unknown / 60, 2)
+        assert result["good_fraction"] == round(good / (good + bad + unknown), 4)
+
+
+def test_offline_outputs_rescore_to_the_recorded_statuses(tmp_path, fake_pose):
+    write_video(synthetic_frames(40, 160, 120), str(tmp_path / "clip.avi"))
+    output = tmp_path / "out"
+    offline.run(offline.expand_inputs([str(tmp_path / "clip.avi")]), "front", str(output), workers=1)
+    with open(output / "clip.jsonl", encoding="utf-8") as file:
+        recorded = [STATUS[json.loads(line)["status"]] for line in file]
+
+    recordings, skipped = rescore.load_recordings([str(output)], "front")
+    assert skipped == [] and [os.path.basename(r.name) for r in recordings] == ["clip_landmarks.npy"]
+    status = rescore.front_status(recordings[0].features, [rescore.current_config("front")])
+    assert status[0].tolist() == recorded
@@ -0,0 +1,130 @@
+import os
+import random
+from datetime import date, datetime, time, timedelta
+import pytest
+from utilities.session_store import SessionStore, period_for, rollup_keys
+
+LEGACY_CSV = "Date,Total Minutes,Good Posture Minutes\n03 Mar 2025,60,45\n04 Mar 2025,30,10\n"
+
+
+def write_legacy(folder):
+    os.makedirs(folder / "storage")
+    (folder / "storage" / "history.csv").write_text(LEGACY_CSV)
+
+
+def test_legacy_csv_is_imported_once_from_any_directory(tmp_path, monkeypatch):
+    write_legacy(tmp_path)
+    db = str(tmp_path / "storage" / "history.db")
+    monkeypatch.chdir(tmp_path)
+    store = SessionStore(db, "storage/history.csv")
+    assert store.totals("2025-03-01", "2025-03-31") == (2, 5400.0, 3300.0)
+    store.close()
+
+    # Same database and CSV, but the app is started from another directory
+    monkeypatch.chdir(tmp_path / "storage")
+    store = SessionStore(db, "history.csv")
+    assert store.import_csv("history.csv") == 0
+    assert store.totals("2025-03-01", "2025-03-31") == (2, 5400.0, 3300.0)
+    assert len(store.sessions()) == 2
+    store.close()
+
+
+def test_path_keyed_import_of_older_versions_is_not_repeated(tmp_path):
+    write_legacy(tmp_path)
+    csv_path = str(tmp_path / "storage" / "history.csv")
+    db = str(tmp_path / "history.db")
+    store = SessionStore(db, None)
+    store.import_csv(csv_path)
+    with store.conn:  # What older versions recorded instead of the content hash
+        store.conn.execute("UPDATE meta SET key = ? WHERE key LIKE 'imported:%'", (f"imported:{csv_path}",))
+    store.close()
+
+    store = SessionStore(db, csv_path)
+    assert len(store.sessions()) == 2
+    assert store.rollup("month", "2025-03") == (2, 5400.0, 3300.0)
+    store.close()
+
+
+def synthetic_sessions(store, first="2020-11-20", last="2022-02-10", seed=0):
+    rng = random.Random(seed)
+    day = date.fromisoformat(first)
+    while day <= date.fromisoformat(last):
+        start = datetime.combine(day, time(9)).timestamp()
+        for _ in range(rng.randint(0, 3)):
+            total = float(rng.randint(60, 7200))
+            store.add_session(start, start + total, total, float(rng.randint(0, int(total))), "Front")
+            start += total + 600
+        day += timedelta(days=1)
+
+
+def brute_force(store, first_day, last_day):
+    rows = [s for s in store.sessions() if first_day <= s["day"] <= last_day]
+    return (len(rows), sum(s["total_seconds"] for s in rows), sum(s["good_seconds"] for s in rows))
+
+
+def assert_close(actual, expected):
+    assert actual[0] == expected[0]
+    assert actual[1:] == pytest.approx(expected[1:])
+
+
+@pytest.fixture
+def store():
+    store = SessionStore(":memory:", None)
+    synthetic_sessions(store)
+    yield store
+    store.close()
+
+
+RANGES = [
+    ("2021-01-01", "2021-12-31"),  # Whole months only
+    ("2021-03-15", "2021-03-20"),  # Inside one month
+    ("2020-12-17", "2021-02-03"),  # Starts and ends partway through a month
+    ("2020-12-28", "2021-01-10"),  # ISO weeks 2020-W53 and 2021-W01 across the new year
+    ("2021-06-30", "2021-07-01"),
+    ("2019-01-01", "2030-12-31"),  # Wider than the history
+]
+
+
+@pytest.mark.parametrize("first_day, last_day", RANGES)
+def test_totals_match_the_sessions(store, first_day, last_day):
+    assert_close(store.totals(first_day, last_day), brute_force(store, first_day, last_day))
+
+
+@pytest.mark.parametrize("period", ["day", "week", "month"])
+@pytest.mark.parametrize("first_day, last_day", RANGES[:5])
+def test_series_buckets_match_the_sessions(store, period, first_day, last_day):
+    series = store.series(first_day, last_day, period)
+    assert series[0][1] == first_day and series[-1][2] == last_day
+    for (_, first, last, *row), following in zip(series, series[1:] + [None]):
+        if following is not None:
+            assert date.fromisoformat(following[1]) == date.fromisoformat(last) + timedelta(days=1)
+        assert_close(row, brute_force(store, first, last))
+
+
+def test_rollups_match_the_sessions(store):
+    for period in ("day", "week", "month"):
+        expected = {}
+        for s in store.sessions():
+            key = dict(rollup_keys(s["day"]))[period]
+            count, total, good = expected.get(key, (0, 0.0, 0.0))
+            expected[key] = (count + 1, total + s["total_seconds"], good + s["good_seconds"])
+        for key, row in expected.items():
+            assert_close(store.rollup(period, key), row)
+    # The week of 2021-01-01 (a Friday) is 2020-W53 and holds days of both years
+    assert_close(store.rollup("week", "2020-W53"), brute_force(store, "2020-12-28", "2021-01-03"))
+
+
+def test_rebuild_rollups_reproduces_them(store):
+    before = store.conn.execute("SELECT * FROM rollups ORDER BY period, mode, key").fetchall()
+    store.rebuild_rollups()
+    after = store.conn.execute("SELECT * FROM rollups ORDER BY period, mode, key").fetchall()
+    assert len(after) == len(before)
+    for old, new in zip(before, after):
+        assert tuple(old)[:4] == tuple(new)[:4]
+        assert tuple(new)[4:] == pytest.approx(tuple(old)[4:])
+
+
+def test_period_follows_the_window_length():
+    assert period_for("2025-03-01", "2025-03-31") == "day"
+    assert period_for("2025-01-01", "2025-03-31") == "week"
+    assert period_for("2025-01-01", "2025-12-31") == "month"
@@ -0,0 +1,135 @@
+import types
+import numpy as np
+import pytest
+from posture_detector import landmarks
+from posture_detector.detector import PoseDetector
+from posture_detector.smoothing import FILTERS, KalmanFilter, OneEuroFilter, create_filter
+
+FPS = 30
+NOISE = 0.005  # Standard deviation of the simulated MediaPipe jitter, normalized units
+
+
+def pose_at(t, speed=0.0):
+    """True landmarks at time t: a fixed pose drifting right at speed (widths per second)."""
+    lm = np.zeros((landmarks.NUM_LANDMARKS, 4), np.float32)
+    lm[:, landmarks.X] = 0.3 + 0.01 * np.arange(landmarks.NUM_LANDMARKS) + speed * t
+    lm[:, landmarks.Y] = 0.2 + 0.02 * np.arange(landmarks.NUM_LANDMARKS)
+    lm[:, landmarks.VISIBILITY] = 0.9
+    return lm
+
+
+def noisy_stream(seconds, speed=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    for i in range(int(seconds * FPS)):
+        t = i / FPS
+        lm = pose_at(t, speed)
+        lm[:, :landmarks.VISIBILITY] += rng.normal(0, NOISE, (landmarks.NUM_LANDMARKS, 3))
+        yield t, lm
+
+
+def jitter(stream):
+    """Mean frame-to-frame movement of x and y."""
+    stream = np.asarray(stream)
+    return np.abs(np.diff(stream[:, :, :landmarks.Z], axis=0)).mean()
+
+
+@pytest.mark.parametrize("name", sorted(FILTERS))
+def test_filters_reduce_jitter_on_a_still_pose(name):
+    smoother = create_filter(name)
+    raw, filtered = [], []
+    for t, lm in noisy_stream(4):
+        raw.append(lm)
+        filtered.append(smoother.update(lm, t))
+    raw, filtered = raw[FPS:], filtered[FPS:]  # After the filter settled
+
+    assert jitter(filtered) < 0.5 * jitter(raw)
+    error = np.abs(np.asarray(filtered)[:, :, :landmarks.Z] - pose_at(0)[:, :landmarks.Z]).mean()
+    assert error < NOISE  # Still centred on the true pose
+
+
+@pytest.mark.parametrize("name", sorted(FILTERS))
+def test_filters_follow_a_moving_pose(name):
+    smoother = create_filter(name)
+    for t, lm in noisy_stream(3, speed=0.1):
+        filtered = smoother.update(lm, t)
+    lag = np.abs(filtered[:, landmarks.X] - pose_at(t, speed=0.1)[:, landmarks.X]).mean()
+    assert lag < 0.01  # Less than a tenth of a second behind at 0.1 widths per second
+
+
+@pytest.mark.parametrize("name", sorted(FILTERS))
+def test_predict_extrapolates_at_constant_velocity(name):
+    smoother = create_filter(name)
+    assert smoother.predict(0.0) is None  # Nothing to predict from yet
+    for i in range(60):
+        last = smoother.update(pose_at(i / FPS, speed=0.2), i / FPS)
+    t = 59 / FPS
+
+    predicted = smoother.predict(t + 2 / FPS)
+    truth = pose_at(t + 2 / FPS, speed=0.2)[:, landmarks.X]
+    assert np.abs(predicted[:, landmarks.X] - truth).max() < 0.5 * np.abs(last[:, landmarks.X] - truth).min()
+    np.testing.assert_array_equal(predicted[:, landmarks.VISIBILITY], pose_at(t)[:, landmarks.VISIBILITY])
+    # Far beyond max_horizon the prediction holds
+    np.testing.assert_allclose(smoother.predict(t + 10), smoother.predict(t + smoother.max_horizon))
+    np.testing.assert_allclose(smoother.predict(t - 1), smoother.predict(t))  # Never extrapolates backwards
+
+
+@pytest.mark.parametrize("name", sorted(FILTERS))
+def test_reset_forgets_the_track(name):
+    smoother = create_filter(name)
+    for i in range(30):
+        smoother.update(pose_at(i / FPS, speed=0.2), i / FPS)
+    smoother.reset()
+    assert smoother.predict(1.0) is None
+
+    jumped = pose_at(0) + 0.3
+    np.testing.assert_allclose(smoother.update(jumped, 1.0), jumped, atol=1e-6)  # Not pulled back to the old track
+    np.testing.assert_allclose(smoother.predict(1.2), jumped, atol=1e-6)  # Velocity starts at zero
+
+
+def test_create_filter_by_setting_value():
+    assert create_filter("Off") is None
+    assert create_filter(None) is None
+    assert isinstance(create_filter("Euro"), OneEuroFilter)
+    assert isinstance(create_filter("Kalman"), KalmanFilter)
+
+
+class ScriptedEngine:
+    """Stands in for the pose graph: returns whatever landmarks the test set last, None for no pose."""
+
+    def __init__(self):
+        self.lm = None
+        self.calls = 0
+
+    def process(self, image_rgb):
+        self.calls += 1
+        if self.lm is None:
+            return types.SimpleNamespace(pose_landmarks=None)
+        points = [types.SimpleNamespace(x=x, y=y, z=z, visibility=v) for x, y, z, v in self.lm.tolist()]
+        return types.SimpleNamespace(pose_landmarks=types.SimpleNamespace(landmark=points))
+
+
+def test_detector_predicts_the_frames_between_paced_inferences():
+    engine = ScriptedEngine()
+    detector = PoseDetector(smoother=create_filter("Kalman"), inference_rate=10)
+    detector.engine = engine
+    image = np.zeros((48, 64, 3), np.uint8)
+
+    inferred, errors, held = [], [], []
+    previous = None
+    for t, lm in noisy_stream(3, speed=0.2):
+        engine.lm = lm
+        _, result = detector.find_pose(image, draw=False, timestamp=t)
+        inferred.append(detector.inferred)
+        if not detector.inferred and t > 1:
+            truth = pose_at(t, speed=0.2)[:, landmarks.X]
+            errors.append(np.abs(result[:, landmarks.X] - truth).mean())
+            held.append(np.abs(previous[:, landmarks.X] - truth).mean())
+        if detector.inferred:
+            previous = result
+
+    assert engine.calls == sum(inferred) == 30  # 10 of every 30 frames
+    assert np.mean(errors) < 0.5 * np.mean(held)  # Predicting beats holding the last inference
+
+    engine.lm = None  # Pose lost: the track is dropped rather than smoothed across the gap
+    _, result = detector.find_pose(image, draw=False, timestamp=3.5)
+    assert result is None and detector.smoother.predict(3.6) is None
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+from utilities.timeline import METRICS, STATUS_CODES, Timeline, TimelineRecorder
+
+STATUSES = ["Good", "Bad", "Unknown", "Good", "Bad", None]
+
+
+def record_session(path, samples, angle="Side", landmarks=False, chunk_size=16, seed=0):
+    """Record samples at an irregular ~30 Hz; returns the recorder and what was recorded."""
+    rng = np.random.default_rng(seed)
+    recorder = TimelineRecorder(str(path), METRICS[angle], landmarks=landmarks, chunk_size=chunk_size)
+    offsets = np.cumsum(rng.uniform(0.02, 0.05, samples))
+    offsets[samples // 2:] += 3.0  # A pause in the middle
+    recorded = []
+    for i, offset in enumerate(offsets):
+        status = STATUSES[i % len(STATUSES)]
+        if angle == "Side":
+            data = {"status": status, "neck_inclination": float(rng.uniform(0, 60)),
+                    "torso_inclination": None if i % 7 == 0 else float(rng.uniform(0, 20))}
+        else:
+            data = {"status": status, "deviation": int(rng.integers(-5, 100))}
+        lm = None if i % 5 == 0 else rng.uniform(0, 1, (33, 4)).astype(np.float32)
+        recorder.record(recorder._origin + offset, data, lm)
+        recorded.append((offset, data, lm))
+    recorder.close()
+    return recorder, recorded
+
+
+def test_samples_round_trip(tmp_path):
+    recorder, recorded = record_session(tmp_path / "side.ptl", 200)
+    timeline = Timeline(str(tmp_path / "side.ptl"))
+
+    assert recorder.records_written == len(timeline) == 200  # Across several chunks and a partial one
+    assert timeline.metrics == ("neck_inclination", "torso_inclination")
+    assert timeline.dtype.itemsize == 9
+    assert isinstance(timeline.records, np.memmap)
+    assert timeline.start_time == recorder.start_time
+
+    records = timeline.records
+    offsets = np.array([offset for offset, _, _ in recorded])
+    assert records["t_ms"].tolist() == np.round(offsets * 1000).astype(int).tolist()
+    assert records["status"].tolist() == [STATUS_CODES.get(data["status"], 0) for _, data, _ in recorded]
+    neck = np.array([data["neck_inclination"] for _, data, _ in recorded])
+    np.testing.assert_allclose(records["metric"][:, 0], neck, rtol=1e-3)  # float16
+    torso = np.array([np.nan if data["torso_inclination"] is None else data["torso_inclination"]
+                      for _, data, _ in recorded])
+    np.testing.assert_allclose(records["metric"][:, 1], torso, rtol=1e-3)
+    np.testing.assert_allclose(timeline.times(), recorder.start_time + records["t_ms"] / 1000)
+
+
+def test_landmarks_round_trip(tmp_path):
+    _, recorded = record_session(tmp_path / "front.ptl", 50, angle="Front", landmarks=True)
+    timeline = Timeline(str(tmp_path / "front.ptl"))
+
+    assert timeline.metrics == ("deviation", "")
+    assert timeline.dtype.itemsize == 9 + 33 * 4 * 2
+    records = timeline.records
+    assert np.isnan(records["metric"][:, 1]).all()
+    np.testing.assert_array_equal(records["metric"][:, 0], [data["deviation"] for _, data, _ in recorded])
+    for (_, _, lm), stored in zip(recorded, records["landmarks"]):
+        if lm is None:
+            assert np.isnan(stored).all()
+        else:
+            np.testing.assert_allclose(stored, lm, atol=1e-3)
+
+
+def test_between_matches_a_scan_of_every_record(tmp_path):
+    record_session(tmp_path / "side.ptl", 300)
+    timeline = Timeline(str(tmp_path / "side.ptl"))
+    times = timeline.times()
+    rng = np.random.default_rng(1)
+
+    bounds = [(times[0], times[-1]), (times[10], times[10]), (times[-1], times[-1] + 1),
+              (times[0] - 10, times[0]), (times[-1] + 1, times[-1] + 2), (times[0] - 10, times[-1] + 10)]
+    bounds += [tuple(sorted(rng.uniform(times[0] - 1, times[-1] + 1, 2))) for _ in range(200)]
+    for start, end in bounds:
+        expected = np.flatnonzero((times >= start - 1e-6) & (times < end - 1e-6))
+        selected = timeline.between(start, end)
+        assert selected["t_ms"].tolist() == timeline.records["t_ms"][expected].tolist(), (start, end)
+        if len(selected):
+            assert np.shares_memory(selected, timeline.records)  # A view into the file, not a copy
+
+
+def test_partly_written_tail_is_ignored(tmp_path):
+    path = tmp_path / "side.ptl"
+    record_session(path, 40)
+    with open(path, "ab") as file:
+        file.write(b"\1\2\3\4\5")  # A record the writer was still appending
+    assert len(Timeline(str(path))) == 40
+
+
+def test_empty_timeline(tmp_path):
+    recorder = TimelineRecorder(str(tmp_path / "empty.ptl"), METRICS["Side"])
+    recorder.close()
+    timeline = Timeline(str(tmp_path / "empty.ptl"))
+    assert len(timeline) == 0
+    assert len(timeline.between(0, 2 ** 40)) == 0
+    assert timeline.status_fractions()["Good"] == 0.0
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "history.csv"
+    path.write_bytes(b"Date,Total Minutes,Good Posture Minutes\n" * 4)
+    with pytest.raises(ValueError):
+        Timeline(str(path))
+
+
+def test_status_fractions_count_samples(tmp_path):
+    _, recorded = record_session(tmp_path / "side.ptl", 60)
+    fractions = Timeline(str(tmp_path / "side.ptl")).status_fractions()
+    assert fractions["Good"] == pytest.approx(20 / 60)
+    assert fractions["Bad"] == pytest.approx(20 / 60)
+    assert fractions["Unknown"] == pytest.approx(20 / 60)  # Unknown and missing statuses
+    assert sum(fractions.values()) == pytest.approx(1)
@@ -0,0 +1,53 @@
+import time
+import numpy as np
+from posture_detector.capture import Frame
+from posture_detector.worker import InferenceWorker
+
+
+class RecordingAnalyzer:
+    """Stand-in analyzer that notes the capture time of every frame it is given."""
+
+    def __init__(self):
+        self.timestamps = []
+
+    def analyze(self, frame):
+        self.timestamps.append(frame.timestamp)
+        return frame.image, {"status": "Good"}, None
+
+
+def run_worker(timestamps, max_rate):
+    analyzer = RecordingAnalyzer()
+    worker = InferenceWorker(analyzer, max_queue=len(timestamps), max_rate=max_rate)
+    worker.start()
+    image = np.zeros((4, 4, 3), np.uint8)
+    for seq, timestamp in enumerate(timestamps):
+        worker.submit(Frame(image, timestamp, seq))
+    deadline = time.monotonic() + 5
+    while len(analyzer.timestamps) + worker.frames_skipped < len(timestamps) and time.monotonic() < deadline:
+        time.sleep(0.005)
+    worker.stop()
+    return analyzer.timestamps, worker
+
+
+def test_max_rate_paces_frames_by_capture_time():
+    captured = [1000 + i / 30 for i in range(90)]  # 3 s at 30 fps, submitted at once
+    analyzed, worker = run_worker(captured, max_rate=10)
+    assert len(analyzed) == 30
+    assert worker.frames_skipped == 60
+    assert np.diff(analyzed).min() >= 0.1 - 1e-6
+
+
+def test_max_rate_does_not_catch_up_after_a_stall():
+    captured = [i / 30 for i in range(30)] + [5 + i / 30 for i in range(30)]
+    analyzed, _ = run_worker(captured, max_rate=5)
+    after = [t for t in analyzed if t >= 5]
+    assert after[0] == 5  # First frame after the stall is analyzed right away...
+    assert np.diff(after).min() >= 0.2 - 1e-6  # ...and no burst makes up for the missed ones
+    assert len(after) == 5
+
+
+def test_without_max_rate_every_frame_is_analyzed():
+    captured = [i / 30 for i in range(20)]
+    analyzed, worker = run_worker(captured, max_rate=None)
+    assert analyzed == captured
+    assert worker.frames_skipped == 0
@@ -0,0 +1,101 @@
+import json
+import h5py
+import numpy as np
+import pytest
+from posture_detector.yoga_model import NumpyYogaModel, verify_backends
+
+MODEL = "utilities/model.h5"
+
+
+def write_model(path, layers, keras3=True):
+    """A minimal Keras .h5 file: model_config plus one weight group per Dense layer.
+
+    layers are (name, class_name, activation, kernel, bias); Keras 3 nests the datasets
+    as <name>/<name>/kernel, Keras 2 as <name>/<name>/kernel:0.
+    """
+    config = {"class_name": "Sequential", "config": {"layers": [
+        {"class_name": "InputLayer", "config": {"name": "input_layer"}},
+        *({"class_name": class_name, "config": {"name": name, "activation": activation}}
+          for name, class_name, activation, _, _ in layers),
+    ]}}
+    suffix = "" if keras3 else ":0"
+    with h5py.File(path, "w") as f:
+        f.attrs["model_config"] = json.dumps(config).encode("utf-8")
+        weights = f.create_group("model_weights")
+        for name, _, _, kernel, bias in layers:
+            group = weights.create_group(name).create_group(name)
+            group[f"kernel{suffix}"] = kernel
+            if bias is not None:
+                group[f"bias{suffix}"] = bias
+    return str(path)
+
+
+def random_layers(rng, sizes, activations):
+    return [(f"dense_{i}", "Dense", activation, rng.normal(size=(n_in, n_out)).astype(np.float32),
+             rng.normal(size=n_out).astype(np.float32))
+            for i, ((n_in, n_out), activation) in enumerate(zip(zip(sizes, sizes[1:]), activations))]
+
+
+def softmax(v):
+    e = np.exp(v - v.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+REFERENCE = {"relu": lambda v: np.maximum(v, 0), "linear": lambda v: v, "tanh": np.tanh,
+             "sigmoid": lambda v: 1 / (1 + np.exp(-v)), "softmax": softmax}
+
+
+def reference_forward(layers, x):
+    """The same network in float64, written out independently of yoga_model."""
+    x = x.astype(np.float64)
+    for _, _, activation, kernel, bias in layers:
+        x = REFERENCE[activation](x @ kernel + (0 if bias is None else bias))
+    return x
+
+
+@pytest.mark.parametrize("keras3", [True, False])
+def test_dense_layers_and_activations_are_parsed(tmp_path, keras3):
+    rng = np.random.default_rng(0)
+    layers = random_layers(rng, (6, 8, 8, 8, 5), ("relu", "tanh", "sigmoid", "softmax"))
+    model = NumpyYogaModel(write_model(tmp_path / "model.h5", layers, keras3))
+    assert [kernel.shape for kernel, _, _ in model.layers] == [(6, 8), (8, 8), (8, 8), (8, 5)]
+
+    features = rng.uniform(-1, 1, size=(20, 6)).astype(np.float32)
+    probabilities = model.predict(features)
+    np.testing.assert_allclose(probabilities, reference_forward(layers, features), atol=1e-5)
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1, atol=1e-5)
+    assert model.predict(features[0]).shape == (1, 5)  # A single sample is reshaped to a batch
+
+
+def test_missing_bias_and_linear_activation(tmp_path):
+    rng = np.random.default_rng(1)
+    layers = [("dense", "Dense", "linear", rng.normal(size=(4, 3)).astype(np.float32), None)]
+    model = NumpyYogaModel(write_model(tmp_path / "model.h5", layers))
+    features = rng.normal(size=(3, 4)).astype(np.float32)
+    np.testing.assert_allclose(model.predict(features), features @ layers[0][3], atol=1e-5)
+
+
+@pytest.mark.parametrize("class_name, activation, message", [
+    ("Dropout", "linear", "Layer type 'Dropout'"),
+    ("Dense", "gelu", "Activation 'gelu'"),
+])
+def test_unsupported_layers_are_rejected(tmp_path, class_name, activation, message):
+    layers = [("layer", class_name, activation, np.ones((2, 2), np.float32), np.zeros(2, np.float32))]
+    with pytest.raises(ValueError, match=message):
+        NumpyYogaModel(write_model(tmp_path / "model.h5", layers))
+
+
+def test_shipped_model_loads_with_the_numpy_backend():
+    model = NumpyYogaModel(MODEL)
+    assert model.layers[0][0].shape[0] == 66  # x, y of 33 landmarks
+    probabilities = model.predict(np.zeros((2, 66), np.float32))
+    assert probabilities.shape == (2, len(np.load("utilities/labels.npy")))
+    np.testing.assert_allclose(probabilities.sum(axis=1), 1, atol=1e-5)
+
+
+def test_numpy_backend_matches_keras():
+    pytest.importorskip("tensorflow")
+    max_diff, agreement = verify_backends(MODEL, samples=1000)
+    assert max_diff < 1e-4
+    assert agreement == 1.0
+
@@ -0,0 +1,131 @@
+from PySide6.QtCore import QRectF, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QPainter, QPalette, QPen, QPixmap, QPixmapCache
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+ACCENT = "#00767C"
+TRACK = "#e0e0e0"
+BAR_TRACK = "white"
+
+
+class CachedChart(QWidget):
+    """Base for charts drawn with QPainter into a pixmap cached by what they show.
+
+    Subclasses implement cache_key() and render(painter, width, height). The pixmap is
+    rasterized once per key, size and device pixel ratio and kept in QPixmapCache, so
+    repaints, and other charts showing the same thing, only blit it. Resizing renders
+    at most once per new size.
+    """
+
+    def cache_key(self):
+        raise NotImplementedError
+
+    def render(self, painter, width, height):
+        raise NotImplementedError
+
+    def paintEvent(self, event):
+        width, height = self.width(), self.height()
+        if width <= 0 or height <= 0:
+            return
+        ratio = self.devicePixelRatioF()
+        key = f"{type(self).__name__}:{self.cache_key()}:{width}x{height}@{ratio}"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QPixmap(round(width * ratio), round(height * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            self.render(painter, width, height)
+            painter.end()
+            QPixmapCache.insert(key, pixmap)
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, pixmap)
+
+
+class DonutChart(CachedChart):
+    """Percentage as a ring, filled counter-clockwise from the top."""
+
+    def __init__(self, percentage=0, parent=None):
+        super().__init__(parent)
+        self.percentage = 0.0
+        self.set_value(percentage)
+        self.setMinimumSize(80, 80)
+        self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Preferred)
+
+    def set_value(self, percentage):
+        percentage = min(max(float(percentage), 0.0), 100.0)
+        if percentage != self.percentage:
+            self.percentage = percentage
+            self.update()
+
+    def sizeHint(self):
+        return QSize(180, 180)
+
+    def cache_key(self):
+        return f"{self.percentage:.1f}"
+
+    def render(self, painter, width, height):
+        side = min(width, height) - 4
+        thickness = side * 0.15  # Ring is 30% of the radius, like the matplotlib donut it replaced
+        rect = QRectF((width - side) / 2, (height - side) / 2, side, side)
+        rect.adjust(thickness / 2, thickness / 2, -thickness / 2, -thickness / 2)
+        pen = QPen(QColor(TRACK), thickness, Qt.SolidLine, Qt.FlatCap)
+        painter.setPen(pen)
+        painter.drawEllipse(rect)
+        if self.percentage:
+            pen.setColor(QColor(ACCENT))
+            painter.setPen(pen)
+            painter.drawArc(rect, 90 * 16, round(self.percentage / 100 * 360 * 16))  # 1/16ths of a degree
+
+
+class BarChart(CachedChart):
+    """Horizontal bars, one row per (label, fraction 0-1, value text), all painted in one pass."""
+
+    ROW_HEIGHT = 28
+    BAR_HEIGHT = 6
+
+    def __init__(self, rows=(), parent=None):
+        super().__init__(parent)
+        self.rows = ()
+        self.setFont(QFont("Arial", 10))
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+        self.set_rows(rows)
+
+    def set_rows(self, rows):
+        rows = tuple((str(label), min(max(float(fraction), 0.0), 1.0), str(text)) for label, fraction, text in rows)
+        if rows != self.rows:
+            self.rows = rows
+            self.setMinimumHeight(len(rows) * self.ROW_HEIGHT)
+            self.updateGeometry()
+            self.update()
+
+    def sizeHint(self):
+        return QSize(320, len(self.rows) * self.ROW_HEIGHT)
+
+    def cache_key(self):
+        return f"{self.palette().color(QPalette.WindowText).name()}:{self.rows!r}"
+
+    def render(self, painter, width, height):
+        if not self.rows:
+            return
+        metrics = self.fontMetrics()
+        label_width = max(metrics.horizontalAdvance(label) for label, _, _ in self.rows) + 12
+        text_width = max(metrics.horizontalAdvance(text) for _, _, text in self.rows) + 12
+        bar_width = max(width - label_width - text_width, 0)
+        row_height = height / len(self.rows)
+        radius = self.BAR_HEIGHT / 2
+        text_color = self.palette().color(QPalette.WindowText)
+        painter.setFont(self.font())
+        for i, (label, fraction, text) in enumerate(self.rows):
+            top = i * row_height
+            painter.setPen(text_color)
+            painter.drawText(QRectF(0, top, label_width, row_height), Qt.AlignLeft | Qt.AlignVCenter, label)
+            painter.drawText(QRectF(width - text_width, top, text_width, row_height), Qt.AlignRight | Qt.AlignVCenter, text)
+            bar = QRectF(label_width, top + (row_height - self.BAR_HEIGHT) / 2, bar_width, self.BAR_HEIGHT)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(BAR_TRACK))
+            painter.drawRoundedRect(bar, radius, radius)
+            if fraction:
+                bar.setWidth(max(bar_width * fraction, self.BAR_HEIGHT))
+                painter.setBrush(QColor(ACCENT))
+                painter.drawRoundedRect(bar, radius, radius)
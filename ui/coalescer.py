@@ -0,0 +1,90 @@
+import time
+from PySide6.QtCore import QObject, QTimer, Qt
+from PySide6.QtGui import QGuiApplication
+
+_MISSING = object()
+
+
+def refresh_interval_ms():
+    """Milliseconds between refreshes of the primary screen, 60 Hz if unknown."""
+    screen = QGuiApplication.primaryScreen()
+    rate = screen.refreshRate() if screen else 0
+    return 1000 / rate if rate and rate > 0 else 1000 / 60
+
+
+class FrameCoalescer(QObject):
+    """Hands worker results to paint() at most once per display refresh.
+
+    A result that arrives while another is still waiting replaces it, and the replaced
+    frame is released, so the GUI thread never paints a frame nobody will see.
+    """
+
+    def __init__(self, paint, parent=None):
+        super().__init__(parent)
+        self.paint = paint
+        self.interval = refresh_interval_ms()
+        self.coalesced = 0  # Results replaced before they were painted
+        self._pending = None
+        self._last_paint = 0.0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._flush)
+
+    def push(self, captured, *result):
+        """Slot for InferenceWorker.result_ready."""
+        if self._pending is not None:
+            self._pending[0].release()
+            self.coalesced += 1
+        self._pending = (captured, *result)
+        if not self._timer.isActive():
+            since_paint = (time.monotonic() - self._last_paint) * 1000
+            self._timer.start(max(0, round(self.interval - since_paint)))
+
+    def _flush(self):
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            self._last_paint = time.monotonic()
+            self.paint(*pending)
+
+    def clear(self):
+        """Drop a result that is still waiting, e.g. when monitoring stops."""
+        self._timer.stop()
+        if self._pending is not None:
+            self._pending[0].release()
+            self._pending = None
+        self.coalesced = 0
+
+
+class ViewDiff:
+    """Remembers what widgets show and only calls into Qt when a value actually changes.
+
+    Colours are switched through dynamic properties matched by selectors in a stylesheet
+    that is set once, so a change re-polishes one widget instead of re-parsing a sheet.
+    """
+
+    def __init__(self):
+        self._shown = {}
+
+    def changed(self, widget, key, value):
+        if self._shown.get((id(widget), key), _MISSING) == value:
+            return False
+        self._shown[(id(widget), key)] = value
+        return True
+
+    def set_text(self, widget, text):
+        if self.changed(widget, "text", text):
+            widget.setText(text)
+
+    def set_property(self, widget, name, value):
+        if self.changed(widget, name, value):
+            widget.setProperty(name, value)
+            widget.style().unpolish(widget)
+            widget.style().polish(widget)
+
+    def forget(self, widget, key="text"):
+        """Invalidate one cached value after the widget was changed behind our back."""
+        self._shown.pop((id(widget), key), None)
+
+    def reset(self):
+        self._shown.clear()
@@ -1,11 +1,15 @@
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QGridLayout, QProgressBar
+    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QGridLayout, QComboBox, QDateEdit
 )
 from PySide6.QtGui import QFont, QPixmap
-from PySide6.QtCore import Qt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-import csv
+from PySide6.QtCore import Qt, QDate
+from ui.charts import BarChart, DonutChart
+from datetime import date
+from utilities.session_store import get_session_store, period_for, window
+
+# Selectable windows: session_store.window() name -> label; "custom" uses the two date pickers
+WINDOWS = {"last7": "Last 7 days", "week": "This week", "month": "This month", "year": "This year",
+           "custom": "Custom range"}
 
 class Dashboard(QWidget):
 
@@ -15,25 +19,84 @@ class Dashboard(QWidget):
         self.text_color = "#013e54"
         self.setWindowTitle("Dashboard")
         self.setStyleSheet(f"background-color:white;color:{self.text_color};")
-        self.data_file = "storage/history.csv"
         self.data = self.load_data()
         self.setup_ui()
 
-    def load_data(self):
-        """Load data from the given CSV file."""
+    def load_data(self, window_name="last7", first_day=None, last_day=None):
+        """One row per bar of a window (the last 7 days by default), empty bars included.
+
+        Windows up to a month are drawn per day, up to half a year per ISO week and longer
+        ones per month. Everything is read from the session store's rollups, so building
+        the tab costs the same however long the history is.
+        """
+        store = get_session_store()
+        if window_name != "custom":
+            first_day, last_day = window(window_name)
+        self.window_name, self.first_day, self.last_day = window_name, first_day, last_day
+        self.totals = store.totals(first_day, last_day)
+        self.today_totals = store.rollup("day", date.today().isoformat())
+        period = period_for(first_day, last_day)
         data = []
-        try:
-            with open(self.data_file, "r") as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    data.append({
-                        "date": row["Date"],
-                        "total_minutes": float(row["Total Minutes"]),
-                        "good_posture_minutes": float(row["Good Posture Minutes"]),
-                    })
-        except FileNotFoundError:
-            print(f"File {self.data_file} not found.")
-        return data[-7:]  # Return only the last 7 days
+        for _, first, last, _, total_seconds, good_seconds in store.series(first_day, last_day, period):
+            if period == "day":
+                label = date.fromisoformat(first).strftime("%d %b")
+            elif period == "week":
+                label = f"{date.fromisoformat(first):%d %b} - {date.fromisoformat(last):%d %b}"
+            else:
+                label = date.fromisoformat(first).strftime("%b %Y")
+            data.append({
+                "label": label,
+                "total_minutes": round(total_seconds / 60, 2),
+                "good_posture_minutes": round(good_seconds / 60, 2),
+            })
+        return data
+
+    def set_window(self, *_):
+        """Reload the charts and totals for the window picked in the selector."""
+        window_name = self.window_selector.currentData()
+        custom = window_name == "custom"
+        self.first_date.setVisible(custom)
+        self.last_date.setVisible(custom)
+        first, last = self.first_date.date(), self.last_date.date()
+        if custom and first > last:
+            return
+        self.data = self.load_data(window_name, first.toString(Qt.ISODate), last.toString(Qt.ISODate))
+        self.refresh()
+
+    def refresh(self):
+        total = self.get_total()
+        self.today_card.value_label.setText(f"{self.get_today()}%")
+        self.today_card.donut.set_value(self.get_today())
+        self.total_card.value_label.setText(f"{total}%")
+        self.total_card.donut.set_value(total)
+        self.achievement_card.value_label.setText(self.achievement(total))
+        label = WINDOWS[self.window_name]
+        for card, kind in ((self.progress_card, "progress"), (self.usage_card, "usage")):
+            card.title_label.setText(f"{kind.capitalize()} - {label}")
+            card.chart.set_rows(self.chart_rows(self.data, kind))
+
+    def window_bar(self):
+        bar = QHBoxLayout()
+        self.window_selector = QComboBox()
+        for name, label in WINDOWS.items():
+            self.window_selector.addItem(label, name)
+        self.window_selector.setCurrentIndex(list(WINDOWS).index(self.window_name))
+        self.window_selector.setMinimumSize(160, 32)
+        self.window_selector.currentIndexChanged.connect(self.set_window)
+        bar.addWidget(self.window_selector)
+
+        today = QDate.currentDate()
+        self.first_date = QDateEdit(today.addDays(-29))
+        self.last_date = QDateEdit(today)
+        for picker in (self.first_date, self.last_date):
+            picker.setCalendarPopup(True)
+            picker.setDisplayFormat("dd MMM yyyy")
+            picker.setMaximumDate(today)
+            picker.setVisible(False)
+            picker.dateChanged.connect(self.set_window)
+            bar.addWidget(picker)
+        bar.addStretch()
+        return bar
 
     def setup_ui(self):
         # Main layout
@@ -63,13 +126,17 @@ class Dashboard(QWidget):
         header_layout.addWidget(header_image)
         main_layout.addWidget(header)
 
+        main_layout.addLayout(self.window_bar())
 
         # Statistics Row
         stats_layout = QHBoxLayout()
 
-        stats_layout.addWidget(self.create_stat_card("Today's", self.get_today(), "Success", self.bg_color))
-        stats_layout.addWidget(self.create_stat_card("Total", self.get_total(), "Success", self.bg_color))
-        stats_layout.addWidget(self.create_Achivement_card("Achievement",  "Goal", self.bg_color))
+        self.today_card = self.create_stat_card("Today's", self.get_today(), "Success", self.bg_color)
+        self.total_card = self.create_stat_card("Total", self.get_total(), "Success", self.bg_color)
+        self.achievement_card = self.create_Achivement_card("Achievement",  "Goal", self.bg_color)
+        stats_layout.addWidget(self.today_card)
+        stats_layout.addWidget(self.total_card)
+        stats_layout.addWidget(self.achievement_card)
 
         main_layout.addLayout(stats_layout)
 
@@ -77,8 +144,11 @@ class Dashboard(QWidget):
         bottom_layout = QHBoxLayout()
         bottom_layout.setSpacing(15)
 
-        bottom_layout.addWidget(self.create_progress_card("Progress this Week",self.data, self.bg_color,"progress"))
-        bottom_layout.addWidget(self.create_progress_card("Usage this Week",self.data, self.bg_color, "usage"))
+        label = WINDOWS[self.window_name]
+        self.progress_card = self.create_progress_card(f"Progress - {label}", self.data, self.bg_color, "progress")
+        self.usage_card = self.create_progress_card(f"Usage - {label}", self.data, self.bg_color, "usage")
+        bottom_layout.addWidget(self.progress_card)
+        bottom_layout.addWidget(self.usage_card)
 
         main_layout.addLayout(bottom_layout)
 
@@ -117,6 +187,8 @@ class Dashboard(QWidget):
         layout.addLayout(text_layout)
         layout.addWidget(donut_chart, alignment=Qt.AlignRight)
 
+        card.value_label = value_label
+        card.donut = donut_chart
         return card
 
     def create_Achivement_card(self, title, subtitle, bg_color):
@@ -134,17 +206,7 @@ class Dashboard(QWidget):
         title_label.setFont(QFont("Arial", 12, QFont.Bold))
         title_label.setAlignment(Qt.AlignLeft)
 
-        result = self.get_total()
-        if result>80 :
-            value= "Excellent"
-        elif result>70 :
-            value="Good"
-        elif result>50 :
-            value="Average"
-        else :
-            value="Poor"
-
-        value_label = QLabel(value)
+        value_label = QLabel(self.achievement(self.get_total()))
         value_label.setFont(QFont("Arial", 25, QFont.Bold))
         value_label.setAlignment(Qt.AlignLeft)
 
@@ -158,35 +220,23 @@ class Dashboard(QWidget):
 
         layout.addLayout(text_layout)
 
+        card.value_label = value_label
         return card
 
+    @staticmethod
+    def achievement(result):
+        if result>80 :
+            return "Excellent"
+        elif result>70 :
+            return "Good"
+        elif result>50 :
+            return "Average"
+        return "Poor"
 
     def create_donut_chart(self, percentage):
-        # Create a Matplotlib figure for the donut chart
-        fig, ax = plt.subplots(figsize=(2.5, 2.5))  # Adjust the figure size as needed
-        fig.patch.set_alpha(0)  # Remove the background of the figure
-
-        sizes = [percentage, 100 - percentage]
-        colors = ['#00767C', '#e0e0e0']  # Colors for the segments
+        return DonutChart(percentage)
 
-        ax.pie(
-            sizes,
-            colors=colors,
-            startangle=90,
-            wedgeprops={'width': 0.3, 'edgecolor': 'white'},  # 'width' makes it hollow
-        )
-
-        # Equal aspect ratio ensures the pie chart is drawn as a circle
-        ax.axis('equal')
-        ax.set_facecolor((1, 1, 1, 0))  # Set the axis background to transparent
-
-        # Embed the chart into the PySide6 application using FigureCanvas
-        canvas = FigureCanvas(fig)
-        plt.close(fig)  # Close the figure to prevent it from showing separately
-
-        return canvas
-
-    def create_progress_card(self, title, weekly_data, bg_color, type):
+    def create_progress_card(self, title, data, bg_color, type):
         card = QFrame()
         card.setFrameShape(QFrame.StyledPanel)
         card.setStyleSheet(f"background-color: {bg_color}; border-radius: 10px; ")
@@ -197,69 +247,34 @@ class Dashboard(QWidget):
         title_label = QLabel(title)
         title_label.setFont(QFont("Arial", 12, QFont.Bold))
         title_label.setAlignment(Qt.AlignLeft)
-        progress_layout = QVBoxLayout()
-        max_entry = max(weekly_data, key=lambda x: x['total_minutes'])
+        chart = BarChart(self.chart_rows(data, type))
 
-        for day_data in weekly_data:
-            day_layout = QHBoxLayout()
+        layout.addWidget(title_label)
+        layout.addWidget(chart)
 
-            day_label = QLabel(f"{day_data["date"].split(" ")[0]} {day_data["date"].split(" ")[1]}")  # Use data value
-            day_label.setFont(QFont("Arial", 10))
-            day_label.setAlignment(Qt.AlignLeft)
+        card.title_label = title_label
+        card.chart = chart
+        return card
 
+    def chart_rows(self, data, type):
+        max_entry = max(data, key=lambda x: x['total_minutes'], default=None)
+        rows = []
+        for row in data:
             if type == "progress":
-                percentage = self.get_percentage(day_data["good_posture_minutes"], day_data["total_minutes"])
-                percent_label = QLabel(f"{percentage}%")  # Use data value
+                percentage = self.get_percentage(row["good_posture_minutes"], row["total_minutes"])
+                rows.append((row["label"], percentage / 100, f"{percentage}%"))
             else:
-                percentage = self.get_percentage(day_data["total_minutes"],max_entry["total_minutes"])
-                percent_label = QLabel(f"{day_data["total_minutes"]} min")  # Use data value
-                
-
-
-            percent_label.setFont(QFont("Arial", 10))
-            percent_label.setAlignment(Qt.AlignLeft)
-
-            progress_bar = QProgressBar()
-            progress_bar.setAlignment(Qt.AlignRight)
-            progress_bar.setValue(percentage)  # Use data value
-            progress_bar.setFixedHeight(6)
-            progress_bar.setTextVisible(False)
-            progress_bar.setStyleSheet(
-                """
-                QProgressBar {
-                    font-size: 4px;
-                    border-radius: 5px;
-                    background-color: white;
-                }
-                QProgressBar::chunk {
-                    background-color: #00767C;
-                    border-radius: 5px;
-                }
-                """
-            )
-
-            day_layout.addWidget(day_label, 1)
-            day_layout.addWidget(progress_bar, 10)
-            day_layout.addWidget(percent_label, 1)
-            progress_layout.addLayout(day_layout)
-
-        layout.addWidget(title_label)
-        layout.addLayout(progress_layout)
-
-        return card
+                percentage = self.get_percentage(row["total_minutes"],max_entry["total_minutes"])
+                rows.append((row["label"], percentage / 100, f"{row['total_minutes']} min"))
+        return rows
 
     def get_today(self):
-        result = self.get_percentage(self.data[-1]["good_posture_minutes"],self.data[-1]["total_minutes"])
-        return round(result,2)
+        _, total_seconds, good_seconds = self.today_totals
+        return self.get_percentage(good_seconds, total_seconds)
     
     def get_total(self):
-        sum_TM = 0
-        sum_GM = 0
-        for day in self.data:
-            sum_TM += day["total_minutes"]
-            sum_GM += day["good_posture_minutes"]
-        result = self.get_percentage(sum_GM,sum_TM)
-        return result
+        _, total_seconds, good_seconds = self.totals
+        return self.get_percentage(good_seconds, total_seconds)
       
         
     @staticmethod
@@ -1,17 +1,30 @@
-import csv
-from datetime import datetime
 from PySide6.QtWidgets import (
     QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QFrame, QApplication
 )
+import logging
 import sys
+import time
 import winsound
 from os import path , system
 from PySide6.QtCore import QTimer, Qt, QSize
 from PySide6.QtGui import QPixmap, QImage, QFont, QIcon
 from posture_detector.sidePostureAnalyzer import SidePostureAnalyzer
 from posture_detector.frontPostureAnalyzer import FrontPostureAnalyzer
+from posture_detector.worker import InferenceWorker
+from posture_detector.pose_engine import get_pose_engine
+from posture_detector.metrics import StageTimer
+from posture_detector.accounting import PostureLedger
+from posture_detector.smoothing import FILTERS, create_filter
+from posture_detector.events import get_event_hub
+from posture_detector.api import ApiServer
 from utilities.state import State
+from utilities.session_store import get_session_store
+from utilities.timeline import TimelineRecorder, METRICS
 from ui.character_animation import AnimatedImageWidget
+from ui.perf_hud import PerfHud
+from ui.coalescer import FrameCoalescer, ViewDiff
+
+log = logging.getLogger(__name__)
 
 
 class Home(QFrame):
@@ -21,15 +34,22 @@ class Home(QFrame):
         self.state = state
         self.state.camera_angle_changed.connect(self.handle_state_change)
         self.state.setting_changed.connect(self.update_ui)
+        self.analyzers = {}  # One analyzer per camera angle, all sharing the pose engine
         self.init_posture_analyzer()
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
+        self.worker = None  # Runs inference off the GUI thread while monitoring
+        self.metrics = StageTimer(self.state.get_setting("perf_hud") == "On", dump_path="storage/metrics.jsonl")
+        self.coalescer = FrameCoalescer(self.update_frame, self)  # Paints at most once per display refresh
+        self.view = ViewDiff()
 
         self.elapsed_time_timer = QTimer()
         self.elapsed_time_timer.timeout.connect(self.update_elapsed_time)
-        self.elapsed_time = 0  # Initialize elapsed time
-        self.good_posture_minutes = 0  # Track good posture minutes
+        self.elapsed_time = 0  # Whole seconds monitored, for display
+        self.ledger = PostureLedger()  # Good/Bad/Unknown seconds from capture timestamps
+        self.session_start = None  # Unix time monitoring started, None when not monitoring
+        self.timeline = None  # TimelineRecorder while monitoring with the timeline setting on
+        self.events = get_event_hub()  # Every result is published here for local API clients
+        self.api = None  # ApiServer while the local API setting is on
         
         self.bad_posture = False  # Simulated posture state
         self.bad_posture_timer = 0  # Counter for bad posture duration
@@ -45,10 +65,35 @@ class Home(QFrame):
 
     def init_posture_analyzer(self):
         camera_angle = self.state.get_setting("camera_angle")
-        if camera_angle == "Front":
-            self.posture_analyzer = FrontPostureAnalyzer()
-        elif camera_angle == "Side":
-            self.posture_analyzer = SidePostureAnalyzer()
+        if camera_angle not in self.analyzers:
+            options = {
+                "model_complexity": self.state.get_setting("model_complexity"),
+                "motion_gate": self.state.get_setting("motion_gate") == "On",
+                "roi": self.state.get_setting("roi_tracking") == "On",
+                "inference_width": self.state.get_setting("inference_width"),
+                "smoothing": self.state.get_setting("landmark_filter"),
+                "inference_rate": self.inference_rate(),
+            }
+            if camera_angle == "Front":
+                self.analyzers[camera_angle] = FrontPostureAnalyzer(**options)
+            elif camera_angle == "Side":
+                self.analyzers[camera_angle] = SidePostureAnalyzer(**options)
+        self.posture_analyzer = self.analyzers[camera_angle]
+
+    def inference_rate(self):
+        rate = self.state.get_setting("inference_rate")
+        return None if rate == "Max" else float(rate)
+
+    def configure_detectors(self):
+        """Apply the landmark filter, pose inference rate, motion gate and region settings to the analyzers already built."""
+        name = self.state.get_setting("landmark_filter")
+        for analyzer in self.analyzers.values():
+            detector = analyzer.detector
+            if not isinstance(detector.smoother, FILTERS.get(name, type(None))):
+                detector.smoother = create_filter(name)
+            detector.inference_rate = self.inference_rate()
+            detector.set_motion_gate(self.state.get_setting("motion_gate") == "On")
+            detector.set_roi(self.state.get_setting("roi_tracking") == "On", self.state.get_setting("inference_width"))
 
     def init_ui(self):
         # Title
@@ -60,8 +105,14 @@ class Home(QFrame):
         # Video display
         self.video_label = QLabel(self)
         self.video_label.setFixedSize(720, 480)
-        self.video_label.setStyleSheet(f"background-color: #f0f0f0; color: Gray;border: 5px solid black;font-size:20px;font-weight:bold")
+        self.video_label.setObjectName("videoLabel")
+        self.video_label.setStyleSheet("""
+            #videoLabel { background-color: #f0f0f0; color: Gray; border: 5px solid black; font-size: 20px; font-weight: bold; }
+            #videoLabel[posture="good"] { border: 5px solid green; }
+            #videoLabel[posture="bad"] { border: 5px solid red; }
+        """)
         self.video_label.setAlignment(Qt.AlignCenter)
+        self.perf_hud = PerfHud(self.video_label)
 
         # Timer label to display elapsed time
         self.timer_label = QLabel("00:00", self)
@@ -113,6 +164,8 @@ class Home(QFrame):
     def handle_state_change(self):
         """Handle changes in the state dynamically."""
         try:
+            self.elapsed_time_timer.stop()
+            self.stop_worker()
             self.init_posture_analyzer()
             self.update_ui()
             self.video_label.setText("Restart monitoring.")
@@ -127,50 +180,127 @@ class Home(QFrame):
 
         self.image_widget.configure_positions(self.screen_geometry,self.state.get_setting("position"))
         self.threshold_seconds =int( self.state.get_setting("delay") )
+        get_pose_engine(self.state.get_setting("model_complexity"))
+        self.configure_detectors()
+        self.metrics.enabled = self.state.get_setting("perf_hud") == "On"
+        if not self.metrics.enabled:
+            self.perf_hud.clear()
+        self.configure_api()
+
+    def configure_api(self):
+        """Serve the published results on localhost while the local API setting is on."""
+        enabled = self.state.get_setting("local_api") == "On"
+        if enabled and self.api is None:
+            api = ApiServer(self.events)
+            try:
+                api.start()
+            except OSError as e:
+                log.warning("Local API not started: %s", e)  # Port taken, e.g. by a running daemon
+                self.view.set_text(self.status_label, f"Local API not started: {e}")
+                return
+            self.api = api
+        elif not enabled and self.api is not None:
+            self.api.stop()
+            self.api = None
 
     def start_monitoring(self):
+        if self.worker:
+            return  # Already monitoring
         try:
             self.video_label.setText("Loading")
             self.posture_analyzer.run(self.state.get_setting("camera"))
+            self.metrics.reset()
+            self.posture_analyzer.detector.timer = self.metrics
+            rate = self.state.get_setting("analysis_rate")
+            self.worker = InferenceWorker(self.posture_analyzer, timer=self.metrics,
+                                          max_rate=None if rate == "Max" else float(rate))
+            self.worker.result_ready.connect(self.on_result)
+            self.worker.start()
+            self.posture_analyzer.grabber.add_listener(self.worker.submit)
+            self.start_timeline()
             self.elapsed_time_timer.start(1000)
-            self.timer.start(30)  # 30ms for ~33 FPS
+            if self.session_start is None:
+                self.session_start = time.time()
+            self.ledger.resume()
         except Exception as e:
+            self.stop_worker()
             self.video_label.setText("Please face toward's Camera")
 
+    def start_timeline(self):
+        mode = self.state.get_setting("timeline")
+        if mode == "Off":
+            return
+        angle = self.state.get_setting("camera_angle")
+        path = f"storage/timeline/{time.strftime('%Y%m%d-%H%M%S')}-{angle.lower()}.ptl"
+        self.timeline = TimelineRecorder(path, METRICS[angle], landmarks=mode == "Full")
+
+    def stop_worker(self):
+        self.ledger.pause()
+        if self.worker:
+            if self.posture_analyzer.grabber:
+                self.posture_analyzer.grabber.remove_listener(self.worker.submit)
+            self.worker.result_ready.disconnect(self.on_result)
+            self.worker.stop()
+            self.worker = None
+            if self.timeline is not None:
+                self.timeline.close()
+                self.timeline = None
+            if self.metrics.enabled:
+                self.metrics.dump()  # Final snapshot of the session
+        self.coalescer.clear()
+        self.perf_hud.clear()
+        self.posture_analyzer.stop()
+
     def stop_monitoring(self):
-        self.timer.stop()
         self.elapsed_time_timer.stop()
-        self.posture_analyzer.stop()
+        self.stop_worker()
         self.video_label.setText("Monitoring stopped.")
 
         # Save session data to history
         self.save_history()
 
-        # Reset elapsed time and good posture minutes
+        # Reset elapsed time and the posture totals
         self.elapsed_time = 0
-        self.good_posture_minutes = 0
+        self.ledger.reset()
 
     def set_base_posture(self):
         self.posture_analyzer.set_base_posture()
-        self.video_label.setText("Base posture set.")
-
-    def update_frame(self):
-        frame, posture_data = self.posture_analyzer.process_frame()     
-        if posture_data["status"] == "Good":
-            self.video_label.setStyleSheet("border: 5px solid Green;")
-            self.good_posture_minutes += (1 / (30 * 60))# Increment good posture minutes
-        else:
+        self.video_label.setText("Base posture set from the next frame.")
+
+    def on_result(self, captured, frame, posture_data, landmarks):
+        """Count every result delivered by the inference worker, then queue it for painting."""
+        if self.worker is None:
+            captured.release()
+            return  # Result queued before monitoring stopped
+        self.ledger.record(captured.timestamp, posture_data["status"])
+        if posture_data["status"] != "Good":
             self.bad_posture = True
-            self.video_label.setStyleSheet("border: 5px solid red;")
-
-        self.status_label.setText(posture_data["alert"])
+        if self.timeline is not None:
+            self.timeline.record(captured.timestamp, posture_data, landmarks)
+        self.events.publish("posture", dict(posture_data, timestamp=captured.timestamp,
+                                            camera_angle=self.state.get_setting("camera_angle")))
+        self.coalescer.push(captured, frame, posture_data, landmarks)
+
+    def update_frame(self, captured, frame, posture_data, landmarks):
+        """Paint the newest result; widgets are only touched when what they show changes."""
+        start = self.metrics.mark()
+        self.view.set_property(self.video_label, "posture", "good" if posture_data["status"] == "Good" else "bad")
+        self.view.set_text(self.status_label, posture_data["alert"])
         if frame is not None:
             height, width, channel = frame.shape
             bytes_per_line = channel * width
             qimg = QImage(frame.data, width, height, bytes_per_line, QImage.Format_BGR888)
-            self.video_label.setPixmap(QPixmap.fromImage(qimg))
+            self.video_label.setPixmap(QPixmap.fromImage(qimg))  # Copies, the frame buffer can be recycled
         else:
             self.video_label.setText("No frame available.")
+        captured.release()
+
+        if self.metrics.enabled:
+            self.metrics.lap("paint", start)
+            self.metrics.record("latency", (time.monotonic() - captured.timestamp) * 1000)  # Capture to screen
+            self.metrics.set_counter("skipped", self.posture_analyzer.detector.skip_ratio)
+            self.metrics.set_counter("coalesced", self.coalescer.coalesced)
+            self.perf_hud.show_metrics(self.metrics)
 
     def update_posture_state(self):
         """Updates posture state and triggers animation with buffer logic."""
@@ -188,41 +318,15 @@ class Home(QFrame):
         self.bad_posture = False
 
     def update_elapsed_time(self):
-        self.elapsed_time += 1
+        self.elapsed_time = int(self.ledger.elapsed())
         minutes, seconds = divmod(self.elapsed_time, 60)
         self.timer_label.setText(f"{minutes:02}:{seconds:02}")
         self.update_posture_state()
 
     def save_history(self):
-        """Save session data to history.csv."""
-        file_path = "storage/history.csv"
-        current_date = datetime.now().strftime("%d %b %Y")
-        total_minutes = self.elapsed_time / 60  # Convert seconds to minutes
-
-        # Prepare data
-        new_total_minutes = round(total_minutes, 2)
-        new_good_minutes = round(self.good_posture_minutes, 2)
-
-        # Read existing data
-        if path.exists(file_path):
-            with open(file_path, mode="r", newline="") as file:
-                reader = csv.reader(file)
-                data = list(reader)
-        else:
-            data = [["Date", "Total Minutes", "Good Posture Minutes"]]
-
-        # Update existing entry or add new one
-        updated = False
-        row= data[-1]
-        if  row[0] == current_date :  # Match by date
-            row[1] = str(round(float(row[1]) + new_total_minutes, 2))  # Update total minutes
-            row[2] = str(round(float(row[2]) + new_good_minutes, 2))  # Update good posture minutes
-            updated = True
-
-        if not updated:  # If no entry for the current date exists, add a new one
-            data.append([current_date, str(new_total_minutes), str(new_good_minutes)])
-
-        # Write updated data back to the CSV
-        with open(file_path, mode="w", newline="") as file:
-            writer = csv.writer(file)
-            writer.writerows(data)
\ No newline at end of file
+        """Record the finished session in the session store."""
+        if self.session_start is None:
+            return  # Stop pressed without a session
+        get_session_store().add_session(self.session_start, time.time(), self.ledger.total_seconds,
+                                        self.ledger.good_seconds, self.state.get_setting("camera_angle"))
+        self.session_start = None
@@ -1,14 +1,16 @@
+import logging
 import sys
 from PySide6.QtWidgets import QWidget, QVBoxLayout,QStackedWidget, QLabel, QFrame, QHBoxLayout ,QPushButton
-from PySide6.QtCore import Qt 
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QPixmap , QIcon
-from ui.dashboard import Dashboard
-from ui.settings import Settings
 from ui.home import Home
-from ui.yoga import Yoga
 from utilities.state import State
+from utilities.preload import Preloader
+from utilities import startup
 from ui.miniWindow import MiniWindow
 
+log = logging.getLogger(__name__)
+
 
 class PostureWatcherUI(QWidget):
     def __init__(self):
@@ -16,6 +18,7 @@ class PostureWatcherUI(QWidget):
 
     def init_ui(self):
         super().__init__()
+        self.preloader = None
         self.setWindowTitle("Posture Watcher")
         self.setMinimumSize(1200, 720)
         self.setWindowIcon(QIcon("assets/window-icon.png"))
@@ -32,17 +35,76 @@ class PostureWatcherUI(QWidget):
         self.content_area.setStyleSheet("background-color: white;border-radius: 10px;")
         main_layout.addWidget(self.content_area, 10)
 
-        state = State()
-        # Create tabs
-        self.home = Home(state,self)
-        self.dashboard_tab = Dashboard()
-        self.yoga_tab = Yoga(state)
-        self.settings_tab = Settings(state)
+        self.state = State()
+        # Only Home is shown at startup, the other tabs are built on first navigation
+        self.home = Home(self.state,self)
+        self.yoga_tab = None
+        self.dashboard_tab = None
+        self.settings_tab = None
+        self.tab_factories = {
+            1: self.create_yoga_tab,
+            2: self.create_dashboard_tab,
+            3: self.create_settings_tab,
+        }
 
         self.content_area.addWidget(self.home)
-        self.content_area.addWidget(self.yoga_tab)
-        self.content_area.addWidget(self.dashboard_tab)
-        self.content_area.addWidget(self.settings_tab)
+        for _ in self.tab_factories:
+            placeholder = QLabel()  # Keeps the tab indices stable, shows why a tab could not be built
+            placeholder.setAlignment(Qt.AlignCenter)
+            self.content_area.addWidget(placeholder)
+
+    def create_yoga_tab(self):
+        from ui.yoga import Yoga
+        self.yoga_tab = Yoga(self.state)
+        return self.yoga_tab
+
+    def create_dashboard_tab(self):
+        from ui.dashboard import Dashboard
+        self.dashboard_tab = Dashboard()
+        return self.dashboard_tab
+
+    def create_settings_tab(self):
+        from ui.settings import Settings
+        self.settings_tab = Settings(self.state)
+        return self.settings_tab
+
+    def ensure_tab(self, index):
+        """Build the tab at index if it is still a placeholder; a failed build is retried next time."""
+        factory = self.tab_factories.get(index)
+        if factory is None:
+            return
+        placeholder = self.content_area.widget(index)
+        try:
+            tab = factory()
+        except Exception as e:
+            log.exception("Building tab %d failed", index)
+            placeholder.setText(f"Error: {e}")
+            return
+        self.content_area.insertWidget(index, tab)
+        self.content_area.removeWidget(placeholder)
+        placeholder.deleteLater()
+        del self.tab_factories[index]
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.preloader is None:
+            startup.report.mark("main window shown")
+            log.info("%s", startup.report.format())
+            try:
+                startup.report.write()
+            except OSError as e:
+                log.warning("Could not write the startup report: %s", e)
+            QTimer.singleShot(0, self.start_preload)
+
+    def start_preload(self):
+        """Warm the heavy resources in the background so the first use of each tab is fast."""
+        model_complexity = self.state.get_setting("model_complexity")
+        yoga_backend = self.state.get_setting("yoga_backend")
+        self.preloader = Preloader([
+            ("pose engine", lambda: preload_pose_engine(model_complexity)),
+            ("yoga model", lambda: preload_yoga_model(yoga_backend)),
+        ])
+        self.preloader.start()
     
     def sidebar(self):
         sidebar = QFrame()
@@ -112,6 +174,7 @@ class PostureWatcherUI(QWidget):
 
     def switch_tab(self, index, active_style, inactive_style):
         # Switch the current tab
+        self.ensure_tab(index)
         self.content_area.setCurrentIndex(index)
         if self.content_area.currentIndex() == 0:
             self.image_button.show()
@@ -130,3 +193,12 @@ class PostureWatcherUI(QWidget):
         self.MiniWindow.show()
         self.hide()
 
+
+def preload_pose_engine(model_complexity):
+    from posture_detector.pose_engine import get_pose_engine
+    get_pose_engine(model_complexity)
+
+
+def preload_yoga_model(backend):
+    from posture_detector.yoga_model import load_yoga_model
+    load_yoga_model(backend=backend)
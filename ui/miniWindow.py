@@ -65,10 +65,16 @@ class MiniWindow(QWidget):
         return button
     
     def update_elapsed_time(self):
+        if not self.isVisible():
+            return  # Caught up in showEvent
         minutes = self.mainWindow.home.elapsed_time // 60
         seconds = self.mainWindow.home.elapsed_time % 60
         self.timer_label.setText(f"{minutes:02}:{seconds:02}")
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_elapsed_time()
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             self.is_dragging = True
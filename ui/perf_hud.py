@@ -0,0 +1,36 @@
+import time
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+
+
+class PerfHud(QLabel):
+    """Semi-transparent overlay in the top left corner of a video label.
+
+    Shows a StageTimer's frame rate, per-stage median timings and counters. The text
+    is refreshed at most every `interval` seconds so the overlay itself stays cheap.
+    """
+
+    def __init__(self, parent, interval=0.25):
+        super().__init__(parent)
+        self.interval = interval
+        self._last_update = 0.0
+        self.setFont(QFont("Consolas", 9))
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: #7CFC00; border: none; padding: 4px;")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.move(10, 10)
+        self.hide()
+
+    def show_metrics(self, timer):
+        now = time.monotonic()
+        if now - self._last_update < self.interval:
+            return
+        self._last_update = now
+        self.setText(timer.format_hud())
+        self.adjustSize()
+        self.raise_()
+        self.show()
+
+    def clear(self):
+        self._last_update = 0.0
+        self.hide()
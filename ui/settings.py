@@ -47,6 +47,46 @@ class Settings(QWidget):
             "",
             self.create_toggle_buttons(["3", "10", "15"], "delay")
         )
+        self.add_section(
+            "Landmark Smoothing",
+            "Filter the pose over time so the posture status does not flicker",
+            self.create_toggle_buttons(["Off", "Euro", "Kalman"], "landmark_filter", width=290)
+        )
+        self.add_section(
+            "Pose Inference Rate",
+            "Run the pose model less often and predict the frames between",
+            self.create_toggle_buttons(["Max", "15", "10"], "inference_rate")
+        )
+        self.add_section(
+            "Skip Static Frames",
+            "Reuse the last pose while nothing in front of the camera moves",
+            self.create_toggle_buttons(["Off", "On"], "motion_gate")
+        )
+        self.add_section(
+            "Pose Region Tracking",
+            "Run the pose model on a smaller crop around you instead of the whole frame",
+            self.create_toggle_buttons(["Off", "On"], "roi_tracking")
+        )
+        self.add_section(
+            "Analysis Rate",
+            "Frames analyzed per second, lower rates use less CPU",
+            self.create_toggle_buttons(["Max", "15", "5"], "analysis_rate")
+        )
+        self.add_section(
+            "Posture Timeline",
+            "Record every analyzed frame to storage/timeline, Full also keeps the landmarks",
+            self.create_toggle_buttons(["Off", "On", "Full"], "timeline")
+        )
+        self.add_section(
+            "Local API",
+            "Stream posture results to other apps on this computer (port 8765)",
+            self.create_toggle_buttons(["Off", "On"], "local_api")
+        )
+        self.add_section(
+            "Performance HUD",
+            "Show frame rate and stage timings over the video",
+            self.create_toggle_buttons(["Off", "On"], "perf_hud")
+        )
 
     def add_section(self, title, description, widget):
         """Add a section as a QListWidgetItem with a custom widget."""
@@ -133,10 +173,10 @@ class Settings(QWidget):
         )
         return dropdown
 
-    def create_toggle_buttons(self, options, state_key):
+    def create_toggle_buttons(self, options, state_key, width=230):
         """Create a row of toggle buttons."""
         container = QWidget()
-        container.setFixedSize(230, 40)
+        container.setFixedSize(width, 40)
         container.setStyleSheet("""
             QWidget {
                 border: none;
@@ -176,9 +216,12 @@ class Settings(QWidget):
                 lambda checked, value=option: self.state.update_setting(state_key, value) if checked else None
             )
 
-        # Set the first button as checked by default
+        # Check the button matching the current setting, the first one if it matches none
         if button_group.buttons():
-            button_group.buttons()[0].setChecked(True)
-            self.state.update_setting(state_key, options[0])
+            current = str(self.state.get_setting(state_key))
+            index = options.index(current) if current in options else 0
+            button_group.buttons()[index].setChecked(True)
+            if current != options[index]:
+                self.state.update_setting(state_key, options[index])
 
         return container
\ No newline at end of file
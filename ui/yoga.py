@@ -1,8 +1,4 @@
-import os
-import cv2
-import numpy as np
-import mediapipe as mp
-from keras.models import load_model
+import time
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QComboBox, 
     QPushButton, QFrame, QSpacerItem, QSizePolicy ,QProgressBar
@@ -10,19 +6,26 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt,QTimer ,QElapsedTimer ,QPropertyAnimation
 from PySide6.QtGui import QFont, QPixmap,QImage 
 from utilities.state import State
+from posture_detector.capture import FrameGrabber
+from posture_detector.yogaAnalyzer import YogaAnalyzer
+from posture_detector.worker import InferenceWorker
+from posture_detector.metrics import StageTimer
+from ui.perf_hud import PerfHud
+from ui.coalescer import FrameCoalescer, ViewDiff
 
 class Yoga(QMainWindow):
     def __init__(self, state: State):
         super().__init__()
         self.state = state
 
-        self.model = load_model("utilities/model.h5")
-        self.label_names = np.load("utilities/labels.npy")
-        
-        self.holistic = mp.solutions.pose.Pose()
-        self.drawing = mp.solutions.drawing_utils
-        
-        self.cap = cv2.VideoCapture(0)
+        self.analyzer = YogaAnalyzer(model_complexity=self.state.get_setting("model_complexity"),
+                                     backend=self.state.get_setting("yoga_backend"))
+        self.grabber = None
+        self.worker = None  # Runs inference off the GUI thread while the camera is on
+        self.metrics = StageTimer(dump_path="storage/metrics.jsonl")
+        self.analyzer.detector.timer = self.metrics
+        self.coalescer = FrameCoalescer(self.update_frame, self)  # Paints at most once per display refresh
+        self.view = ViewDiff()
 
         self.setWindowTitle("Yoga Analyzer")
         self.setMinimumSize(1000, 600)
@@ -60,6 +63,7 @@ class Yoga(QMainWindow):
         self.camera_label.setAlignment(Qt.AlignCenter)
         self.camera_label.setStyleSheet("border: 5px solid black; border-radius: 10px;color: Gray;font-size:20px;text-align:center")
         left_layout.addWidget(self.camera_label, alignment=Qt.AlignCenter)
+        self.perf_hud = PerfHud(self.camera_label)
 
         left_layout.addSpacerItem(QSpacerItem(20, 20, QSizePolicy.Minimum, QSizePolicy.Fixed))
         
@@ -175,6 +179,12 @@ class Yoga(QMainWindow):
                 background-color: #4CAF50;
                 border-radius: 10px;
             }
+            QProgressBar[level="fair"]::chunk {
+                background-color: #FFA500;
+            }
+            QProgressBar[level="poor"]::chunk {
+                background-color: #F44336;
+            }
         """)
 
         self.accuracy_anim = QPropertyAnimation(self.accuracy_progress_bar, b"value")
@@ -190,9 +200,6 @@ class Yoga(QMainWindow):
         main_layout.addWidget(top_frame)
         main_layout.addWidget(content_frame)
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
-        
         self.elapsed_time = 0  # Store elapsed seconds
         self.timer_running = False  # Track if timer is active
         
@@ -207,6 +214,7 @@ class Yoga(QMainWindow):
     
     def update_pose(self, pose):
         self.pose_name.setText(f"{pose}".title())
+        self.analyzer.target_pose = pose
         
         # Set Image
         image_path = self.pose_images.get(pose)
@@ -214,131 +222,111 @@ class Yoga(QMainWindow):
             pixmap = QPixmap(image_path)
             self.pose_image.setPixmap(pixmap.scaled(300, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
-    def in_frame(self, lst):
-        if (
-            lst[28].visibility > 0.6 and lst[27].visibility > 0.6 and  
-            lst[15].visibility > 0.6 and lst[16].visibility > 0.6
-        ) or (
-            (lst[28].visibility > 0.6 or lst[27].visibility > 0.6) and  
-            (lst[15].visibility > 0.6 or lst[16].visibility > 0.6)  
-        ) or (
-            lst[11].visibility > 0.6 and lst[12].visibility > 0.6 and  
-            lst[23].visibility > 0.6 and lst[24].visibility > 0.6 and  
-            lst[14].visibility > 0.6 and lst[13].visibility > 0.6
-        ) or (
-            lst[19].visibility > 0.6 and lst[20].visibility > 0.6 and  
-            lst[25].visibility > 0.6 and lst[26].visibility > 0.6  
-        ):
-            return True
-        return False
-    
     def start_camera(self):
-        self.cap = cv2.VideoCapture(self.state.get_setting("camera"))
+        self.stop_worker()
         self.camera_label.setText("Loading...")
-        self.timer.start(30)
+        self.analyzer.target_pose = self.pose_dropdown.currentText()
+        try:
+            self.grabber = FrameGrabber(self.state.get_setting("camera"))
+            self.grabber.start()
+        except Exception as e:
+            self.grabber = None
+            self.camera_label.setText(f"{e}")
+            return
+        self.metrics.enabled = self.state.get_setting("perf_hud") == "On"
+        self.metrics.reset()
+        self.worker = InferenceWorker(self.analyzer, timer=self.metrics)
+        self.worker.result_ready.connect(self.on_result)
+        self.worker.start()
+        self.grabber.add_listener(self.worker.submit)
+
+    def stop_worker(self):
+        if self.worker:
+            if self.grabber:
+                self.grabber.remove_listener(self.worker.submit)
+            self.worker.result_ready.disconnect(self.on_result)
+            self.worker.stop()
+            self.worker = None
+            if self.metrics.enabled:
+                self.metrics.dump()  # Final snapshot of the session
+        self.coalescer.clear()
+        self.perf_hud.clear()
+        if self.grabber:
+            self.grabber.stop()
+            self.grabber = None
     
     def stop_camera(self):
-        self.timer.stop()
+        self.stop_worker()
+        self.elapsed_timer.stop()
         self.camera_label.clear()
         self.timer_running = False
         self.elapsed_time = 0
-        self.timer_label.setText("00:00")
+        self.view.set_text(self.timer_label, "00:00")
     
-    def update_frame(self):
-        os.system("cls")
-        color = (255,255,255)
-        ret, frame = self.cap.read()
-        if not ret:
-            return
-        
-        frame = cv2.flip(frame, 1)
-        res = self.holistic.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        frame = cv2.blur(frame, (4,4))
-        
-        if res.pose_landmarks and self.in_frame(res.pose_landmarks.landmark):
-            lst = []
-            for i in res.pose_landmarks.landmark:
-                lst.append(i.x - res.pose_landmarks.landmark[0].x)
-                lst.append(i.y - res.pose_landmarks.landmark[0].y)
-            
-            lst = np.array(lst).reshape(1, -1)
-            p = self.model.predict(lst)
-            pred = self.label_names[np.argmax(p)]
-            accuracy = p[0][np.argmax(p)] * 100
-            
-            self.update_accuracy(int(accuracy))
-
-            if pred == self.pose_dropdown.currentText() and accuracy > 80:
-                status_text = f"Pose: {pred} {accuracy:.2f}%"
-                color = (0, 255, 0)
+    def on_result(self, captured, frame, pose_data, landmarks):
+        """Queue a result delivered by the inference worker for painting."""
+        if self.worker is None:
+            captured.release()
+            return  # Result queued before the camera was stopped
+        self.coalescer.push(captured, frame, pose_data, landmarks)
+
+    def update_frame(self, captured, frame, pose_data, landmarks):
+        """Paint the newest result; widgets are only touched when what they show changes."""
+        start = self.metrics.mark()
+
+        if pose_data["status"] == "Unknown":
+            self.update_accuracy(0)
+            if self.timer_running:
+                    self.elapsed_timer.stop()
+                    self.timer_running = False
+        else:
+            accuracy = pose_data["accuracy"]
+            shown_accuracy = int(accuracy)
+
+            if pose_data["status"] == "Correct":
                 if not self.timer_running:
                     self.elapsed_timer.start()
                     self.timer_running = True
             else:
-                status_text = "Pose Incorrect or Not Trained"
-                color = (0, 0, 255)
-
-                if pred != self.pose_dropdown.currentText() and accuracy > 70:
-                    self.update_accuracy(0)
-
+                if pose_data["pose"] != self.pose_dropdown.currentText() and accuracy > 70:
+                    shown_accuracy = 0
 
                 if self.timer_running:
                     self.elapsed_timer.stop()
                     self.timer_running = False
-            
-            self.status_label.setText(f"{status_text}")
-        else:
-            self.status_label.setText("Ensure Full Body is Visible")
-            self.update_accuracy(0)
-            if self.timer_running:
-                    self.elapsed_timer.stop()
-                    self.timer_running = False
-        
-        self.timer_label.setText(f"{self.elapsed_time}s")
-        
+            self.update_accuracy(shown_accuracy)
 
+        self.view.set_text(self.status_label, pose_data["alert"])
+        self.view.set_text(self.timer_label, f"{self.elapsed_time}s")
 
-        self.drawing.draw_landmarks(frame, res.pose_landmarks, mp.solutions.pose.POSE_CONNECTIONS,
-                                    connection_drawing_spec=self.drawing.DrawingSpec(color=color, thickness=6),
-                                    landmark_drawing_spec=self.drawing.DrawingSpec(color=(255,255,255), circle_radius=3, thickness=3))
-        
-        frame = cv2.flip(frame, 1)
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         h, w, ch = frame.shape
-        qimg = QImage(frame.data, w, h, ch * w, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qimg)
+        qimg = QImage(frame.data, w, h, ch * w, QImage.Format_BGR888)
+        pixmap = QPixmap.fromImage(qimg)  # Copies, the frame buffer can be recycled
+        captured.release()
         scaled_pixmap = pixmap.scaled(self.camera_label.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
         self.camera_label.setPixmap(scaled_pixmap)
 
+        if self.metrics.enabled:
+            self.metrics.lap("paint", start)
+            self.metrics.record("latency", (time.monotonic() - captured.timestamp) * 1000)  # Capture to screen
+            self.perf_hud.show_metrics(self.metrics)
+
     def update_timer(self):
         """Increment the timer every second."""
         self.elapsed_time += 1
-        self.timer_label.setText(f"{self.elapsed_time}s")
+        self.view.set_text(self.timer_label, f"{self.elapsed_time}s")
     
     def update_accuracy(self, accuracy):
         if accuracy >= 80:
-            self.set_progress_bar_color("#4CAF50")  # Green
+            level = "good"  # Green
         elif accuracy >= 60:
-            self.set_progress_bar_color("#FFA500")  # Orange
+            level = "fair"  # Orange
         else:
-            self.set_progress_bar_color("#F44336")  # Red
-
-        self.accuracy_anim.stop()
-        self.accuracy_anim.setStartValue(self.accuracy_progress_bar.value())
-        self.accuracy_anim.setEndValue(accuracy)
-        self.accuracy_anim.start()
-
-    def set_progress_bar_color(self, color: str):
-        self.accuracy_progress_bar.setStyleSheet(f"""
-            QProgressBar {{
-                border: 2px solid #ccc;
-                border-radius: 10px;
-                text-align: center;
-                height: 30px;
-                width: 300px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {color};
-                border-radius: 10px;
-            }}
-        """)
+            level = "poor"  # Red
+        self.view.set_property(self.accuracy_progress_bar, "level", level)
+
+        if self.view.changed(self.accuracy_progress_bar, "accuracy", accuracy):
+            self.accuracy_anim.stop()
+            self.accuracy_anim.setStartValue(self.accuracy_progress_bar.value())
+            self.accuracy_anim.setEndValue(accuracy)
+            self.accuracy_anim.start()
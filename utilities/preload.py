@@ -0,0 +1,31 @@
+import logging
+import time
+from PySide6.QtCore import QThread, Signal
+
+log = logging.getLogger(__name__)
+
+
+class Preloader(QThread):
+    """Runs slow resource loaders on a background thread once the window is visible.
+
+    Each task is a (name, callable) pair; failures are reported but do not stop the
+    remaining tasks, the resource is simply loaded again on first use.
+    """
+
+    task_finished = Signal(str, float)  # task name, seconds taken
+
+    def __init__(self, tasks):
+        super().__init__()
+        self.tasks = tasks
+        self.timings = {}
+
+    def run(self):
+        for name, task in self.tasks:
+            start = time.perf_counter()
+            try:
+                task()
+            except Exception as e:
+                log.warning("Preloading %s failed: %s", name, e)
+                continue
+            self.timings[name] = time.perf_counter() - start
+            self.task_finished.emit(name, self.timings[name])
@@ -0,0 +1,285 @@
+import csv
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+DB_PATH = "storage/history.db"
+LEGACY_CSV = "storage/history.csv"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    day TEXT NOT NULL,              -- Local date of the start, YYYY-MM-DD
+    start REAL NOT NULL,            -- Unix time
+    end REAL NOT NULL,
+    total_seconds REAL NOT NULL,
+    good_seconds REAL NOT NULL,
+    camera_angle TEXT,              -- 'Front', 'Side', NULL for imported days
+    mode TEXT NOT NULL DEFAULT 'posture'
+);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions (mode, day);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS rollups (
+    period TEXT NOT NULL,           -- 'day', 'week' or 'month'
+    mode TEXT NOT NULL,
+    key TEXT NOT NULL,              -- '2025-03-04', '2025-W10' (ISO week) or '2025-03'
+    sessions INTEGER NOT NULL,
+    total_seconds REAL NOT NULL,
+    good_seconds REAL NOT NULL,
+    PRIMARY KEY (period, mode, key)
+) WITHOUT ROWID;
+"""
+
+ROLLUP_UPSERT = (
+    "INSERT INTO rollups (period, mode, key, sessions, total_seconds, good_seconds) VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (period, mode, key) DO UPDATE SET sessions = sessions + excluded.sessions, "
+    "total_seconds = total_seconds + excluded.total_seconds, good_seconds = good_seconds + excluded.good_seconds"
+)
+
+
+def day_of(timestamp):
+    return datetime.fromtimestamp(timestamp).date().isoformat()
+
+
+def week_key(day):
+    year, week, _ = date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def month_key(day):
+    return day[:7]
+
+
+def rollup_keys(day):
+    """(period, key) of every rollup a session on day (YYYY-MM-DD) counts towards."""
+    return (("day", day), ("week", week_key(day)), ("month", month_key(day)))
+
+
+def period_for(first_day, last_day):
+    """Rollup period a chart of [first_day, last_day] is drawn from: day, week or month."""
+    days = (date.fromisoformat(last_day) - date.fromisoformat(first_day)).days + 1
+    if days <= 31:
+        return "day"
+    if days <= 26 * 7:
+        return "week"
+    return "month"
+
+
+def buckets(period, first_day, last_day):
+    """(key, first, last, whole) of every day, ISO week or month overlapping [first_day, last_day].
+
+    first and last are the bucket's days clipped to the range (YYYY-MM-DD); whole is
+    False for the partial buckets at either end.
+    """
+    first, last = date.fromisoformat(first_day), date.fromisoformat(last_day)
+    if period == "day":
+        start, key = first, lambda day: day
+    elif period == "week":
+        start, key = first - timedelta(days=first.weekday()), week_key
+    elif period == "month":
+        start, key = first.replace(day=1), month_key
+    else:
+        raise ValueError(f"Unknown period {period!r}.")
+    result = []
+    while start <= last:
+        if period == "day":
+            end = start
+        elif period == "week":
+            end = start + timedelta(days=6)
+        else:
+            end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        result.append((key(start.isoformat()), max(start, first).isoformat(), min(end, last).isoformat(),
+                       first <= start and end <= last))
+        start = end + timedelta(days=1)
+    return result
+
+
+def window(name, today=None):
+    """(first_day, last_day) of a named window ending today: 'last7', 'week', 'month' or 'year'."""
+    today = today or date.today()
+    if name == "last7":
+        first = today - timedelta(days=6)
+    elif name == "week":
+        first = today - timedelta(days=today.weekday())
+    elif name == "month":
+        first = today.replace(day=1)
+    elif name == "year":
+        first = today.replace(month=1, day=1)
+    else:
+        raise ValueError(f"Unknown window {name!r}.")
+    return first.isoformat(), today.isoformat()
+
+
+class SessionStore:
+    """Monitoring sessions in an indexed SQLite database.
+
+    Every session is one appended row, so saving costs the same however much history
+    there is, and per-day totals are range queries on the (mode, day) index. The old
+    history.csv (one row per day) is imported once, the first time the store opens.
+
+    Daily, ISO-weekly and monthly rollups are updated in the same transaction as each
+    session, so any window is answered from at most a few dozen aggregate rows however
+    long the history is. rebuild_rollups() recomputes them from the sessions.
+    """
+
+    def __init__(self, path=DB_PATH, legacy_csv=LEGACY_CSV):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        if not self.conn.execute("SELECT 1 FROM meta WHERE key = 'rollups'").fetchone():
+            self.rebuild_rollups()  # Database from before rollups were kept
+        if legacy_csv and os.path.exists(legacy_csv):
+            self.import_csv(legacy_csv)
+
+    def add_session(self, start, end, total_seconds, good_seconds, camera_angle=None, mode="posture"):
+        """Append one finished session; start and end are Unix times. Returns its id."""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO sessions (day, start, end, total_seconds, good_seconds, camera_angle, mode) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (day_of(start), start, end, total_seconds, good_seconds, camera_angle, mode),
+            )
+            self._add_to_rollups(day_of(start), mode, 1, total_seconds, good_seconds)
+        return cursor.lastrowid
+
+    def _add_to_rollups(self, day, mode, sessions, total_seconds, good_seconds):
+        self.conn.executemany(ROLLUP_UPSERT, [(period, mode, key, sessions, total_seconds, good_seconds)
+                                              for period, key in rollup_keys(day)])
+
+    def rebuild_rollups(self):
+        """Recompute every rollup from the raw sessions."""
+        with self.conn:
+            self.conn.execute("DELETE FROM rollups")
+            days = self.conn.execute(
+                "SELECT day, mode, COUNT(*), SUM(total_seconds), SUM(good_seconds) FROM sessions GROUP BY mode, day"
+            ).fetchall()
+            for day, mode, sessions, total_seconds, good_seconds in days:
+                self._add_to_rollups(day, mode, sessions, total_seconds, good_seconds)
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rollups', ?)",
+                              (datetime.now().isoformat(),))
+
+    def rollup(self, period, key, mode="posture"):
+        """(sessions, total_seconds, good_seconds) of one day, week ('2025-W10') or month ('2025-03')."""
+        row = self.conn.execute(
+            "SELECT sessions, total_seconds, good_seconds FROM rollups WHERE period = ? AND mode = ? AND key = ?",
+            (period, mode, key),
+        ).fetchone()
+        return tuple(row) if row else (0, 0.0, 0.0)
+
+    def days(self, first_day, last_day, mode="posture"):
+        """(day, sessions, total_seconds, good_seconds) of the days with sessions in [first_day, last_day]."""
+        return [tuple(row) for row in self.conn.execute(
+            "SELECT key, sessions, total_seconds, good_seconds FROM rollups "
+            "WHERE period = 'day' AND mode = ? AND key >= ? AND key <= ? ORDER BY key",
+            (mode, first_day, last_day),
+        )]
+
+    def totals(self, first_day, last_day, mode="posture"):
+        """(sessions, total_seconds, good_seconds) over [first_day, last_day], any length.
+
+        Whole months inside the range come from the monthly rollups and only the partial
+        months at either end from the daily ones.
+        """
+        rows = [row[3:] for row in self.series(first_day, last_day, "month", mode)]
+        return (sum(row[0] for row in rows), sum(row[1] for row in rows), sum(row[2] for row in rows))
+
+    def series(self, first_day, last_day, period=None, mode="posture"):
+        """(key, first, last, sessions, total_seconds, good_seconds) per bucket of [first_day, last_day].
+
+        Buckets are days, ISO weeks or months (period, by default period_for() the range),
+        empty ones included; first and last are the bucket's days inside the range. Whole
+        buckets are read from their rollup, the partial ones at either end from the days.
+        """
+        period = period or period_for(first_day, last_day)
+        if period == "day":
+            by_day = {day: tuple(row) for day, *row in self.days(first_day, last_day, mode)}
+        series = []
+        for key, first, last, whole in buckets(period, first_day, last_day):
+            if period == "day":
+                row = by_day.get(key, (0, 0.0, 0.0))
+            elif whole:
+                row = self.rollup(period, key, mode)
+            else:
+                days = self.days(first, last, mode)
+                row = (sum(d[1] for d in days), sum(d[2] for d in days), sum(d[3] for d in days))
+            series.append((key, first, last, *row))
+        return series
+
+    def sessions(self, first_day=None, last_day=None, mode="posture"):
+        """Sessions whose day (YYYY-MM-DD) lies in [first_day, last_day], oldest first."""
+        return [dict(row) for row in self.conn.execute(
+            "SELECT * FROM sessions WHERE mode = ? AND day >= ? AND day <= ? ORDER BY day, start",
+            (mode, first_day or "", last_day or "9999"),
+        )]
+
+    def daily_totals(self, first_day=None, last_day=None, mode="posture"):
+        """(day, total_seconds, good_seconds) per day with sessions in [first_day, last_day]."""
+        return [tuple(row) for row in self.conn.execute(
+            "SELECT day, SUM(total_seconds), SUM(good_seconds) FROM sessions "
+            "WHERE mode = ? AND day >= ? AND day <= ? GROUP BY day ORDER BY day",
+            (mode, first_day or "", last_day or "9999"),
+        )]
+
+    def import_csv(self, path):
+        """Import a legacy history.csv (Date, Total Minutes, Good Posture Minutes) once.
+
+        Each day becomes one session starting at midnight. Returns the number of rows
+        imported, 0 if this file was imported before. Files are recognized by a hash of
+        their contents, so it does not matter which directory the app was started from.
+        """
+        with open(path, "rb") as file:
+            key = f"imported:sha256:{hashlib.sha256(file.read()).hexdigest()}"
+        # Older versions keyed the import on the absolute path; the app only ever imported history.csv
+        seen = self.conn.execute(
+            "SELECT key FROM meta WHERE key = ? OR (key LIKE 'imported:%' AND key NOT LIKE 'imported:sha256:%')",
+            (key,),
+        ).fetchone()
+        if seen:
+            if seen[0] != key:
+                with self.conn:
+                    self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, datetime.now().isoformat()))
+            return 0
+        rows = []
+        with open(path, newline="") as file:
+            for row in csv.DictReader(file):
+                try:
+                    start = datetime.strptime(row["Date"], "%d %b %Y").timestamp()
+                    total = float(row["Total Minutes"]) * 60
+                    good = float(row["Good Posture Minutes"]) * 60
+                except (KeyError, TypeError, ValueError):
+                    continue  # Skip malformed rows rather than refusing the whole file
+                rows.append((day_of(start), start, start + total, total, good, None, "posture"))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO sessions (day, start, end, total_seconds, good_seconds, camera_angle, mode) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            for day, _, _, total, good, _, mode in rows:
+                self._add_to_rollups(day, mode, 1, total, good)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, datetime.now().isoformat()))
+        return len(rows)
+
+    def close(self):
+        self.conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """Process-wide store on storage/history.db, opened (and the CSV imported) on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore()
+        return _store
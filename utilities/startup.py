@@ -0,0 +1,63 @@
+"""Startup timing and the warm-up that runs behind the splash screen.
+
+Nothing heavy is imported here, so main.py can import this module first and time
+everything after it, PySide6 included.
+"""
+import importlib
+import json
+import os
+import time
+
+REPORT_PATH = "storage/startup.json"
+
+# Imported on the warm-up thread in this order, so each entry is timed without the ones before it
+WARMUP_MODULES = ("numpy", "cv2", "mediapipe", "posture_detector.frontPostureAnalyzer",
+                  "posture_detector.sidePostureAnalyzer", "ui.mainWindow")
+
+
+class StartupReport:
+    """Milliseconds from process start to each startup phase, plus the warm-up tasks."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = {}
+        self.tasks = {}
+
+    def mark(self, phase):
+        """Record that phase was reached now; only the first mark of a phase counts."""
+        self.phases.setdefault(phase, round((time.perf_counter() - self.start) * 1000, 1))
+
+    def add_tasks(self, timings):
+        """Add seconds per task, as collected by utilities.preload.Preloader."""
+        self.tasks.update({name: round(seconds * 1000, 1) for name, seconds in timings.items()})
+
+    def as_dict(self):
+        return {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "phases_ms": self.phases, "tasks_ms": self.tasks}
+
+    def format(self):
+        lines = ["Startup (ms since launch):"]
+        lines += [f"  {phase:<48}{ms:>9.1f}" for phase, ms in self.phases.items()]
+        if self.tasks:
+            lines.append("Warm-up tasks (ms each):")
+            lines += [f"  {name:<48}{ms:>9.1f}" for name, ms in self.tasks.items()]
+        return "\n".join(lines)
+
+    def write(self, path=REPORT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(self.as_dict(), file, indent=2)
+
+
+report = StartupReport()
+
+
+def warmup_tasks(modules=WARMUP_MODULES):
+    """(name, callable) pairs for utilities.preload.Preloader: import the heavy modules, then warm the pose engine."""
+    tasks = [(f"import {module}", lambda module=module: importlib.import_module(module)) for module in modules]
+    tasks.append(("pose engine", warm_pose_engine))
+    return tasks
+
+
+def warm_pose_engine():
+    from posture_detector.pose_engine import get_pose_engine
+    get_pose_engine()
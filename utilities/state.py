@@ -9,7 +9,18 @@ class State(QObject):
             "camera": 0,                 # Default camera index
             "camera_angle": "Front",      # Possible values: 'front', 'side'
             "delay": 3,                 # Delay in milliseconds (e.g., for timer)
-            "position": "Right",        # Default position (e.g., 'center', 'left', 'right')
+            "position": "Left",         # Default position (e.g., 'center', 'left', 'right')
+            "model_complexity": 1,      # MediaPipe Pose model: 0 (lite), 1 (full), 2 (heavy)
+            "yoga_backend": "numpy",    # Yoga classifier: 'numpy' (no TensorFlow) or 'keras'
+            "motion_gate": "On",        # 'On' skips pose inference on static frames while monitoring
+            "roi_tracking": "On",       # 'On' infers on a crop around the last detected pose
+            "inference_width": 640,     # Downscale wider inference input to this width (None keeps full size)
+            "timeline": "Off",          # Record every analyzed frame to storage/timeline: 'Off', 'On', 'Full' (with landmarks)
+            "landmark_filter": "Euro",  # Temporal landmark smoothing: 'Off', 'Euro' or 'Kalman'
+            "inference_rate": "Max",    # Pose inferences per second: 'Max' or '15'/'10', frames between are predicted
+            "analysis_rate": "Max",     # Analyzed frames per second: 'Max' (every frame the worker keeps up with), '15' or '5'
+            "local_api": "Off",         # 'On' streams every result on http://127.0.0.1:8765/events (see posture_detector.api)
+            "perf_hud": "Off",          # 'On' shows per-stage timings over the video and logs them to storage/metrics.jsonl
         }
 
     def update_setting(self, key, value):
@@ -0,0 +1,148 @@
+import bisect
+import os
+import queue
+import struct
+import threading
+import time
+import numpy as np
+
+# Header: magic, version, flags, start (Unix time), names of the two metric columns
+HEADER = struct.Struct("<8sHHd20s20s4x")
+MAGIC = b"PTIMELN1"
+VERSION = 1
+FLAG_LANDMARKS = 1
+
+STATUS_CODES = {"Unknown": 0, "Good": 1, "Bad": 2, "Correct": 3, "Incorrect": 4}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+# Metrics recorded from posture_data for each camera angle, NaN when missing
+METRICS = {
+    "Front": ("deviation", ""),
+    "Side": ("neck_inclination", "torso_inclination"),
+}
+
+
+def record_dtype(landmarks=False):
+    """9 bytes per sample, plus 264 with landmarks (33 x 4 float16)."""
+    fields = [("t_ms", "<u4"), ("status", "u1"), ("metric", "<f2", (2,))]
+    if landmarks:
+        fields.append(("landmarks", "<f2", (33, 4)))
+    return np.dtype(fields)
+
+
+class TimelineRecorder:
+    """Appends per-sample posture records to a fixed-width binary file.
+
+    record() only fills a row of an in-memory chunk; full chunks are handed to a writer
+    thread, so the caller never waits on the disk. Times are stored as milliseconds since
+    the start time in the header, which keeps a workday at 30 Hz around 8 MB (without
+    landmarks). Read files back with Timeline.
+    """
+
+    def __init__(self, path, metrics=("", ""), landmarks=False, chunk_size=256):
+        self.path = path
+        self.metrics = metrics
+        self.dtype = record_dtype(landmarks)
+        self.chunk_size = chunk_size
+        self.records_written = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        self.start_time = time.time()
+        self._origin = time.monotonic()  # Capture timestamps are monotonic, the header stores wall time
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, FLAG_LANDMARKS if landmarks else 0, self.start_time,
+                                   metrics[0].encode(), metrics[1].encode()))
+
+        self._chunk = np.zeros(chunk_size, self.dtype)
+        self._count = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_loop, name="TimelineWriter", daemon=True)
+        self._thread.start()
+
+    def record(self, timestamp, posture_data, lm=None):
+        """Add one sample; timestamp is the frame's time.monotonic() capture time."""
+        row = self._chunk[self._count]
+        row["t_ms"] = max(0, round((timestamp - self._origin) * 1000))
+        row["status"] = STATUS_CODES.get(posture_data.get("status"), 0)
+        row["metric"] = [_metric(posture_data, name) for name in self.metrics]
+        if "landmarks" in self.dtype.names:
+            row["landmarks"] = lm if lm is not None else np.nan
+        self._count += 1
+        if self._count == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Hand the samples recorded so far to the writer thread."""
+        if self._count:
+            self._queue.put(self._chunk[:self._count])
+            self._chunk = np.zeros(self.chunk_size, self.dtype)
+            self._count = 0
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def _write_loop(self):
+        with open(self.path, "ab") as file:
+            while True:
+                chunk = self._queue.get()
+                if chunk is None:
+                    return
+                file.write(chunk.tobytes())
+                file.flush()
+                self.records_written += len(chunk)
+
+
+def _metric(posture_data, name):
+    value = posture_data.get(name) if name else None
+    return np.nan if value is None else value
+
+
+class Timeline:
+    """Zero-copy, read-only view of a timeline file through np.memmap.
+
+    records is a structured array backed by the file; time slices are found with a
+    binary search on t_ms, so only the pages of the requested range are touched.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            magic, version, flags, self.start_time, first, second = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a posture timeline file.")
+        self.metrics = (first.rstrip(b"\0").decode(), second.rstrip(b"\0").decode())
+        self.dtype = record_dtype(bool(flags & FLAG_LANDMARKS))
+        count = (os.path.getsize(path) - HEADER.size) // self.dtype.itemsize  # Ignore a partly written tail
+        if count:
+            self.records = np.memmap(path, self.dtype, mode="r", offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def times(self, records=None):
+        """Unix times of the records (all of them by default)."""
+        records = self.records if records is None else records
+        return self.start_time + records["t_ms"] / 1000
+
+    def between(self, start, end):
+        """Records with start <= Unix time < end, as a view into the file."""
+        t_ms = self.records["t_ms"]
+        index = range(len(t_ms))  # Bisect reads log2(n) samples instead of copying the column
+        lo = bisect.bisect_left(index, self._offset_ms(start), key=t_ms.__getitem__)
+        hi = bisect.bisect_left(index, self._offset_ms(end), key=t_ms.__getitem__)
+        return self.records[lo:hi]
+
+    def _offset_ms(self, unix_time):
+        # Rounded to microseconds, so a time taken from times() selects its own record
+        return round((unix_time - self.start_time) * 1000, 3)
+
+    def status_fractions(self, records=None):
+        """Fraction of samples per status name."""
+        records = self.records if records is None else records
+        counts = np.bincount(records["status"], minlength=len(STATUS_NAMES))
+        total = counts.sum()
+        return {STATUS_NAMES[code]: (float(count / total) if total else 0.0) for code, count in enumerate(counts)}